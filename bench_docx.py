@@ -0,0 +1,79 @@
+"""Benchmark the streaming DOCX reader against the python-docx object model.
+
+Usage:
+    python bench_docx.py --paragraphs 20000 --tables 200 --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from docx import Document
+
+import resume_parser
+
+
+def build_docx(path, paragraphs, tables):
+    """Write a large synthetic resume with body paragraphs, tables and a header"""
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = 'John Smith | john.smith@gmail.com | +91 9876543210'
+    for i in range(paragraphs):
+        doc.add_paragraph(f'Developed feature {i} using Python, Flask and MongoDB to improve throughput by {i % 100}%')
+        if tables and i % max(1, paragraphs // tables) == 0:
+            table = doc.add_table(rows=3, cols=3)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = 'React, Node.js, Docker'
+    doc.save(path)
+
+
+def measure(func, path, repeat):
+    """Best wall time and peak traced memory of one extraction function"""
+    best = float('inf')
+    text = ''
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            text = func(path)
+            best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, text
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare DOCX extraction modes')
+    parser.add_argument('--paragraphs', type=int, default=20000)
+    parser.add_argument('--tables', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'large_resume.docx')
+        build_docx(path, args.paragraphs, args.tables)
+        print(f"📄 {path}: {os.path.getsize(path) / 1024:.0f} KiB, "
+              f"{args.paragraphs} paragraphs, {args.tables} tables")
+
+        modes = [
+            ('object (python-docx)', resume_parser.extract_text_from_docx),
+            ('stream (iterparse)', resume_parser.extract_text_from_docx_stream)
+        ]
+        results = {}
+        print(f"{'mode':<24}{'best ms':>10}{'peak MiB':>10}{'chars':>10}")
+        for name, func in modes:
+            seconds, peak, text = measure(func, path, args.repeat)
+            results[name] = text
+            print(f"{name:<24}{seconds * 1000:>10.1f}{peak / 2 ** 20:>10.1f}{len(text):>10}")
+
+        object_lines = [line for line in results['object (python-docx)'].split('\n') if line]
+        stream_lines = iter(line for line in results['stream (iterparse)'].split('\n') if line)
+        # Every python-docx paragraph must appear in the stream output in the same order
+        in_order = all(line in stream_lines for line in object_lines)
+        print(f"paragraph order preserved: {in_order}")
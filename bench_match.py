@@ -0,0 +1,81 @@
+"""Memory and throughput of the sparse TF-IDF and dense LSA match modes.
+
+Usage:
+    python bench_match.py --resumes 2000 --jobs 5000 --components 100
+"""
+import argparse
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import job_matcher
+from lsa_index import LsaIndex
+from synthetic_corpus import generate_corpus
+
+
+def sparse_bytes(matrix):
+    """Bytes held by a CSR matrix"""
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+def bench_pairwise(resumes, jobs, pairs):
+    """Current /match path: a fresh TF-IDF fit for every resume/job pair"""
+    started = time.perf_counter()
+    for i in range(pairs):
+        resume = resumes[i % len(resumes)]
+        job = jobs[i % len(jobs)]
+        job_matcher.calculate_match_score(
+            resume['resume_text'], job['description'], resume['skills'], job['required_skills']
+        )
+    return pairs / (time.perf_counter() - started)
+
+
+def bench_sparse(resumes, jobs):
+    """Corpus-fitted TF-IDF with a sparse job matrix"""
+    vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+    vectorizer.fit([r['resume_text'] for r in resumes] + [j['description'] for j in jobs])
+    job_matrix = vectorizer.transform([j['description'] for j in jobs])
+
+    resume_matrix = vectorizer.transform([r['resume_text'] for r in resumes])
+    started = time.perf_counter()
+    for i in range(resume_matrix.shape[0]):
+        (job_matrix @ resume_matrix[i].T).toarray()
+    elapsed = time.perf_counter() - started
+    return sparse_bytes(job_matrix), len(resumes) / elapsed, len(vectorizer.vocabulary_)
+
+
+def bench_dense(resumes, jobs, components):
+    """LSA projection with a contiguous float32 job matrix"""
+    index = LsaIndex(n_components=components)
+    index.fit([r['resume_text'] for r in resumes] + [j['description'] for j in jobs])
+    index.set_jobs([j['id'] for j in jobs], [j['description'] for j in jobs])
+
+    resume_vectors = index.transform([r['resume_text'] for r in resumes])
+    started = time.perf_counter()
+    for vector in resume_vectors:
+        index.job_store.scores(vector)
+    elapsed = time.perf_counter() - started
+    return index.memory_report(), len(resumes) / elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare sparse TF-IDF and dense LSA matching')
+    parser.add_argument('--resumes', type=int, default=2000)
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--components', type=int, default=100)
+    parser.add_argument('--pairs', type=int, default=500)
+    args = parser.parse_args()
+
+    resumes, jobs = generate_corpus(args.resumes, args.jobs)
+    print(f"📊 {len(resumes)} resumes x {len(jobs)} jobs")
+
+    pair_rate = bench_pairwise(resumes, jobs, args.pairs)
+    sparse_mem, sparse_rate, vocabulary = bench_sparse(resumes, jobs)
+    dense_report, dense_rate = bench_dense(resumes, jobs, args.components)
+
+    print(f"{'mode':<28}{'job store KiB':>15}{'resumes/s':>12}{'pairs/s':>14}")
+    print(f"{'per-pair TF-IDF (/match)':<28}{'-':>15}{pair_rate / len(jobs):>12.1f}{pair_rate:>14.0f}")
+    print(f"{'sparse TF-IDF (corpus)':<28}{sparse_mem / 1024:>15.0f}{sparse_rate:>12.1f}{sparse_rate * len(jobs):>14.0f}")
+    print(f"{'dense LSA float32':<28}{dense_report['job_vectors_bytes'] / 1024:>15.0f}{dense_rate:>12.1f}{dense_rate * len(jobs):>14.0f}")
+    print(f"vocabulary: {vocabulary} terms, LSA dimensions: {dense_report['dimensions']}, "
+          f"projection: {dense_report['projection_bytes'] / 1024:.0f} KiB")
@@ -0,0 +1,72 @@
+"""Ranking agreement and memory of float16/int8 match vectors against float32.
+
+Usage:
+    python bench_quantize.py --resumes 1000 --jobs 20000 --top-k 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from lsa_index import LsaIndex
+from synthetic_corpus import generate_corpus
+from vector_store import STORAGE_TYPES, VectorStore
+
+
+def top_k(scores, k):
+    """Indices of the k best scores, best first"""
+    k = min(k, len(scores))
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark quantized vector storage')
+    parser.add_argument('--resumes', type=int, default=1000)
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--components', type=int, default=100)
+    parser.add_argument('--top-k', type=int, default=10)
+    args = parser.parse_args()
+
+    resumes, jobs = generate_corpus(args.resumes, args.jobs)
+    index = LsaIndex(n_components=args.components)
+    index.fit([r['resume_text'] for r in resumes] + [j['description'] for j in jobs])
+    job_vectors = index.transform([j['description'] for j in jobs])
+    resume_vectors = index.transform([r['resume_text'] for r in resumes])
+
+    stores = {}
+    query_rates = {}
+    for storage in STORAGE_TYPES:
+        stores[storage] = VectorStore(storage)
+        stores[storage].set(job_vectors)
+
+    reference = [top_k(stores['float32'].scores(v), args.top_k) for v in resume_vectors]
+    baseline_bytes = stores['float32'].nbytes
+
+    print(f"📊 {len(jobs)} jobs x {index.job_store.dimensions or job_vectors.shape[1]} dims, "
+          f"{len(resumes)} resume queries, top-{args.top_k}")
+    print(f"{'storage':<10}{'KiB':>10}{'saved':>8}{'top-k overlap':>15}{'top-1 agree':>13}"
+          f"{'max |err|':>11}{'queries/s':>11}{'batched/s':>11}")
+    for storage, store in stores.items():
+        overlaps = []
+        top1 = 0
+        started = time.perf_counter()
+        rankings = [top_k(store.scores(v), args.top_k) for v in resume_vectors]
+        elapsed = time.perf_counter() - started
+        started = time.perf_counter()
+        store.scores(resume_vectors)
+        batched = time.perf_counter() - started
+        for expected, got in zip(reference, rankings):
+            overlaps.append(len(set(expected) & set(got)) / len(expected))
+            top1 += expected[0] == got[0]
+        query_rates[storage] = len(resume_vectors) / elapsed
+        error = np.abs(store.dequantize() - job_vectors).max()
+        saved = 1 - store.nbytes / baseline_bytes
+        print(f"{storage:<10}{store.nbytes / 1024:>10.0f}{saved:>8.0%}{np.mean(overlaps):>15.4f}"
+              f"{top1 / len(resume_vectors):>13.4f}{error:>11.5f}{len(resume_vectors) / elapsed:>11.0f}"
+              f"{len(resume_vectors) / batched:>11.0f}")
+
+    # Smaller storage costs single-query latency (the per-request /match/jobs path)
+    slowdowns = ', '.join(f"{storage} {query_rates['float32'] / rate:.1f}x"
+                          for storage, rate in query_rates.items() if storage != 'float32')
+    print(f"⚠️  single-query time vs float32: {slowdowns} (batched queries amortize the upcast)")
@@ -0,0 +1,91 @@
+"""Per-pair experience/education matching against the vectorized candidate pool.
+
+The per-pair path is a Python port of calculateBasicMatch from
+controllers/matchController.js (regex on the requirement, substring loops
+over skills and degrees for every resume/job pair). The pool path extracts
+resume features once and scores each job with NumPy array operations.
+
+Usage:
+    python bench_requirements.py --resumes 20000 --jobs 50
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+
+from requirement_match import RequirementPool
+from synthetic_corpus import generate_corpus
+
+
+def js_experience_match(experience, experience_required):
+    if not experience_required or 'fresher' in experience_required.lower():
+        return 100
+    count = len(experience or [])
+    match = re.search(r'(\d+)', experience_required)
+    required = int(match.group(1)) if match else 0
+    if count >= required:
+        return 100
+    if count > 0:
+        return count / required * 100
+    return 0
+
+
+def js_education_match(education, qualifications):
+    if not qualifications:
+        return 100
+    if not education:
+        return 50
+    qualifications = [q.lower() for q in qualifications]
+    for entry in education:
+        degree = (entry.get('degree') or '').lower()
+        institution = (entry.get('institution') or '').lower()
+        if any(q in degree or degree in q or q in institution for q in qualifications):
+            return 100
+    return 50
+
+
+def js_basic_match(resume, job):
+    resume_skills = [s.lower() for s in resume['skills']]
+    matched = [s for s in job['required_skills']
+               if any(r in s.lower() or s.lower() in r for r in resume_skills)]
+    skills = len(matched) / len(job['required_skills']) * 100 if job['required_skills'] else 0
+    return (skills * 0.6 + js_experience_match(resume['experience'], job['experience_required']) * 0.2 +
+            js_education_match(resume['education'], job['qualifications']) * 0.2)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark vectorized requirement matching')
+    parser.add_argument('--resumes', type=int, default=20000)
+    parser.add_argument('--jobs', type=int, default=50)
+    args = parser.parse_args()
+
+    resumes, jobs = generate_corpus(args.resumes, args.jobs)
+
+    started = time.perf_counter()
+    per_pair = np.array([[js_basic_match(resume, job) for resume in resumes] for job in jobs])
+    pair_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pool = RequirementPool(resumes)
+    build_time = time.perf_counter() - started
+    started = time.perf_counter()
+    pooled = np.array([pool.score(job)['match_score'] for job in jobs])
+    score_time = time.perf_counter() - started
+
+    pairs = args.resumes * args.jobs
+    print(f"📊 {args.resumes} resumes x {args.jobs} jobs")
+    print(f"per-pair (JS port)   {pair_time:8.2f}s  {pairs / pair_time:>12.0f} pairs/s")
+    print(f"pool feature build   {build_time:8.2f}s  (once per pool)")
+    print(f"pool scoring         {score_time:8.2f}s  {pairs / score_time:>12.0f} pairs/s")
+    print(f"mean score           per-pair {per_pair.mean():.2f}  pool {pooled.mean():.2f}  "
+          f"(pool reads durations and degree levels instead of entry counts and substrings)")
+    years = pool.years
+    print(f"experience years     mean {years.mean():.2f}, entries/resume {np.mean([len(r['experience']) for r in resumes]):.2f}")
+
+    # Qualifications without a recognizable degree level use the JS substring test
+    for qualifications in (['Computer Science degree'], ['BE'], ['State University'], ['Computer Science']):
+        js_education = np.array([js_education_match(r['education'], qualifications) for r in resumes])
+        pool_education = pool.score({**jobs[0], 'qualifications': qualifications})['education_match']
+        print(f"education {', '.join(qualifications):<24} per-pair {js_education.mean():6.2f}  "
+              f"pool {pool_education.mean():6.2f}  agree {np.mean(js_education == pool_education) * 100:.1f}%")
@@ -0,0 +1,55 @@
+"""Cost of the compiled analyzer rules versus one substring scan per rule, as the rule set grows.
+
+Usage:
+    python bench_rules.py --resumes 500 --sizes 32,128,512,2048
+"""
+import argparse
+import random
+import string
+import time
+
+from resume_analyzer import STRONG_ACTION_VERBS, WEAK_ACTION_VERBS
+from rule_engine import compile_rules
+from synthetic_corpus import generate_corpus
+
+
+def random_patterns(rng, count):
+    """Extra verb/keyword rules of realistic length"""
+    return [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12))) for _ in range(count)]
+
+
+def per_rule_scan(patterns, text):
+    """The old approach: one substring scan per pattern"""
+    text_lower = text.lower()
+    return [p for p in patterns if p.lower() in text_lower]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark analyzer rule evaluation')
+    parser.add_argument('--resumes', type=int, default=500)
+    parser.add_argument('--sizes', default='32,128,512,2048')
+    args = parser.parse_args()
+
+    resumes, _ = generate_corpus(args.resumes, 0)
+    texts = [r['resume_text'] for r in resumes]
+    rng = random.Random(3)
+
+    print(f"{'rules':>7}{'per-rule ms':>14}{'compiled ms':>14}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        base = STRONG_ACTION_VERBS + WEAK_ACTION_VERBS
+        patterns = base + random_patterns(rng, max(0, size - len(base)))
+        rules = compile_rules([{'id': 'all', 'type': 'phrases', 'patterns': patterns},
+                               {'id': 'metrics', 'type': 'digit_runs'}])
+        rules.evaluate(texts[0])
+
+        started = time.perf_counter()
+        for text in texts:
+            per_rule_scan(patterns, text)
+        scan_ms = (time.perf_counter() - started) / len(texts) * 1000
+
+        started = time.perf_counter()
+        for text in texts:
+            rules.evaluate(text)
+        compiled_ms = (time.perf_counter() - started) / len(texts) * 1000
+
+        print(f"{len(patterns):>7}{scan_ms:>14.3f}{compiled_ms:>14.3f}")
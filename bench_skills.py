@@ -0,0 +1,171 @@
+"""Accuracy and throughput of the fuzzy skill normalizer.
+
+Generates noisy spellings of every canonical skill (one or two random
+edits, spacing/punctuation changes) plus tokens that must stay unmapped:
+plain English words and real technologies a typo away from a vocabulary
+skill (NestJS/Next.js, MSSQL/MySQL, Flash/Flask). It then compares the
+symmetric-delete index against a naive scan that computes the edit distance
+to every vocabulary entry.
+
+Names and verbs from resume prose (Jason, Angela, Expressed) are often a
+typo away from a skill, so the parser must never send them to the matcher.
+The last check runs resume_parser's SKILLS section extraction over resumes
+with Title Case headings and such words in the prose around the list, and
+counts the skills it invents.
+
+Usage:
+    python bench_skills.py --variants 20 --seed 7
+"""
+import argparse
+import contextlib
+import io
+import random
+import string
+import time
+
+from skill_normalizer import (DISTINCT_SKILLS, SKILL_VOCABULARY, SkillNormalizer, allowed_distance,
+                              compact, osa_distance)
+
+NON_SKILLS = ['experience', 'team', 'project', 'university', 'managed', 'english', 'hindi',
+              'communication', 'leadership', 'developed', 'students', 'college', 'percentage',
+              'internship', 'company', 'responsible', 'designed', 'analysis', 'hobbies', 'cricket',
+              # Distinct technologies close to a vocabulary skill, and names that are not spelling fixes
+              'NestJS', 'Nest.js', 'Nuxt.js', 'MSSQL', 'Flash', 'Preact', 'Reactor', 'PostGIS', 'PL/SQL',
+              'T-SQL', 'HTMX', 'BSON', 'JSONP', 'Podman', 'Cypress', 'JAX', 'scikit-learn', 'Golang']
+
+# Names and verbs from real resume prose; several are a typo away from a skill
+PROSE_WORDS = ['Jason', 'Angela', 'Jaya', 'Ajay', 'Mason', 'Pandey', 'Javed', 'Vera', 'Mongol', 'Nodes',
+               'Expressed', 'Postal', 'Noted', 'Reacted', 'Numpty', 'Angle', 'Gitte', 'Spring']
+
+
+def typo(rng, word, edits):
+    """Apply random insert/delete/substitute/transpose edits"""
+    chars = list(word)
+    for _ in range(edits):
+        op = rng.choice(['insert', 'delete', 'substitute', 'transpose'])
+        i = rng.randrange(len(chars)) if chars else 0
+        if op == 'insert':
+            chars.insert(i, rng.choice(string.ascii_lowercase))
+        elif op == 'delete' and len(chars) > 1:
+            del chars[i]
+        elif op == 'substitute' and chars:
+            chars[i] = rng.choice(string.ascii_lowercase)
+        elif op == 'transpose' and len(chars) > 1:
+            i = min(i, len(chars) - 2)
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return ''.join(chars)
+
+
+def noisy_variants(rng, skill, count):
+    """Misspellings within the normalizer's edit budget, and formatting variants"""
+    key = compact(skill)
+    budget = allowed_distance(len(key))
+    variants = [skill.lower(), skill.upper(), skill.replace('.', ' '), skill.replace(' ', '')]
+    for _ in range(count):
+        if budget:
+            variants.append(typo(rng, skill.lower(), rng.randint(1, budget)))
+    return variants
+
+
+def naive_lookup(vocabulary, token):
+    """Edit distance against every vocabulary entry and distinct skill (which maps to None)"""
+    key = compact(token)
+    best = None
+    for skill, distinct in [(skill, False) for skill in vocabulary] + [(skill, True) for skill in DISTINCT_SKILLS]:
+        candidate = compact(skill)
+        limit = min(allowed_distance(len(key) + 1), allowed_distance(len(candidate)))
+        distance = osa_distance(key, candidate, limit)
+        if distance <= limit and (best is None or (distance, not distinct) < best[:2]):
+            best = (distance, not distinct, None if distinct else skill)
+    return best[2] if best else None
+
+
+def prose_resume(rng, listed):
+    """Resume text with a SKILLS list between Title Case sections full of PROSE_WORDS"""
+    words = rng.sample(PROSE_WORDS, 6)
+    return '\n'.join([
+        f'{words[0]} {words[1]}',
+        rng.choice(['Skills', 'Technical Skills', 'SKILLS']),
+        ', '.join(listed[:len(listed) // 2]),
+        '- ' + '\n- '.join(listed[len(listed) // 2:]),
+        f'Worked closely with {words[2]} on reporting',
+        rng.choice(['Experience', 'Work Experience:', 'experience']),
+        f'Software Engineer, {words[3]} Labs',
+        f'{words[4]} interest in data tooling and {words[5].lower()} the design to the team',
+        rng.choice(['Projects', 'Education', 'References']),
+        ', '.join(words)
+    ])
+
+
+def section_check(rng, cases, resumes):
+    """(invented skills, listed typos found, listed typos) over generated prose resumes"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import resume_parser
+    positives = [(token, expected) for token, expected in cases if expected]
+    invented = found = listed_total = 0
+    for _ in range(resumes):
+        listed = rng.sample(positives, 8)
+        expected = {resume_parser.skill_normalizer.lookup(token) for token, _ in listed} - {None}
+        got = set(resume_parser.extract_fuzzy_skills(prose_resume(rng, [token for token, _ in listed])))
+        invented += len(got - expected)
+        found += len(got & expected)
+        listed_total += len(expected)
+    return invented, found, listed_total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark fuzzy skill normalization')
+    parser.add_argument('--variants', type=int, default=20)
+    parser.add_argument('--extra-skills', type=int, default=0,
+                        help='random extra vocabulary entries, to show how lookup cost scales')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--resumes', type=int, default=500, help='prose resumes for the SKILLS section check')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = SKILL_VOCABULARY + [
+        ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 12)))
+        for _ in range(args.extra_skills)
+    ]
+    cases = [(variant, skill) for skill in SKILL_VOCABULARY
+             for variant in noisy_variants(rng, skill, args.variants)]
+    cases += [(word, None) for word in NON_SKILLS]
+
+    normalizer = SkillNormalizer(vocabulary)
+    # Typos can land exactly on another skill (e.g. "css" -> "cs3"); count those as ambiguous
+    ambiguous = sum(1 for token, expected in cases
+                    if expected and normalizer.canonical.get(compact(token)) not in (None, expected))
+
+    def cold_lookup(token):
+        normalizer.cache.clear()
+        return normalizer.lookup(token)
+
+    methods = [
+        ('symmetric delete', cold_lookup),
+        ('symmetric delete, warm cache', normalizer.lookup),
+        ('naive scan', lambda token: naive_lookup(vocabulary, token))
+    ]
+    for name, lookup in methods:
+        if name.endswith('warm cache'):
+            for token, _ in cases:
+                lookup(token)
+        started = time.perf_counter()
+        results = [lookup(token) for token, _ in cases]
+        elapsed = time.perf_counter() - started
+
+        correct = sum(1 for (_, expected), got in zip(cases, results) if expected and got == expected)
+        false_positive = sum(1 for (_, expected), got in zip(cases, results) if expected is None and got)
+        positives = sum(1 for _, expected in cases if expected)
+        print(f"{name:<30} accuracy {correct / positives:.4f}  "
+              f"false positives {false_positive}/{len(NON_SKILLS)}  "
+              f"{len(cases) / elapsed:>10.0f} tokens/s")
+
+    print(f"{len(cases)} tokens, {len(vocabulary)} vocabulary entries, "
+          f"{len(normalizer.delete_index)} delete keys, {ambiguous} typos that hit another skill exactly")
+
+    prose_hits = [(word, normalizer.lookup(word)) for word in PROSE_WORDS if normalizer.lookup(word)]
+    print(f"prose words a bare lookup would map: {len(prose_hits)}/{len(PROSE_WORDS)} "
+          f"({', '.join(f'{word}->{skill}' for word, skill in prose_hits)})")
+    invented, found, listed = section_check(rng, cases, args.resumes)
+    print(f"SKILLS section extraction over {args.resumes} prose resumes: {invented} invented skills, "
+          f"{found}/{listed} listed skills found")
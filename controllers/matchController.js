@@ -50,7 +50,7 @@ exports.matchResumeToJobs = async (req, res) => {
             job_description: job.description,
             resume_skills: resume.skills,
             required_skills: job.requiredSkills
-          }, { timeout: 5000 });
+          }, { timeout: 5000, headers: { 'X-Request-Budget-Ms': '5000' } });
 
           const matchData = matchResponse.data;
           matchScore = matchData.match_score;
@@ -269,10 +269,38 @@ exports.rematchJobWithAllResumes = async (req, res) => {
     const resumes = await Resume.find();
     const matches = [];
 
+    // Score the whole pool in one vectorized call; fall back to per-resume basic matching
+    let pooledScores = null;
+    try {
+      const poolResponse = await axios.post('http://localhost:5002/match/pool', {
+        job: {
+          required_skills: job.requiredSkills,
+          experience_required: job.experienceRequired,
+          qualifications: job.qualifications
+        },
+        resumes: resumes.map(resume => ({
+          id: resume._id.toString(),
+          skills: resume.skills,
+          experience: resume.experience,
+          education: resume.education
+        }))
+      }, { timeout: 30000, headers: { 'X-Request-Budget-Ms': '30000' } });
+      pooledScores = new Map(poolResponse.data.matches.map(match => [match.resume_id, match]));
+    } catch (error) {
+      console.log('⚠️  Python pool matching not available, using basic matching');
+    }
+
     await Match.deleteMany({ jobId });
 
     for (const resume of resumes) {
-      const basicMatch = calculateBasicMatch(resume, job);
+      const pooled = pooledScores && pooledScores.get(resume._id.toString());
+      const basicMatch = pooled
+        ? {
+            matchScore: Math.round(pooled.match_score),
+            matchedSkills: pooled.matched_skills,
+            skillsGap: pooled.skills_gap
+          }
+        : calculateBasicMatch(resume, job);
 
       const match = new Match({
         resumeId: resume._id,
@@ -24,7 +24,9 @@ exports.uploadResume = async (req, res) => {
         file_path: path.resolve(filePath),
         file_type: fileExt
       }, {
-        timeout: 30000
+        timeout: 30000,
+        // Let the parser stop working once we stop waiting
+        headers: { 'X-Request-Budget-Ms': '30000' }
       });
 
       const parsedData = parseResponse.data;
@@ -42,26 +44,8 @@ exports.uploadResume = async (req, res) => {
         projects: parsedData.projects?.length
       });
 
-      // Analyze resume quality
-      let analysis = null;
-      try {
-        console.log('📊 Analyzing resume quality...');
-        const analyzeResponse = await axios.post('http://localhost:5003/analyze', 
-          parsedData,
-          { timeout: 10000 }
-        );
-        analysis = analyzeResponse.data;
-        console.log('✅ Analysis complete: Score', analysis.overall_score, '/', analysis.max_score);
-        console.log('   Rating:', analysis.rating);
-        console.log('   Strengths:', analysis.strengths.length);
-        console.log('   Suggestions:', analysis.suggestions.length);
-      } catch (analyzeError) {
-        console.error('⚠️  Analysis service error:', analyzeError.message);
-        console.log('⚠️  Continuing without analysis (analyzer service may not be running)');
-        // Continue without analysis if service is down
-      }
-
-      // Save to MongoDB with all extracted fields
+      // Build the MongoDB document first so the analyzer can key its score
+      // distributions by resume id (saved below, after the analysis)
       const resume = new Resume({
         candidateName: parsedData.name || 'Unknown Candidate',
         email: parsedData.email || '',
@@ -79,6 +63,32 @@ exports.uploadResume = async (req, res) => {
         parsedData: parsedData
       });
 
+      // A re-upload by the same candidate replaces their earlier scores in the
+      // analyzer's corpus percentiles instead of being counted again
+      const previousUpload = resume.email
+        ? await Resume.findOne({ email: resume.email }).select('_id')
+        : null;
+      const analyticsId = (previousUpload ? previousUpload._id : resume._id).toString();
+
+      // Analyze resume quality
+      let analysis = null;
+      try {
+        console.log('📊 Analyzing resume quality...');
+        const analyzeResponse = await axios.post('http://localhost:5003/analyze', 
+          { ...parsedData, resume_id: analyticsId },
+          { timeout: 10000, headers: { 'X-Request-Budget-Ms': '10000' } }
+        );
+        analysis = analyzeResponse.data;
+        console.log('✅ Analysis complete: Score', analysis.overall_score, '/', analysis.max_score);
+        console.log('   Rating:', analysis.rating);
+        console.log('   Strengths:', analysis.strengths.length);
+        console.log('   Suggestions:', analysis.suggestions.length);
+      } catch (analyzeError) {
+        console.error('⚠️  Analysis service error:', analyzeError.message);
+        console.log('⚠️  Continuing without analysis (analyzer service may not be running)');
+        // Continue without analysis if service is down
+      }
+
       await resume.save();
       console.log('💾 Resume saved to database with ID:', resume._id);
 
@@ -0,0 +1,84 @@
+"""Request deadlines shared by the Python services.
+
+A caller states how long it is willing to wait, either as a relative budget
+or an absolute wall-clock deadline:
+
+    X-Request-Budget-Ms: 5000             (milliseconds from now)
+    X-Request-Deadline: 1767225600000     (Unix epoch milliseconds)
+
+The earliest of the two wins. Each stage checks the remaining budget and
+stops early, so work for a caller that has already given up is dropped
+instead of competing with live requests.
+"""
+import time
+
+BUDGET_HEADER = 'X-Request-Budget-Ms'
+DEADLINE_HEADER = 'X-Request-Deadline'
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage starts after the request deadline"""
+
+    def __init__(self, stage):
+        super().__init__(f'Request deadline exceeded before {stage}')
+        self.stage = stage
+
+
+class Deadline:
+    """Point in monotonic time after which a request's result is no longer wanted"""
+
+    def __init__(self, expires_at=None):
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_headers(cls, headers):
+        """Deadline from request headers; unbounded when neither header is present or valid"""
+        candidates = []
+        try:
+            budget_ms = headers.get(BUDGET_HEADER)
+            if budget_ms is not None:
+                candidates.append(time.monotonic() + float(budget_ms) / 1000)
+            deadline_ms = headers.get(DEADLINE_HEADER)
+            if deadline_ms is not None:
+                candidates.append(time.monotonic() + float(deadline_ms) / 1000 - time.time())
+        except ValueError:
+            pass
+        return cls(min(candidates) if candidates else None)
+
+    @classmethod
+    def from_epoch_ms(cls, epoch_ms):
+        """Deadline from an absolute Unix epoch in milliseconds (None = unbounded)"""
+        if epoch_ms is None:
+            return cls()
+        return cls(time.monotonic() + epoch_ms / 1000 - time.time())
+
+    def epoch_ms(self):
+        """Absolute Unix epoch in milliseconds, for handing the deadline to another process"""
+        if self.expires_at is None:
+            return None
+        return (time.time() + self.expires_at - time.monotonic()) * 1000
+
+    def earliest(self, other_expires_at):
+        """Combine with another monotonic expiry (e.g. a service's own time limit)"""
+        if self.expires_at is None:
+            return Deadline(other_expires_at)
+        if other_expires_at is None:
+            return self
+        return Deadline(min(self.expires_at, other_expires_at))
+
+    def remaining(self):
+        """Seconds left, or None when unbounded"""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def check(self, stage):
+        """Raise DeadlineExceeded if the budget is already spent"""
+        if self.expired():
+            raise DeadlineExceeded(stage)
+
+
+NO_DEADLINE = Deadline()
@@ -0,0 +1,557 @@
+"""Append-only, memory-mapped columnar store of per-resume match features.
+
+Each resume is one row across fixed-width columns:
+
+    id_hash      uint64   hash of the resume id (liveness, dedup)
+    deleted      uint8    1 for tombstones
+    skills       uint64[] skill bitset (bit = position in the store's skill list)
+    vector       int8     LSA text vector (L2-normalized), quantized per row
+    vector_scale float32  its scale (vector_store.quantize_int8)
+    word_count, overall_score, ats_score, experience_count,
+    education_count, partial, text_chars
+
+plus the resume ids as a packed string column and the id hashes in sorted
+order (hash_sorted, with the rows they come from in hash_order). Rows are
+written as immutable segments (a directory of .npy files, one per column).
+Updating a resume appends a newer row and deleting it appends a tombstone;
+the newest row per id wins.
+
+Each process keeps a mask per segment of the rows that are still the newest
+version of their id. A new segment clears the rows it supersedes with a
+binary search of its hashes in every older segment's hash_sorted, so an
+append reads a few pages per segment instead of every id in the store.
+Small segments are merged size-tiered: once MERGE_FACTOR consecutive
+segments share a tier (floor(log_MERGE_FACTOR(rows))), their newest rows are
+rewritten as one segment. A row is rewritten about once per tier rather than
+on every full rewrite. compact() merges all segments and drops tombstones.
+
+rank() scores one job against every live row as a streaming scan: each
+segment is memory mapped, scored CHUNK_ROWS rows at a time, and unmapped
+before the next one, while a running top-k is merged per chunk. Resident
+memory is bounded by one segment plus the top-k, whatever the store size.
+
+Several processes (e.g. prefork_server.py workers) may share a directory.
+Writers take an exclusive flock on LOCK and reload the MANIFEST (format
+version, vector model, skill list, segment list) if another process replaced
+it, so segment names and rows are never lost. The MANIFEST is replaced
+atomically. Readers hold a shared flock on SCANS while they scan, and
+merged-away segments are only deleted when no process holds it.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from index_snapshot import pack_strings, unpack_strings
+from vector_store import quantize_int8
+
+FEATURE_STORE_VERSION = 3
+SEGMENT_ROWS = int(os.environ.get('FEATURE_SEGMENT_ROWS', 65536))
+CHUNK_ROWS = int(os.environ.get('FEATURE_CHUNK_ROWS', 8192))
+MERGE_FACTOR = max(2, int(os.environ.get('FEATURE_MERGE_FACTOR', 8)))
+
+# Numeric columns beside the skills bitset and text vector: name -> (dtype, default)
+SCALAR_COLUMNS = {
+    'word_count': (np.int32, 0),
+    'overall_score': (np.float32, np.nan),
+    'ats_score': (np.float32, np.nan),
+    'experience_count': (np.int16, 0),
+    'education_count': (np.int16, 0),
+    'partial': (np.uint8, 0),
+    'text_chars': (np.int32, 0)
+}
+
+# Columns derived from the others when a segment is written
+DERIVED_COLUMNS = ('ids', 'id_offsets', 'hash_sorted', 'hash_order')
+
+SKILLS_WEIGHT = 0.6
+TEXT_WEIGHT = 0.4
+
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def id_hash(resume_id):
+    return int.from_bytes(hashlib.blake2b(str(resume_id).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def size_tier(rows):
+    """Merge tier of a segment with this many rows; None for full segments, which are never merged"""
+    if rows >= SEGMENT_ROWS:
+        return None
+    tier = 0
+    while rows >= MERGE_FACTOR:
+        rows //= MERGE_FACTOR
+        tier += 1
+    return tier
+
+
+def newest_in_segment(hashes):
+    """Rows holding the last occurrence of their id within one segment"""
+    newest = np.zeros(len(hashes), dtype=bool)
+    if len(hashes):
+        _, last = np.unique(hashes[::-1], return_index=True)
+        newest[len(hashes) - 1 - last] = True
+    return newest
+
+
+class FeatureStoreError(Exception):
+    """Store on disk is missing, incompatible, or was built with another vector model"""
+
+
+class FeatureStore:
+    """Segments of resume feature columns under one directory, shared by any number of processes"""
+
+    def __init__(self, path, dimensions, vector_model):
+        self.path = path
+        self.dimensions = dimensions
+        self.vector_model = vector_model
+        self.lock = threading.Lock()
+        self.manifest = None
+        self.manifest_stamp = None
+        self.skill_bits = {}
+        # Per segment name: rows that are the newest version of their id (tombstones
+        # included), the same without tombstones, and the memory-mapped hash index
+        self.newest = {}
+        self.live = {}
+        self.indexes = {}
+        os.makedirs(path, exist_ok=True)
+        with self._writing():
+            if self.manifest is None:
+                self.manifest = {
+                    'format_version': FEATURE_STORE_VERSION,
+                    'dimensions': dimensions,
+                    'vector_model': vector_model,
+                    'skills': [],
+                    'segments': [],
+                    'next_segment': 0,
+                    'retired': []
+                }
+                self._write_manifest()
+
+    # -- cross-process coordination -------------------------------------
+
+    @contextmanager
+    def _writing(self):
+        """Exclusive write access across threads and processes, on an up-to-date manifest"""
+        with self.lock, open(os.path.join(self.path, 'LOCK'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                yield
+            except BaseException:
+                # In-memory state may be ahead of the manifest on disk: reload it next time
+                self._forget_all()
+                raise
+
+    @contextmanager
+    def _scanning(self):
+        """Shared lock that keeps merged-away segments on disk until the scan ends"""
+        with open(os.path.join(self.path, 'SCANS'), 'a') as scans_file:
+            fcntl.flock(scans_file, fcntl.LOCK_SH)
+            yield
+
+    def _forget_all(self):
+        self.manifest_stamp = None
+        self.newest, self.live, self.indexes = {}, {}, {}
+
+    def _refresh(self):
+        """Reload the manifest if another process replaced it (caller holds self.lock)"""
+        manifest_path = os.path.join(self.path, 'MANIFEST.json')
+        try:
+            stat = os.stat(manifest_path)
+        except FileNotFoundError:
+            return
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp == self.manifest_stamp:
+            return
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get('format_version') != FEATURE_STORE_VERSION:
+            raise FeatureStoreError(f"Feature store format {manifest.get('format_version')} "
+                                    f"!= {FEATURE_STORE_VERSION}; recreate the store and re-append resumes")
+        if (manifest['dimensions'], manifest['vector_model']) != (self.dimensions, self.vector_model):
+            raise FeatureStoreError('Feature store vectors were built with another LSA model; '
+                                    'recreate the store and re-append resumes')
+        self.manifest = manifest
+        self.manifest_stamp = stamp
+        self.skill_bits = {skill: bit for bit, skill in enumerate(manifest['skills'])}
+        self._resolve()
+
+    def _resolve(self):
+        """Masks for segments this process has not seen yet, which supersede rows of older ones"""
+        segments = self.manifest['segments']
+        names = {segment['name'] for segment in segments}
+        for name in list(self.newest):
+            if name not in names:
+                self._forget(name)
+        for position, segment in enumerate(segments):
+            if segment['name'] in self.newest:
+                continue
+            columns = self._open(segment)
+            hashes = np.asarray(columns['id_hash'])
+            self._track(segment['name'], hashes, np.asarray(columns['deleted']))
+            for older in segments[:position]:
+                self._supersede(older, hashes)
+            del columns
+
+    def _write_manifest(self):
+        tmp_path = os.path.join(self.path, f'MANIFEST.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as manifest_file:
+            json.dump(self.manifest, manifest_file)
+            manifest_file.flush()
+            os.fsync(manifest_file.fileno())
+        manifest_path = os.path.join(self.path, 'MANIFEST.json')
+        os.replace(tmp_path, manifest_path)
+        stat = os.stat(manifest_path)
+        self.manifest_stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _remove_retired(self):
+        """Delete merged-away segments unless a scan in any process may still read them"""
+        if not self.manifest['retired']:
+            return
+        with open(os.path.join(self.path, 'SCANS'), 'a') as scans_file:
+            try:
+                fcntl.flock(scans_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Retried by the next write
+                return
+            for name in self.manifest['retired']:
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+            self.manifest['retired'] = []
+            self._write_manifest()
+
+    # -- on-disk layout -------------------------------------------------
+
+    def _open(self, segment):
+        """Memory map a segment's columns (empty columns load as plain arrays)"""
+        directory = os.path.join(self.path, segment['name'])
+        columns = {}
+        for name in os.listdir(directory):
+            if name.endswith('.npy'):
+                column_path = os.path.join(directory, name)
+                mmap_mode = 'r' if segment['rows'] and os.path.getsize(column_path) > 128 else None
+                columns[name[:-4]] = np.load(column_path, mmap_mode=mmap_mode, allow_pickle=False)
+        return columns
+
+    def _index(self, segment):
+        """(hash_sorted, hash_order) of a segment, memory mapped once per process"""
+        if segment['name'] not in self.indexes:
+            columns = self._open(segment)
+            self.indexes[segment['name']] = (columns['hash_sorted'], columns['hash_order'])
+        return self.indexes[segment['name']]
+
+    def _write_segment(self, columns, rows):
+        name = f"segment-{self.manifest['next_segment']:08d}"
+        self.manifest['next_segment'] += 1
+        directory = os.path.join(self.path, name)
+        # A writer that died before publishing its manifest can leave the directory behind
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        columns['hash_order'] = np.argsort(columns['id_hash'], kind='stable').astype(np.uint32)
+        columns['hash_sorted'] = columns['id_hash'][columns['hash_order']]
+        for column, values in columns.items():
+            np.save(os.path.join(directory, f'{column}.npy'), np.ascontiguousarray(values), allow_pickle=False)
+        self.indexes[name] = (columns['hash_sorted'], columns['hash_order'])
+        self._track(name, columns['id_hash'], columns['deleted'])
+        return {'name': name, 'rows': rows, 'skill_words': int(columns['skills'].shape[1])}
+
+    def _track(self, name, hashes, deleted):
+        self.newest[name] = newest_in_segment(hashes)
+        self.live[name] = self.newest[name] & (deleted == 0)
+
+    def _forget(self, name):
+        for masks in (self.newest, self.live, self.indexes):
+            masks.pop(name, None)
+
+    def _supersede(self, segment, hashes):
+        """Clear every row of an older segment whose id hash is in hashes"""
+        hash_sorted, hash_order = self._index(segment)
+        if not len(hash_sorted) or not len(hashes):
+            return
+        hashes = np.unique(hashes)
+        first = np.searchsorted(hash_sorted, hashes, side='left')
+        counts = np.searchsorted(hash_sorted, hashes, side='right') - first
+        first, counts = first[counts > 0], counts[counts > 0]
+        if not len(first):
+            return
+        # All positions of each matched hash: an id can repeat within a segment
+        starts = np.cumsum(counts) - counts
+        positions = np.repeat(first - starts, counts) + np.arange(int(counts.sum()))
+        rows = np.asarray(hash_order[positions], dtype=np.int64)
+        self.newest[segment['name']][rows] = False
+        self.live[segment['name']][rows] = False
+
+    # -- writes ---------------------------------------------------------
+
+    def _skill_bitset(self, skills):
+        """Bit positions of normalized skills, registering unseen ones"""
+        bits = []
+        for skill in skills:
+            if skill not in self.skill_bits:
+                self.skill_bits[skill] = len(self.manifest['skills'])
+                self.manifest['skills'].append(skill)
+            bits.append(self.skill_bits[skill])
+        return bits
+
+    def append(self, records):
+        """Write records (dicts with resume_id, skills, vector and optional scalars) as new segments
+
+        A record with deleted=True is a tombstone for its resume_id.
+        """
+        with self._writing():
+            for start in range(0, len(records), SEGMENT_ROWS):
+                batch = records[start:start + SEGMENT_ROWS]
+                bit_lists = [self._skill_bitset(r.get('skills', [])) for r in batch]
+                words = max(1, (len(self.manifest['skills']) + 63) // 64)
+                skills = np.zeros((len(batch), words), dtype=np.uint64)
+                for row, bits in enumerate(bit_lists):
+                    for bit in bits:
+                        skills[row, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+
+                vectors = np.zeros((len(batch), self.manifest['dimensions']), dtype=np.float32)
+                for row, record in enumerate(batch):
+                    if record.get('vector') is not None:
+                        vectors[row] = record['vector']
+                # int8 codes convert to float32 with a plain SIMD cast; float16 has no
+                # vectorized upcast in NumPy and dominated the scan (see vector_store.py)
+                vectors, vector_scales = quantize_int8(vectors)
+
+                ids, id_offsets = pack_strings([str(r['resume_id']) for r in batch])
+                columns = {
+                    'id_hash': np.array([id_hash(r['resume_id']) for r in batch], dtype=np.uint64),
+                    'ids': ids,
+                    'id_offsets': id_offsets,
+                    'deleted': np.array([1 if r.get('deleted') else 0 for r in batch], dtype=np.uint8),
+                    'skills': skills,
+                    'vector': vectors,
+                    'vector_scale': vector_scales
+                }
+                for column, (dtype, default) in SCALAR_COLUMNS.items():
+                    columns[column] = np.array(
+                        [default if r.get(column) is None else r[column] for r in batch], dtype=dtype
+                    )
+
+                # Older rows for the same ids are superseded by this segment
+                for older in self.manifest['segments']:
+                    self._supersede(older, columns['id_hash'])
+                self.manifest['segments'].append(self._write_segment(columns, len(batch)))
+            self._merge_tiers()
+            self._write_manifest()
+            self._remove_retired()
+        return len(records)
+
+    def delete(self, resume_ids):
+        """Tombstone resumes; space is reclaimed by merges and compact()"""
+        return self.append([{'resume_id': resume_id, 'deleted': True} for resume_id in resume_ids])
+
+    def _merge_tiers(self):
+        """Merge runs of MERGE_FACTOR or more consecutive segments in the same size tier"""
+        while True:
+            segments = self.manifest['segments']
+            end = len(segments)
+            while end:
+                tier = size_tier(segments[end - 1]['rows'])
+                start = end - 1
+                while start and size_tier(segments[start - 1]['rows']) == tier:
+                    start -= 1
+                if tier is not None and end - start >= MERGE_FACTOR:
+                    break
+                end = start
+            if not end:
+                return
+            self._merge(start, end)
+
+    def _merge(self, first, last):
+        """Rewrite segments[first:last] as full segments holding only their newest rows
+
+        Tombstones are kept unless the run starts at the oldest segment: they
+        still hide rows of the segments before it.
+        """
+        old_segments = self.manifest['segments'][first:last]
+        keep = self.newest if first else self.live
+        words = max(1, (len(self.manifest['skills']) + 63) // 64)
+        new_segments = []
+        pending = []
+
+        def flush(parts):
+            columns = {}
+            for column in parts[0]:
+                if column != 'id_list':
+                    columns[column] = np.concatenate([part[column] for part in parts])
+            columns['ids'], columns['id_offsets'] = pack_strings(
+                [resume_id for part in parts for resume_id in part['id_list']]
+            )
+            new_segments.append(self._write_segment(columns, len(columns['id_hash'])))
+
+        pending_rows = 0
+        for segment in old_segments:
+            rows = np.flatnonzero(keep[segment['name']])
+            if not len(rows):
+                continue
+            columns = self._open(segment)
+            ids = unpack_strings(columns['ids'], columns['id_offsets'])
+            position = 0
+            while position < len(rows):
+                take = rows[position:position + min(CHUNK_ROWS, SEGMENT_ROWS - pending_rows)]
+                position += len(take)
+                skills = np.zeros((len(take), words), dtype=np.uint64)
+                skills[:, :segment['skill_words']] = columns['skills'][take]
+                part = {column: np.asarray(columns[column][take])
+                        for column in columns if column not in DERIVED_COLUMNS + ('skills',)}
+                part['skills'] = skills
+                part['id_list'] = [ids[row] for row in take]
+                pending.append(part)
+                pending_rows += len(take)
+                if pending_rows >= SEGMENT_ROWS:
+                    flush(pending)
+                    pending, pending_rows = [], 0
+            del columns
+        if pending:
+            flush(pending)
+
+        segments = self.manifest['segments']
+        self.manifest['segments'] = segments[:first] + new_segments + segments[last:]
+        for segment in old_segments:
+            self._forget(segment['name'])
+        # Deleted by _remove_retired once no scan can still be reading them
+        self.manifest['retired'].extend(segment['name'] for segment in old_segments)
+
+    def compact(self):
+        """Rewrite live rows into full segments, dropping superseded rows and tombstones"""
+        with self._writing():
+            started = time.perf_counter()
+            segments_before = len(self.manifest['segments'])
+            self._merge(0, segments_before)
+            self._write_manifest()
+            self._remove_retired()
+            return {
+                'segments_before': segments_before,
+                'segments_after': len(self.manifest['segments']),
+                'live_rows': int(sum(int(self.live[s['name']].sum()) for s in self.manifest['segments'])),
+                'compact_time_ms': round((time.perf_counter() - started) * 1000, 2)
+            }
+
+    # -- reads ----------------------------------------------------------
+
+    def rank(self, job_vector, required_skills, top_k=10, min_overall_score=None, deadline=None):
+        """Stream every live row, score it against one job and keep the top_k
+
+        Same weighting as calculate_match_score: 60% skills overlap, 40% text
+        similarity. Stops between chunks once deadline (a deadline.Deadline)
+        has expired and reports partial=True.
+        """
+        if top_k < 0:
+            raise ValueError(f'top_k must not be negative, got {top_k}')
+        with self._scanning():
+            with self.lock:
+                self._refresh()
+                segments = [(segment, self.live[segment['name']]) for segment in self.manifest['segments']]
+                known_bits = [self.skill_bits[skill] for skill in required_skills if skill in self.skill_bits]
+                words = max(1, (len(self.manifest['skills']) + 63) // 64)
+            return self._scan(segments, known_bits, words, job_vector, required_skills,
+                              top_k, min_overall_score, deadline)
+
+    def _scan(self, segments, known_bits, words, job_vector, required_skills,
+              top_k, min_overall_score, deadline):
+        n_required = len(set(required_skills))
+        job_bits = np.zeros(words, dtype=np.uint64)
+        for bit in known_bits:
+            job_bits[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        job_vector = np.asarray(job_vector, dtype=np.float32)
+
+        best_scores = np.zeros(0, dtype=np.float32)
+        best_locations = np.zeros((0, 2), dtype=np.int64)
+        scanned = 0
+        partial = False
+        for index, (segment, live) in enumerate(segments):
+            if deadline is not None and deadline.expired():
+                partial = True
+                break
+            columns = self._open(segment)
+            segment_bits = job_bits[:segment['skill_words']]
+            for start in range(0, segment['rows'], CHUNK_ROWS):
+                end = min(start + CHUNK_ROWS, segment['rows'])
+                mask = live[start:end]
+                if min_overall_score is not None:
+                    mask = mask & (np.asarray(columns['overall_score'][start:end]) >= min_overall_score)
+                if not mask.any():
+                    continue
+
+                vectors = columns['vector'][start:end].astype(np.float32)
+                text = np.clip((vectors @ job_vector) * columns['vector_scale'][start:end], 0.0, 1.0)
+                if n_required:
+                    shared = np.ascontiguousarray(columns['skills'][start:end] & segment_bits)
+                    matched = POPCOUNT[shared.view(np.uint8)].reshape(end - start, -1).sum(axis=1)
+                    skills_match = matched / n_required
+                else:
+                    skills_match = np.zeros(end - start)
+                scores = ((skills_match * SKILLS_WEIGHT + text * TEXT_WEIGHT) * 100).astype(np.float32)
+                scores[~mask] = -np.inf
+                scanned += int(mask.sum())
+
+                # Merge this chunk's best rows into the running top-k
+                k = min(top_k, end - start)
+                candidates = np.argpartition(-scores, k - 1)[:k] if k else np.zeros(0, dtype=np.int64)
+                candidates = candidates[np.isfinite(scores[candidates])]
+                best_scores = np.concatenate([best_scores, scores[candidates]])
+                best_locations = np.concatenate([
+                    best_locations, np.column_stack([np.full(len(candidates), index), start + candidates])
+                ])
+                if len(best_scores) > top_k:
+                    keep = np.argpartition(-best_scores, top_k - 1)[:top_k]
+                    best_scores, best_locations = best_scores[keep], best_locations[keep]
+                if deadline is not None and deadline.expired():
+                    partial = True
+                    break
+            del columns
+            if partial:
+                break
+
+        order = np.argsort(-best_scores, kind='stable')
+        matches = [self._describe(segments, best_locations[i], job_bits, job_vector, n_required) for i in order]
+        return {
+            'matches': matches,
+            'scanned_rows': scanned,
+            'segments': len(segments),
+            'partial': partial
+        }
+
+    def _describe(self, segments, location, job_bits, job_vector, n_required):
+        segment, _ = segments[location[0]]
+        row = int(location[1])
+        columns = self._open(segment)
+        bounds = columns['id_offsets'][row:row + 2]
+        skills = np.asarray(columns['skills'][row]) & job_bits[:segment['skill_words']]
+        matched = int(POPCOUNT[skills.view(np.uint8)].sum())
+        vector = columns['vector'][row].astype(np.float32)
+        text = float(np.clip((vector @ job_vector) * columns['vector_scale'][row], 0.0, 1.0))
+        skills_match = matched / n_required if n_required else 0.0
+        overall = float(columns['overall_score'][row])
+        return {
+            'resume_id': unpack_strings(columns['ids'], bounds)[0],
+            'match_score': round((skills_match * SKILLS_WEIGHT + text * TEXT_WEIGHT) * 100, 2),
+            'text_similarity': round(text * 100, 2),
+            'skills_match': round(skills_match * 100, 2),
+            'word_count': int(columns['word_count'][row]),
+            'overall_score': None if np.isnan(overall) else overall
+        }
+
+    def stats(self):
+        with self._scanning(), self.lock:
+            self._refresh()
+            total = sum(segment['rows'] for segment in self.manifest['segments'])
+            live = int(sum(int(self.live[segment['name']].sum()) for segment in self.manifest['segments']))
+            return {
+                'segments': len(self.manifest['segments']),
+                'rows': total,
+                'live_rows': live,
+                'dead_rows': total - live,
+                'skills': len(self.manifest['skills']),
+                'dimensions': self.manifest['dimensions']
+            }
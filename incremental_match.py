@@ -0,0 +1,381 @@
+"""Incremental rematching when a job posting changes.
+
+Every (resume, job) score is kept as two cached components:
+    M = number of the job's required skills the resume has
+    D = dot product of the resume's L2-normalized TF-IDF row with the job's
+        raw (un-normalized) TF-IDF vector
+so that
+    skills_match    = M / |required_skills|
+    text_similarity = D / ||job vector||
+    match_score     = (skills_match * 0.6 + text_similarity * 0.4) * 100
+which is the same weighting as calculate_match_score.
+
+When a job is edited only the changed skills (via the skill -> resumes index)
+and the changed terms (via the term -> resumes columns of a CSC matrix) are
+touched. Resumes sharing nothing with either version of the job keep score 0
+and are never looked at. The result is a delta of scores that actually moved.
+
+IDF weights are fitted once on the corpus, so text similarity here is
+corpus TF-IDF rather than the per-pair TF-IDF of /match. Terms unseen at fit
+time are ignored until the index is rebuilt.
+"""
+from collections import defaultdict
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from index_snapshot import pack_strings, restore_vectorizer, unpack_strings, vectorizer_arrays
+from skill_normalizer import FUZZY_SKILLS, skill_normalizer
+
+SKILLS_WEIGHT = 0.6
+TEXT_WEIGHT = 0.4
+
+
+def _skill_set(skills):
+    if FUZZY_SKILLS:
+        skills = skill_normalizer.normalize_all(skills)
+    return set(skill.lower() for skill in skills)
+
+
+class _SnapshotSkillSets:
+    """Resume row -> skill set, decoded from snapshot arrays on access"""
+
+    def __init__(self, names, indptr, skill_ids):
+        self.names = names
+        self.indptr = indptr
+        self.skill_ids = skill_ids
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def __getitem__(self, row):
+        return set(self.names[i] for i in self.skill_ids[self.indptr[row]:self.indptr[row + 1]])
+
+
+class _SnapshotJobs:
+    """Job id -> cached job state; snapshot rows become state dicts on first access"""
+
+    def __init__(self, arrays, n_terms):
+        self.arrays = arrays
+        self.n_terms = n_terms
+        job_ids = unpack_strings(arrays['rematch.job_ids'], arrays['rematch.job_id_offsets'])
+        self.rows = {job_id: row for row, job_id in enumerate(job_ids)}
+        self.states = {}
+
+    def _load(self, job_id):
+        a = self.arrays
+        row = self.rows[job_id]
+        start, end = a['rematch.job_raw_indptr'][row:row + 2]
+        raw = sparse.csr_matrix(
+            (a['rematch.job_raw_data'][start:end], a['rematch.job_raw_indices'][start:end], [0, end - start]),
+            shape=(1, self.n_terms)
+        )
+        first, last = a['rematch.job_required_indptr'][row:row + 2]
+        self.states[job_id] = {
+            'raw': raw,
+            'norm': float(a['rematch.job_norms'][row]),
+            'required': set(unpack_strings(a['rematch.job_required'],
+                                           a['rematch.job_required_offsets'][first:last + 1])),
+            'dots': a['rematch.dots'][row],
+            'matched': a['rematch.matched'][row],
+            'scores': a['rematch.scores'][row]
+        }
+        return self.states[job_id]
+
+    def __len__(self):
+        return len(self.rows.keys() | self.states.keys())
+
+    def __contains__(self, job_id):
+        return job_id in self.states or job_id in self.rows
+
+    def __iter__(self):
+        return iter(list(self.states) + [job_id for job_id in self.rows if job_id not in self.states])
+
+    def __getitem__(self, job_id):
+        if job_id in self.states:
+            return self.states[job_id]
+        return self._load(job_id)
+
+    def __setitem__(self, job_id, state):
+        self.states[job_id] = state
+
+    def get(self, job_id, default=None):
+        return self[job_id] if job_id in self else default
+
+    def items(self):
+        return ((job_id, self[job_id]) for job_id in self)
+
+
+class IncrementalMatcher:
+    """Cached per-pair match components with skill and term inverted indexes"""
+
+    def __init__(self):
+        self.vectorizer = None
+        self.resume_ids = []
+        self.resume_rows = {}
+        self.resume_skills = []
+        self.resume_csc = None
+        self.skill_index = {}
+        self.jobs = {}
+
+    def build(self, resumes, jobs):
+        """Fit IDF on all resume and job text, index resumes and score every job once"""
+        texts = [r.get('resume_text', '') for r in resumes] + [j.get('description', '') for j in jobs]
+        self.vectorizer = TfidfVectorizer(stop_words='english', norm=None)
+        self.vectorizer.fit(texts)
+
+        self.resume_ids = []
+        self.resume_rows = {}
+        self.resume_skills = []
+        self.skill_index = defaultdict(set)
+        self.jobs = {}
+
+        rows = normalize(self.vectorizer.transform([r.get('resume_text', '') for r in resumes]))
+        for row, resume in enumerate(resumes):
+            resume_id = str(resume['id'])
+            self.resume_ids.append(resume_id)
+            self.resume_rows[resume_id] = row
+            skills = _skill_set(resume.get('skills', []))
+            self.resume_skills.append(skills)
+            for skill in skills:
+                self.skill_index[skill].add(row)
+        # Skill -> resume rows as arrays so counts update with one vectorized add
+        self.skill_index = {
+            skill: np.fromiter(sorted(skill_rows), dtype=np.int64)
+            for skill, skill_rows in self.skill_index.items()
+        }
+        # CSC: each column lists the resumes containing that term
+        self.resume_csc = sparse.csc_matrix(rows, dtype=np.float64)
+
+        for job in jobs:
+            self.set_job(job)
+        return self
+
+    def _job_vector(self, description):
+        raw = self.vectorizer.transform([description or '']).tocsr()
+        raw.eliminate_zeros()
+        return raw, float(np.sqrt(raw.multiply(raw).sum()))
+
+    def _scores(self, dots, matched, norm, n_required):
+        text_similarity = dots / norm if norm > 0 else np.zeros_like(dots)
+        skills_match = matched / n_required if n_required else np.zeros_like(dots)
+        return np.round((skills_match * SKILLS_WEIGHT + text_similarity * TEXT_WEIGHT) * 100, 2)
+
+    def set_job(self, job):
+        """Score a job against every resume from scratch (new jobs)"""
+        job_id = str(job['id'])
+        raw, norm = self._job_vector(job.get('description', ''))
+        required = _skill_set(job.get('required_skills', []))
+
+        dots = np.asarray(self.resume_csc @ raw.T.toarray()).ravel()
+        matched = np.zeros(len(self.resume_ids), dtype=np.int32)
+        for skill in required:
+            rows = self.skill_index.get(skill)
+            if rows is not None:
+                matched[rows] += 1
+
+        self.jobs[job_id] = {
+            'raw': raw,
+            'norm': norm,
+            'required': required,
+            'dots': dots,
+            'matched': matched,
+            'scores': self._scores(dots, matched, norm, len(required))
+        }
+
+    def update_job(self, job):
+        """Apply a job edit and return only the scores that changed"""
+        job_id = str(job['id'])
+        state = self.jobs.get(job_id)
+        if state is None:
+            self.set_job(job)
+            state = self.jobs[job_id]
+            changed_rows = np.flatnonzero(state['scores'])
+            return self._delta(job_id, changed_rows, np.zeros(len(changed_rows)), state, 0, 0)
+
+        # 1. Text: only the terms whose weight changed touch the cached dots
+        raw, norm = self._job_vector(job.get('description', ''))
+        diff = (raw - state['raw']).tocsr()
+        diff.eliminate_zeros()
+        changed_terms = diff.indices
+
+        dots = state['dots'].copy()
+        if len(changed_terms):
+            columns = self.resume_csc[:, changed_terms]
+            touched = np.unique(columns.indices)
+            dots[touched] += (columns[touched] @ diff.data)
+
+        # 2. Skills: only added/removed skills touch the cached overlap counts
+        required = _skill_set(job.get('required_skills', []))
+        added = required - state['required']
+        removed = state['required'] - required
+        matched = state['matched'].copy()
+        for skills, step in ((added, 1), (removed, -1)):
+            for skill in skills:
+                rows = self.skill_index.get(skill)
+                if rows is not None:
+                    matched[rows] += step
+
+        # 3. Re-rank only resumes whose score can move: a changed norm or skill count
+        # rescales every pair with a non-zero component, otherwise only touched rows move
+        if norm != state['norm'] or len(required) != len(state['required']):
+            candidates = np.flatnonzero((state['dots'] != 0) | (dots != 0) |
+                                        (state['matched'] != 0) | (matched != 0))
+        else:
+            touched = [self.skill_index[skill] for skill in added | removed if skill in self.skill_index]
+            if len(changed_terms):
+                touched.append(self.resume_csc[:, changed_terms].indices.astype(np.int64))
+            candidates = np.unique(np.concatenate(touched)) if touched else np.zeros(0, dtype=np.int64)
+
+        old_scores = state['scores']
+        new_scores = old_scores.copy()
+        if len(candidates):
+            new_scores[candidates] = self._scores(dots[candidates], matched[candidates], norm, len(required))
+
+        self.jobs[job_id] = {
+            'raw': raw,
+            'norm': norm,
+            'required': required,
+            'dots': dots,
+            'matched': matched,
+            'scores': new_scores
+        }
+
+        changed_rows = candidates[new_scores[candidates] != old_scores[candidates]] if len(candidates) else candidates
+        return self._delta(job_id, changed_rows, old_scores[changed_rows], self.jobs[job_id],
+                           len(changed_terms), len(candidates))
+
+    def _delta(self, job_id, rows, old_scores, state, terms_recomputed, candidates_checked):
+        changes = []
+        for row, old_score in zip(rows, old_scores):
+            skills = self.resume_skills[row]
+            changes.append({
+                'resume_id': self.resume_ids[row],
+                'old_score': float(old_score),
+                'match_score': float(state['scores'][row]),
+                'matched_skills': sorted(skills & state['required']),
+                'skills_gap': sorted(state['required'] - skills)
+            })
+        changes.sort(key=lambda change: change['match_score'], reverse=True)
+        return {
+            'job_id': job_id,
+            'changed': changes,
+            'changed_count': len(changes),
+            'terms_recomputed': int(terms_recomputed),
+            'candidates_checked': int(candidates_checked),
+            'total_resumes': len(self.resume_ids)
+        }
+
+    def snapshot_arrays(self):
+        """Fitted IDF, resume indexes and every job's cached components as named arrays"""
+        skill_names = sorted(self.skill_index)
+        skill_ids = {skill: i for i, skill in enumerate(skill_names)}
+        resume_skill_ids = [sorted(skill_ids[skill] for skill in skills) for skills in self.resume_skills]
+        resume_ids, resume_id_offsets = pack_strings(self.resume_ids)
+        names, name_offsets = pack_strings(skill_names)
+
+        job_ids = list(self.jobs)
+        states = [self.jobs[job_id] for job_id in job_ids]
+        raw = sparse.vstack([state['raw'] for state in states]).tocsr() if states else \
+            sparse.csr_matrix((0, len(self.vectorizer.vocabulary_)))
+        required = [sorted(state['required']) for state in states]
+        packed_job_ids, job_id_offsets = pack_strings(job_ids)
+        packed_required, required_offsets = pack_strings([skill for skills in required for skill in skills])
+        n_resumes = len(self.resume_ids)
+
+        return {
+            **vectorizer_arrays('rematch.tfidf', self.vectorizer),
+            'rematch.resume_ids': resume_ids,
+            'rematch.resume_id_offsets': resume_id_offsets,
+            'rematch.csc_data': self.resume_csc.data,
+            'rematch.csc_indices': self.resume_csc.indices,
+            'rematch.csc_indptr': self.resume_csc.indptr,
+            'rematch.skill_names': names,
+            'rematch.skill_name_offsets': name_offsets,
+            'rematch.skill_rows': np.concatenate([self.skill_index[skill] for skill in skill_names])
+            if skill_names else np.zeros(0, dtype=np.int64),
+            'rematch.skill_rows_indptr': np.cumsum([0] + [len(self.skill_index[skill]) for skill in skill_names]),
+            'rematch.resume_skill_ids': np.array([i for ids in resume_skill_ids for i in ids], dtype=np.int32),
+            'rematch.resume_skill_indptr': np.cumsum([0] + [len(ids) for ids in resume_skill_ids]),
+            'rematch.job_ids': packed_job_ids,
+            'rematch.job_id_offsets': job_id_offsets,
+            'rematch.job_raw_data': raw.data,
+            'rematch.job_raw_indices': raw.indices,
+            'rematch.job_raw_indptr': raw.indptr,
+            'rematch.job_norms': np.array([state['norm'] for state in states], dtype=np.float64),
+            'rematch.job_required': packed_required,
+            'rematch.job_required_offsets': required_offsets,
+            'rematch.job_required_indptr': np.cumsum([0] + [len(skills) for skills in required]),
+            'rematch.dots': np.array([state['dots'] for state in states], dtype=np.float64).reshape(-1, n_resumes),
+            'rematch.matched': np.array([state['matched'] for state in states], dtype=np.int32).reshape(-1, n_resumes),
+            'rematch.scores': np.array([state['scores'] for state in states], dtype=np.float64).reshape(-1, n_resumes)
+        }
+
+    def restore(self, arrays):
+        """Adopt a snapshot's arrays (memory mapped); job states are decoded lazily"""
+        a = arrays
+        self.vectorizer = restore_vectorizer(a, 'rematch.tfidf', TfidfVectorizer(stop_words='english', norm=None))
+        n_terms = len(self.vectorizer.vocabulary_)
+        self.resume_ids = unpack_strings(a['rematch.resume_ids'], a['rematch.resume_id_offsets'])
+        self.resume_rows = {resume_id: row for row, resume_id in enumerate(self.resume_ids)}
+        self.resume_csc = sparse.csc_matrix(
+            (a['rematch.csc_data'], a['rematch.csc_indices'], a['rematch.csc_indptr']),
+            shape=(len(self.resume_ids), n_terms)
+        )
+
+        skill_names = unpack_strings(a['rematch.skill_names'], a['rematch.skill_name_offsets'])
+        bounds = a['rematch.skill_rows_indptr']
+        self.skill_index = {
+            skill: a['rematch.skill_rows'][bounds[i]:bounds[i + 1]] for i, skill in enumerate(skill_names)
+        }
+        self.resume_skills = _SnapshotSkillSets(
+            skill_names, a['rematch.resume_skill_indptr'], a['rematch.resume_skill_ids']
+        )
+        self.jobs = _SnapshotJobs(a, n_terms)
+        return self
+
+    def job_arrays(self, job_id):
+        """One job's cached components as named arrays, to hand a single edit to other processes"""
+        state = self.jobs[job_id]
+        packed_job_id, job_id_offsets = pack_strings([job_id])
+        required, required_offsets = pack_strings(sorted(state['required']))
+        return {
+            'job_id': packed_job_id,
+            'job_id_offsets': job_id_offsets,
+            'raw_data': state['raw'].data,
+            'raw_indices': state['raw'].indices,
+            'norm': np.array(state['norm'], dtype=np.float64),
+            'required': required,
+            'required_offsets': required_offsets,
+            'dots': state['dots'],
+            'matched': state['matched'],
+            'scores': state['scores']
+        }
+
+    def restore_job(self, arrays):
+        """Adopt one job's components written by job_arrays; returns the job id"""
+        job_id = unpack_strings(arrays['job_id'], arrays['job_id_offsets'])[0]
+        n_terms = len(self.vectorizer.vocabulary_)
+        raw = sparse.csr_matrix(
+            (arrays['raw_data'], arrays['raw_indices'], [0, len(arrays['raw_data'])]), shape=(1, n_terms)
+        )
+        self.jobs[job_id] = {
+            'raw': raw,
+            'norm': float(arrays['norm']),
+            'required': set(unpack_strings(arrays['required'], arrays['required_offsets'])),
+            'dots': arrays['dots'],
+            'matched': arrays['matched'],
+            'scores': arrays['scores']
+        }
+        return job_id
+
+    def top_matches(self, job_id, limit=10):
+        """Current best resumes for a job"""
+        scores = self.jobs[str(job_id)]['scores']
+        order = np.argsort(-scores)[:limit]
+        return [{'resume_id': self.resume_ids[row], 'match_score': float(scores[row])} for row in order]
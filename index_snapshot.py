@@ -0,0 +1,196 @@
+"""Versioned on-disk snapshots of in-memory indexes, restored through mmap.
+
+A snapshot is a generation directory of raw .npy arrays plus a manifest:
+
+    <snapshot_dir>/CURRENT                 name of the live generation
+    <snapshot_dir>/<generation>/manifest.json
+    <snapshot_dir>/<generation>/<array>.npy
+
+Writers fill a fresh generation directory and then atomically replace
+CURRENT, so a crash mid-write never exposes a half-written snapshot and
+readers that still map an older generation keep working. Arrays are loaded
+with np.load(mmap_mode='r'): restoring costs a few file opens, pages are read
+lazily on first use and are shared through the page cache by every process
+that maps them (e.g. pre-forked workers).
+
+The manifest records the format version, the writer's config, and a
+SHA-256 and shape/dtype for every array. Loading rejects snapshots with
+another format version, a different config, a manifest that does not match
+its own checksum, or arrays whose size/shape changed. Re-hashing the array
+contents (verify='full') touches every page, so it is opt-in.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_KEEP = 2
+
+
+class SnapshotError(Exception):
+    """Snapshot is missing, corrupt, or was written by another version or config"""
+
+
+def pack_strings(strings):
+    """List of strings as one UTF-8 byte array plus int64 offsets (len + 1)"""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def unpack_strings(blob, offsets):
+    """Inverse of pack_strings; offsets may be a slice of the full offsets array"""
+    bounds = offsets.tolist()
+    if not bounds:
+        return []
+    start = bounds[0]
+    data = bytes(blob[start:bounds[-1]])
+    return [data[bounds[i] - start:bounds[i + 1] - start].decode('utf-8') for i in range(len(bounds) - 1)]
+
+
+def _digest(array):
+    return hashlib.sha256(np.ascontiguousarray(array).view(np.uint8).ravel()).hexdigest()
+
+
+def _manifest_checksum(manifest):
+    body = {key: value for key, value in manifest.items() if key != 'manifest_checksum'}
+    return hashlib.sha256(json.dumps(body, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def save_snapshot(snapshot_dir, arrays, metadata, config):
+    """Write a new generation and make it current; returns the generation name"""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    generation = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{time.monotonic_ns() % 1000000:06d}"
+    path = os.path.join(snapshot_dir, generation)
+    os.makedirs(path)
+
+    entries = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        np.save(os.path.join(path, f'{name}.npy'), array, allow_pickle=False)
+        entries[name] = {
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'bytes': int(os.path.getsize(os.path.join(path, f'{name}.npy'))),
+            'sha256': _digest(array)
+        }
+
+    manifest = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'created_at': time.time(),
+        'config': config,
+        'metadata': metadata,
+        'arrays': entries
+    }
+    manifest['manifest_checksum'] = _manifest_checksum(manifest)
+    with open(os.path.join(path, 'manifest.json'), 'w') as manifest_file:
+        json.dump(manifest, manifest_file)
+        manifest_file.flush()
+        os.fsync(manifest_file.fileno())
+
+    current_tmp = os.path.join(snapshot_dir, f'CURRENT.{os.getpid()}.tmp')
+    with open(current_tmp, 'w') as current_file:
+        current_file.write(generation)
+        current_file.flush()
+        os.fsync(current_file.fileno())
+    os.replace(current_tmp, os.path.join(snapshot_dir, 'CURRENT'))
+
+    _prune(snapshot_dir, generation)
+    return generation
+
+
+def _prune(snapshot_dir, current):
+    """Remove all but the newest SNAPSHOT_KEEP generations (never the current one)"""
+    generations = sorted(
+        name for name in os.listdir(snapshot_dir)
+        if os.path.isfile(os.path.join(snapshot_dir, name, 'manifest.json'))
+    )
+    for name in generations[:-SNAPSHOT_KEEP]:
+        if name != current:
+            shutil.rmtree(os.path.join(snapshot_dir, name), ignore_errors=True)
+
+
+def current_generation(snapshot_dir):
+    """Name of the current generation, or None if nothing was saved yet (one small read)"""
+    try:
+        with open(os.path.join(snapshot_dir, 'CURRENT')) as current_file:
+            return current_file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+@contextmanager
+def snapshot_lock(snapshot_dir):
+    """Exclusive flock serializing read-modify-write of a snapshot directory across processes"""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    with open(os.path.join(snapshot_dir, 'LOCK'), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def load_snapshot(snapshot_dir, config, verify='size'):
+    """(arrays, metadata, manifest) of the current generation; arrays are read-only memmaps"""
+    try:
+        with open(os.path.join(snapshot_dir, 'CURRENT')) as current_file:
+            generation = current_file.read().strip()
+        path = os.path.join(snapshot_dir, generation)
+        with open(os.path.join(path, 'manifest.json')) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f'No readable snapshot in {snapshot_dir}: {e}')
+
+    if manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"Snapshot format {manifest.get('format_version')} != {SNAPSHOT_FORMAT_VERSION}")
+    if manifest.get('manifest_checksum') != _manifest_checksum(manifest):
+        raise SnapshotError('Snapshot manifest checksum mismatch')
+    if manifest['config'] != config:
+        raise SnapshotError(f"Stale snapshot: written with {manifest['config']}, running with {config}")
+
+    arrays = {}
+    for name, entry in manifest['arrays'].items():
+        array_path = os.path.join(path, f'{name}.npy')
+        try:
+            if os.path.getsize(array_path) != entry['bytes']:
+                raise SnapshotError(f'Snapshot array {name} has the wrong size')
+            # Empty arrays cannot be memory mapped
+            array = np.load(array_path, mmap_mode='r' if np.prod(entry['shape']) else None,
+                            allow_pickle=False)
+        except OSError as e:
+            raise SnapshotError(f'Snapshot array {name} unreadable: {e}')
+        if array.dtype.str != entry['dtype'] or list(array.shape) != entry['shape']:
+            raise SnapshotError(f'Snapshot array {name} does not match the manifest')
+        if verify == 'full' and _digest(array) != entry['sha256']:
+            raise SnapshotError(f'Snapshot array {name} checksum mismatch')
+        arrays[name] = array
+
+    manifest['generation'] = generation
+    return arrays, manifest['metadata'], manifest
+
+
+def vectorizer_arrays(prefix, vectorizer):
+    """Vocabulary (ordered by column) and IDF weights of a fitted TfidfVectorizer"""
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+    blob, offsets = pack_strings(terms)
+    return {
+        f'{prefix}.vocabulary': blob,
+        f'{prefix}.vocabulary_offsets': offsets,
+        f'{prefix}.idf': np.asarray(vectorizer.idf_, dtype=np.float64)
+    }
+
+
+def restore_vectorizer(arrays, prefix, vectorizer):
+    """Load vocabulary and IDF weights into an unfitted TfidfVectorizer with the original params"""
+    terms = unpack_strings(arrays[f'{prefix}.vocabulary'], arrays[f'{prefix}.vocabulary_offsets'])
+    vectorizer.vocabulary_ = dict(zip(terms, range(len(terms))))
+    vectorizer.idf_ = arrays[f'{prefix}.idf']
+    return vectorizer
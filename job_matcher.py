@@ -2,19 +2,66 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 from flask import Flask, request, jsonify
+import os
+import json
+import time
+import glob
+import atexit
+import shutil
+import hashlib
+import tempfile
+import threading
+from lsa_index import LsaIndex
+from incremental_match import IncrementalMatcher
+from skill_normalizer import FUZZY_SKILLS, skill_normalizer
+from deadline import Deadline, DeadlineExceeded
+from index_snapshot import SnapshotError, current_generation, load_snapshot, save_snapshot, snapshot_lock
+from feature_store import FeatureStore, FeatureStoreError
+from requirement_match import RequirementPool
 
 app = Flask(__name__)
 
-def calculate_match_score(resume_text, job_description, resume_skills, required_skills):
-    """Calculate match score between resume and job using TF-IDF and cosine similarity"""
-    
-    # Text-based similarity using TF-IDF
-    documents = [resume_text, job_description]
-    vectorizer = TfidfVectorizer(stop_words='english')
-    tfidf_matrix = vectorizer.fit_transform(documents)
-    text_similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+# Dense LSA match mode: fitted on our corpus via /lsa/fit
+LSA_COMPONENTS = int(os.environ.get('LSA_COMPONENTS', 100))
+# float16/int8 halve/quarter job vector memory at the cost of single-query latency:
+# a float16 query is over 10x slower than float32 (NumPy has no vectorized upcast),
+# int8 about 1.2-1.5x (see bench_quantize.py)
+VECTOR_STORAGE = os.environ.get('VECTOR_STORAGE', 'float32')
+lsa_index = LsaIndex(n_components=LSA_COMPONENTS, storage=VECTOR_STORAGE)
+indexed_jobs = []
+
+# Cached per-pair components for incremental rematching on job edits
+rematch_index = IncrementalMatcher()
+
+# On-disk snapshots of the indexes above, memory mapped on startup instead of rebuilt
+SNAPSHOT_DIR = os.environ.get('MATCHER_SNAPSHOT_DIR')
+SNAPSHOT_VERIFY = os.environ.get('MATCHER_SNAPSHOT_VERIFY', 'size')
+snapshot_state = {'generation': None, 'restored': False, 'corpus': None}
+
+# Out-of-core resume features for ranking pools larger than memory (see feature_store)
+FEATURE_STORE_DIR = os.environ.get('FEATURE_STORE_DIR')
+feature_store = None
+
+# Precomputed experience/education/skill features of a candidate pool (POST /match/pool/index)
+requirement_pool = None
+
+# Indexes every pre-fork worker must serve alike. The worker that changes one publishes
+# a new generation under MATCHER_STATE_DIR (under a file lock) and the other workers
+# adopt it before their next request. Only MATCHER_SNAPSHOT_DIR survives a restart: the
+# state directory is a fresh temp directory unless set, and is cleared on startup
+MATCHER_STATE_DIR = os.environ.get('MATCHER_STATE_DIR') or tempfile.mkdtemp(prefix='job_matcher_state-')
+SHARED_INDEXES = ('lsa', 'rematch', 'pool')
+shared_generations = {name: None for name in SHARED_INDEXES}
+# Per-job rematch edits saved by any worker, by file name -> (inode, mtime, size) last adopted
+rematch_job_stamps = {}
+state_lock = threading.Lock()
+
+def calculate_skills_match(resume_skills, required_skills):
+    """Fraction of required skills present in the resume, plus matched and missing skills"""
+    if FUZZY_SKILLS:
+        resume_skills = skill_normalizer.normalize_all(resume_skills)
+        required_skills = skill_normalizer.normalize_all(required_skills)
     
-    # Skills-based matching
     resume_skills_set = set([skill.lower() for skill in resume_skills])
     required_skills_set = set([skill.lower() for skill in required_skills])
     
@@ -24,13 +71,33 @@ def calculate_match_score(resume_text, job_description, resume_skills, required_
     else:
         skills_match_percentage = 0
     
-    # Combined score (60% skills, 40% text similarity)
-    final_score = (skills_match_percentage * 0.6 + text_similarity * 0.4) * 100
-    
     # Identify matched and missing skills
     matched_skills_list = list(resume_skills_set.intersection(required_skills_set))
     skills_gap = list(required_skills_set - resume_skills_set)
     
+    return skills_match_percentage, matched_skills_list, skills_gap
+
+def calculate_match_score(resume_text, job_description, resume_skills, required_skills, mode='tfidf'):
+    """Calculate match score between resume and job using TF-IDF (or LSA) and cosine similarity"""
+    
+    if mode == 'lsa':
+        # Dense similarity in the fitted LSA space
+        text_similarity = lsa_index.similarity(resume_text, job_description)
+    else:
+        # Text-based similarity using TF-IDF
+        documents = [resume_text, job_description]
+        vectorizer = TfidfVectorizer(stop_words='english')
+        tfidf_matrix = vectorizer.fit_transform(documents)
+        text_similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+    
+    # Skills-based matching
+    skills_match_percentage, matched_skills_list, skills_gap = calculate_skills_match(
+        resume_skills, required_skills
+    )
+    
+    # Combined score (60% skills, 40% text similarity)
+    final_score = (skills_match_percentage * 0.6 + text_similarity * 0.4) * 100
+    
     return {
         'match_score': round(final_score, 2),
         'text_similarity': round(text_similarity * 100, 2),
@@ -43,23 +110,613 @@ def calculate_match_score(resume_text, job_description, resume_skills, required_
 def match_resume_to_job():
     """API endpoint to match resume with job"""
     try:
+        deadline = Deadline.from_headers(request.headers)
         data = request.json
         
         resume_text = data.get('resume_text', '')
         job_description = data.get('job_description', '')
         resume_skills = data.get('resume_skills', [])
         required_skills = data.get('required_skills', [])
+        mode = data.get('mode', 'tfidf')
         
+        if mode == 'lsa' and not lsa_index.is_fitted:
+            return jsonify({'error': 'LSA mode requested but no model is fitted (POST /lsa/fit)'}), 400
+        
+        deadline.check('scoring')
         result = calculate_match_score(
             resume_text, 
             job_description, 
             resume_skills, 
-            required_skills
+            required_skills,
+            mode
+        )
+        
+        # Experience and education checks when the caller sends them
+        if 'experience_required' in data or 'qualifications' in data:
+            pool = RequirementPool([{
+                'experience': data.get('resume_experience', []),
+                'education': data.get('resume_education', [])
+            }])
+            requirements = pool.score({
+                'experience_required': data.get('experience_required'),
+                'qualifications': data.get('qualifications')
+            })
+            result['experience_match'] = round(float(requirements['experience_match'][0]), 2)
+            result['education_match'] = round(float(requirements['education_match'][0]), 2)
+        
+        return jsonify(result), 200
+    except DeadlineExceeded as e:
+        return jsonify({'error': str(e), 'timeout': True}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/match/batch', methods=['POST'])
+def match_resume_to_jobs():
+    """Score one resume against a list of jobs, stopping at the request deadline"""
+    try:
+        deadline = Deadline.from_headers(request.headers)
+        data = request.json or {}
+        
+        resume_text = data.get('resume_text', '')
+        resume_skills = data.get('resume_skills', [])
+        jobs = data.get('jobs', [])
+        mode = data.get('mode', 'tfidf')
+        
+        if mode == 'lsa' and not lsa_index.is_fitted:
+            return jsonify({'error': 'LSA mode requested but no model is fitted (POST /lsa/fit)'}), 400
+        
+        deadline.check('scoring')
+        matches = []
+        for job in jobs:
+            # Jobs not reached in time are left out; the caller falls back for those
+            if deadline.expired():
+                break
+            result = calculate_match_score(
+                resume_text,
+                job.get('description', ''),
+                resume_skills,
+                job.get('required_skills', []),
+                mode
+            )
+            matches.append({'job_id': job.get('id'), **result})
+        
+        return jsonify({
+            'total_jobs': len(jobs),
+            'scored_jobs': len(matches),
+            'partial': len(matches) < len(jobs),
+            'matches': matches
+        }), 200
+    except DeadlineExceeded as e:
+        return jsonify({'error': str(e), 'timeout': True}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/match/pool/index', methods=['POST'])
+def index_requirement_pool():
+    """Precompute skill, experience and education features for a candidate pool"""
+    global requirement_pool
+    try:
+        resumes = (request.json or {}).get('resumes', [])
+        if not resumes:
+            return jsonify({'error': 'resumes are required'}), 400
+        
+        started = time.perf_counter()
+        pool = RequirementPool(resumes)
+        with snapshot_lock(MATCHER_STATE_DIR), state_lock:
+            requirement_pool = pool
+            publish_state('pool', pool.snapshot_arrays())
+        
+        return jsonify({
+            'status': 'indexed',
+            'resumes': len(requirement_pool),
+            'build_time_ms': round((time.perf_counter() - started) * 1000, 2)
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/match/pool', methods=['POST'])
+def match_job_to_pool():
+    """Score every resume of a pool against one job's skills, experience and qualifications
+
+    Resumes can be sent inline or indexed beforehand with /match/pool/index.
+    match_score uses the weights of the Node basic match (60/20/20).
+    """
+    try:
+        deadline = Deadline.from_headers(request.headers)
+        data = request.json or {}
+        job = data.get('job') or {}
+        
+        started = time.perf_counter()
+        pool = RequirementPool(data['resumes']) if data.get('resumes') else requirement_pool
+        if pool is None:
+            return jsonify({'error': 'No resumes sent and no pool indexed (POST /match/pool/index)'}), 400
+        
+        deadline.check('scoring')
+        scores = pool.score(job)
+        order = np.argsort(-scores['match_score'], kind='stable')
+        top_k = data.get('top_k')
+        if top_k is not None:
+            order = order[:int(top_k)]
+        
+        required = scores['required']
+        matches = []
+        for row in order:
+            matches.append({
+                'resume_id': pool.ids[row],
+                'match_score': round(float(scores['match_score'][row]), 2),
+                'skills_match': round(float(scores['skills_match'][row]), 2),
+                'experience_match': round(float(scores['experience_match'][row]), 2),
+                'education_match': round(float(scores['education_match'][row]), 2),
+                'experience_years': round(float(pool.years[row]), 2),
+                'matched_skills': sorted(pool.skill_sets[row] & required),
+                'skills_gap': sorted(required - pool.skill_sets[row])
+            })
+        
+        return jsonify({
+            'total_resumes': len(pool),
+            'matches': matches,
+            'match_time_ms': round((time.perf_counter() - started) * 1000, 2)
+        }), 200
+    except DeadlineExceeded as e:
+        return jsonify({'error': str(e), 'timeout': True}), 504
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/lsa/fit', methods=['POST'])
+def fit_lsa():
+    """Fit the LSA model on a corpus and index the job catalog as dense vectors"""
+    try:
+        data = request.json or {}
+        
+        started = time.perf_counter()
+        with snapshot_lock(MATCHER_STATE_DIR), state_lock:
+            fit_job_index(data.get('documents', []), data.get('jobs', []))
+            publish_state('lsa', lsa_index.snapshot_arrays(), {'indexed_jobs': indexed_jobs})
+        
+        return jsonify({
+            'status': 'fitted',
+            'fit_time_ms': round((time.perf_counter() - started) * 1000, 2),
+            **lsa_index.memory_report()
+        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/snapshot', methods=['POST'])
+def snapshot_indexes():
+    """Write the current indexes to MATCHER_SNAPSHOT_DIR for the next restart"""
+    try:
+        if not SNAPSHOT_DIR:
+            return jsonify({'error': 'MATCHER_SNAPSHOT_DIR is not configured'}), 400
+        if not lsa_index.is_fitted and rematch_index.resume_csc is None:
+            return jsonify({'error': 'Nothing to snapshot (POST /lsa/fit or /rematch/index first)'}), 400
+        
+        started = time.perf_counter()
+        generation = write_index_snapshot()
+        
+        return jsonify({
+            'status': 'saved',
+            'generation': generation,
+            'save_time_ms': round((time.perf_counter() - started) * 1000, 2)
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def get_feature_store():
+    """Open (or create) the feature store for the fitted LSA model"""
+    global feature_store
+    if not FEATURE_STORE_DIR:
+        raise ValueError('FEATURE_STORE_DIR is not configured')
+    if not lsa_index.is_fitted:
+        raise ValueError('No LSA model fitted (POST /lsa/fit)')
+    if feature_store is None or feature_store.manifest['vector_model'] != lsa_index.model_id:
+        feature_store = FeatureStore(FEATURE_STORE_DIR, lsa_index.job_store.dimensions, lsa_index.model_id)
+    return feature_store
+
+def feature_skills(skills):
+    """Normalized, lowercased, de-duplicated skills as stored in the feature store bitsets"""
+    if FUZZY_SKILLS:
+        skills = skill_normalizer.normalize_all(skills)
+    return sorted(set(skill.lower() for skill in skills))
+
+@app.route('/features/resumes', methods=['POST'])
+def append_resume_features():
+    """Append (or replace) resumes in the on-disk feature store"""
+    try:
+        resumes = (request.json or {}).get('resumes', [])
+        if not resumes or any('id' not in resume for resume in resumes):
+            return jsonify({'error': 'resumes with an id are required'}), 400
+        
+        store = get_feature_store()
+        started = time.perf_counter()
+        vectors = lsa_index.transform([resume.get('resume_text', '') for resume in resumes])
+        records = []
+        for resume, vector in zip(resumes, vectors):
+            text = resume.get('resume_text', '')
+            analysis = resume.get('analysis') or {}
+            records.append({
+                'resume_id': resume['id'],
+                'skills': feature_skills(resume.get('skills', [])),
+                'vector': vector,
+                'word_count': len(text.split()),
+                'text_chars': len(text),
+                'overall_score': analysis.get('overall_score'),
+                'ats_score': (analysis.get('ats_optimization') or {}).get('ats_score'),
+                'experience_count': len(resume.get('experience', [])),
+                'education_count': len(resume.get('education', [])),
+                'partial': 1 if resume.get('partial') else 0
+            })
+        store.append(records)
+        
+        return jsonify({
+            'status': 'appended',
+            'appended': len(records),
+            'append_time_ms': round((time.perf_counter() - started) * 1000, 2),
+            **store.stats()
+        }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FeatureStoreError as e:
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/features/resumes/delete', methods=['POST'])
+def delete_resume_features():
+    """Tombstone resumes in the feature store"""
+    try:
+        ids = (request.json or {}).get('ids', [])
+        if not ids:
+            return jsonify({'error': 'ids are required'}), 400
+        store = get_feature_store()
+        store.delete(ids)
+        return jsonify({'status': 'deleted', 'deleted': len(ids), **store.stats()}), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FeatureStoreError as e:
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/features/compact', methods=['POST'])
+def compact_resume_features():
+    """Rewrite the feature store without superseded and deleted rows"""
+    try:
+        return jsonify(get_feature_store().compact()), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FeatureStoreError as e:
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/features/rank', methods=['POST'])
+def rank_stored_resumes():
+    """Rank every stored resume against one job with a chunked scan of the feature store"""
+    try:
+        deadline = Deadline.from_headers(request.headers)
+        data = request.json or {}
+        store = get_feature_store()
+        
+        started = time.perf_counter()
+        result = store.rank(
+            lsa_index.transform([data.get('job_description', '')])[0],
+            feature_skills(data.get('required_skills', [])),
+            top_k=int(data.get('top_k', 10)),
+            min_overall_score=data.get('min_overall_score'),
+            deadline=deadline
         )
+        result['rank_time_ms'] = round((time.perf_counter() - started) * 1000, 2)
         
         return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FeatureStoreError as e:
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/match/jobs', methods=['POST'])
+def match_resume_to_indexed_jobs():
+    """Rank a resume against every indexed job with one dense matrix-vector product"""
+    try:
+        deadline = Deadline.from_headers(request.headers)
+        data = request.json or {}
+        
+        if not lsa_index.is_fitted:
+            return jsonify({'error': 'No LSA model fitted (POST /lsa/fit)'}), 400
+        
+        resume_text = data.get('resume_text', '')
+        resume_skills = data.get('resume_skills', [])
+        top_k = int(data.get('top_k', 10))
+        
+        deadline.check('scoring')
+        text_scores = lsa_index.score_jobs(resume_text)
+        
+        matches = []
+        for job, text_similarity in zip(indexed_jobs, text_scores):
+            # Out of budget: rank the jobs whose skills were compared so far
+            if deadline.expired():
+                break
+            skills_match_percentage, matched_skills, skills_gap = calculate_skills_match(
+                resume_skills, job['required_skills']
+            )
+            final_score = (skills_match_percentage * 0.6 + float(text_similarity) * 0.4) * 100
+            matches.append({
+                'job_id': job['id'],
+                'title': job['title'],
+                'match_score': round(final_score, 2),
+                'text_similarity': round(float(text_similarity) * 100, 2),
+                'skills_match': round(skills_match_percentage * 100, 2),
+                'matched_skills': matched_skills,
+                'skills_gap': skills_gap
+            })
+        
+        matches.sort(key=lambda match: match['match_score'], reverse=True)
+        
+        return jsonify({
+            'total_jobs': len(indexed_jobs),
+            'scored_jobs': len(matches),
+            'partial': len(matches) < len(indexed_jobs),
+            'matches': matches[:top_k]
+        }), 200
+    except DeadlineExceeded as e:
+        return jsonify({'error': str(e), 'timeout': True}), 504
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/rematch/index', methods=['POST'])
+def build_rematch_index():
+    """Index resumes and jobs, cache every pair's score components and share them with all workers"""
+    try:
+        data = request.json or {}
+        resumes = data.get('resumes', [])
+        jobs = data.get('jobs', [])
+        
+        if not resumes:
+            return jsonify({'error': 'resumes are required'}), 400
+        
+        started = time.perf_counter()
+        with snapshot_lock(MATCHER_STATE_DIR), state_lock:
+            rematch_index.build(resumes, jobs)
+            rematch_job_stamps.clear()
+            generation = publish_state('rematch', rematch_index.snapshot_arrays())
+        
+        return jsonify({
+            'status': 'indexed',
+            'resumes': len(resumes),
+            'jobs': len(jobs),
+            'generation': generation,
+            'build_time_ms': round((time.perf_counter() - started) * 1000, 2)
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/rematch/job', methods=['POST'])
+def rematch_job():
+    """Apply a job edit and return only the match scores that changed"""
+    try:
+        job = (request.json or {}).get('job')
+        
+        if not job or 'id' not in job:
+            return jsonify({'error': 'job with an id is required'}), 400
+        
+        started = time.perf_counter()
+        # One edit at a time across workers, each applied to the newest version of the job
+        with snapshot_lock(MATCHER_STATE_DIR), state_lock:
+            sync_state('rematch', restore_rematch)
+            if rematch_index.resume_csc is None:
+                return jsonify({'error': 'Rematch index not built (POST /rematch/index)'}), 400
+            if shared_generations['rematch'] is None:
+                # Restored from MATCHER_SNAPSHOT_DIR at startup: share it before the first edit
+                publish_state('rematch', rematch_index.snapshot_arrays())
+            job_id = str(job['id'])
+            load_rematch_jobs([rematch_job_path(job_id)])
+            delta = rematch_index.update_job(job)
+            save_rematch_job(job_id)
+        delta['rematch_time_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        
+        return jsonify(delta), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def fit_job_index(documents, jobs, corpus=None):
+    """Fit the LSA model and replace the indexed job catalog"""
+    global indexed_jobs
+    snapshot_state['corpus'] = corpus
+    lsa_index.fit(documents + [job.get('description', '') for job in jobs])
+    indexed_jobs = [
+        {
+            'id': str(job.get('id', i)),
+            'title': job.get('title', ''),
+            'required_skills': job.get('required_skills', [])
+        }
+        for i, job in enumerate(jobs)
+    ]
+    lsa_index.set_jobs(
+        [job['id'] for job in indexed_jobs],
+        [job.get('description', '') for job in jobs]
+    )
+
+def snapshot_config(corpus):
+    """Settings a snapshot must have been written with to be reused"""
+    return {
+        'lsa_components': LSA_COMPONENTS,
+        'vector_storage': VECTOR_STORAGE,
+        'fuzzy_skills': FUZZY_SKILLS,
+        'skill_rules': skill_normalizer.fingerprint() if FUZZY_SKILLS else None,
+        'corpus': corpus
+    }
+
+def write_index_snapshot():
+    """Save the fitted LSA model, job catalog and rematch index as a new snapshot generation"""
+    if shared_generations['rematch'] is not None:
+        # Include job edits that other workers applied
+        load_rematch_jobs(glob.glob(os.path.join(rematch_jobs_dir(), '*.npz')))
+    arrays = {}
+    if lsa_index.is_fitted:
+        arrays.update(lsa_index.snapshot_arrays())
+    if rematch_index.resume_csc is not None:
+        arrays.update(rematch_index.snapshot_arrays())
+    metadata = {
+        'lsa_fitted': lsa_index.is_fitted,
+        'rematch_built': rematch_index.resume_csc is not None,
+        'indexed_jobs': indexed_jobs
+    }
+    generation = save_snapshot(SNAPSHOT_DIR, arrays, metadata, snapshot_config(snapshot_state['corpus']))
+    snapshot_state['generation'] = generation
+    print(f"💾 Index snapshot {generation} written to {SNAPSHOT_DIR}")
+    return generation
+
+def restore_index_snapshot(corpus):
+    """Memory map the current snapshot; raises SnapshotError if it is missing or stale"""
+    global indexed_jobs
+    arrays, metadata, manifest = load_snapshot(SNAPSHOT_DIR, snapshot_config(corpus), SNAPSHOT_VERIFY)
+    if metadata['lsa_fitted']:
+        lsa_index.restore(arrays)
+    if metadata['rematch_built']:
+        rematch_index.restore(arrays)
+    indexed_jobs = metadata['indexed_jobs']
+    snapshot_state.update(generation=manifest['generation'], restored=True, corpus=corpus)
+
+def state_path(name):
+    return os.path.join(MATCHER_STATE_DIR, name)
+
+def publish_state(name, arrays, metadata=None):
+    """Save an index as the newest shared generation (caller holds the state file lock)"""
+    generation = save_snapshot(state_path(name), arrays, metadata or {}, snapshot_config(None))
+    shared_generations[name] = generation
+    return generation
+
+def sync_state(name, restore):
+    """Adopt the newest generation of a shared index if another worker published one"""
+    generation = current_generation(state_path(name))
+    while generation is not None and generation != shared_generations[name]:
+        try:
+            arrays, metadata, manifest = load_snapshot(state_path(name), snapshot_config(None))
+        except SnapshotError as e:
+            newer = current_generation(state_path(name))
+            if newer == generation:
+                print(f"⚠️  Shared {name} index {generation} not used: {e}")
+                shared_generations[name] = generation
+                return
+            # Replaced (and pruned) while loading: try the newer one
+            generation = newer
+            continue
+        restore(arrays, metadata)
+        shared_generations[name] = manifest['generation']
+        return
+
+def restore_lsa(arrays, metadata):
+    global indexed_jobs
+    lsa_index.restore(arrays)
+    indexed_jobs = metadata['indexed_jobs']
+    snapshot_state['corpus'] = None
+
+def restore_rematch(arrays, metadata):
+    rematch_index.restore(arrays)
+    rematch_job_stamps.clear()
+
+def restore_pool(arrays, metadata):
+    global requirement_pool
+    requirement_pool = RequirementPool([]).restore(arrays)
+
+@app.before_request
+def sync_shared_indexes():
+    """Adopt indexes other workers published since this one last looked (a small read each)"""
+    with state_lock:
+        sync_state('lsa', restore_lsa)
+        sync_state('rematch', restore_rematch)
+        sync_state('pool', restore_pool)
+
+def rematch_jobs_dir():
+    """Job edits of the current rematch generation (removed with it)"""
+    return os.path.join(state_path('rematch'), shared_generations['rematch'], 'jobs')
+
+def rematch_job_path(job_id):
+    """File holding the latest edit of one job"""
+    return os.path.join(rematch_jobs_dir(), hashlib.sha1(job_id.encode('utf-8')).hexdigest() + '.npz')
+
+def load_rematch_jobs(paths):
+    """Adopt job edits saved by other workers that this one has not seen yet"""
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if rematch_job_stamps.get(os.path.basename(path)) == stamp:
+            continue
+        with np.load(path, allow_pickle=False) as job_file:
+            rematch_index.restore_job({name: job_file[name] for name in job_file.files})
+        rematch_job_stamps[os.path.basename(path)] = stamp
+
+def save_rematch_job(job_id):
+    """Write one job's cached components for the other workers (atomic replace)"""
+    path = rematch_job_path(job_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as job_file:
+        np.savez(job_file, **rematch_index.job_arrays(job_id))
+    os.replace(tmp_path, path)
+    stat = os.stat(path)
+    rematch_job_stamps[os.path.basename(path)] = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def remove_state_dir(owner=os.getpid()):
+    """Delete the temporary state directory when the process that created it exits"""
+    if os.getpid() == owner:
+        shutil.rmtree(MATCHER_STATE_DIR, ignore_errors=True)
+
+if os.environ.get('MATCHER_STATE_DIR'):
+    for name in SHARED_INDEXES:
+        shutil.rmtree(state_path(name), ignore_errors=True)
+else:
+    atexit.register(remove_state_dir)
+
+def corpus_fingerprint(corpus_path):
+    """Content hash of the warmup corpus, so a snapshot of an older corpus is rejected"""
+    digest = hashlib.sha256()
+    with open(corpus_path, 'rb') as corpus_file:
+        for block in iter(lambda: corpus_file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def warmup():
+    """Restore or build the job index before serving (called by prefork_server in the parent)"""
+    corpus_path = os.environ.get('LSA_CORPUS_PATH')
+    corpus = corpus_fingerprint(corpus_path) if corpus_path else None
+    
+    if SNAPSHOT_DIR:
+        started = time.perf_counter()
+        try:
+            restore_index_snapshot(corpus)
+            print(f"✅ Indexes restored from snapshot {snapshot_state['generation']} "
+                  f"in {(time.perf_counter() - started) * 1000:.1f} ms: {len(indexed_jobs)} jobs")
+            return
+        except SnapshotError as e:
+            print(f"⚠️  Snapshot not used: {e}")
+    
+    if not corpus_path:
+        return
+    with open(corpus_path) as corpus_file:
+        data = json.load(corpus_file)
+    fit_job_index(data.get('documents', []), data.get('jobs', []), corpus)
+    print(f"✅ Job index built from {corpus_path}: {len(indexed_jobs)} jobs")
+    if SNAPSHOT_DIR:
+        write_index_snapshot()
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'running',
+        'lsa_fitted': lsa_index.is_fitted,
+        'lsa': lsa_index.memory_report(),
+        'snapshot': snapshot_state,
+        'feature_store': feature_store.stats() if feature_store else None
+    }), 200
+
 if __name__ == '__main__':
+    warmup()
     app.run(port=5002, debug=True)
@@ -0,0 +1,272 @@
+"""End-to-end load test for the Python services, with a stand-in for the Node backend.
+
+The orchestrator replays what resumeController/matchController do:
+    upload: POST /parse (30s timeout) -> POST /analyze (10s timeout)
+    match:  GET  /health on the matcher -> POST /match per job (5s timeout each)
+    full:   upload followed by match for the parsed resume
+Requests arrive open-loop (Poisson) at each configured rate, so queueing
+shows up as latency instead of being hidden by a closed loop. Everything
+runs on localhost; --spawn starts the three services via prefork_server.py.
+
+Usage:
+    python load_test.py --spawn --rates 1,2,4,8 --duration 30 --mix upload=1,match=2,full=1
+"""
+import argparse
+import contextlib
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from docx import Document
+
+from synthetic_corpus import generate_corpus
+
+SERVICES = [
+    ('resume_parser', 5001),
+    ('job_matcher', 5002),
+    ('resume_analyzer', 5003)
+]
+
+
+class StageStats:
+    """Thread-safe latency and error bookkeeping per stage"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.completed = 0
+        self.failed = 0
+
+    def record(self, stage, seconds, ok):
+        with self.lock:
+            self.latencies[stage].append(seconds * 1000)
+            if not ok:
+                self.errors[stage] += 1
+
+    def finish(self, ok):
+        with self.lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+
+def call(stats, stage, url, payload=None, timeout=5.0):
+    """One HTTP call timed under a stage name; returns parsed JSON or None on failure"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    headers = {'Content-Type': 'application/json'} if data else {}
+    req = urllib.request.Request(url, data=data, headers=headers, method='POST' if data else 'GET')
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            body = json.loads(response.read() or b'{}')
+        stats.record(stage, time.perf_counter() - started, True)
+        return body
+    except (urllib.error.URLError, http.client.HTTPException, TimeoutError, ConnectionError, ValueError):
+        stats.record(stage, time.perf_counter() - started, False)
+        return None
+
+
+class Orchestrator:
+    """Stand-in for the Node controllers' call pattern"""
+
+    def __init__(self, base_urls, resume_files, jobs, stats):
+        self.urls = base_urls
+        self.resume_files = resume_files
+        self.jobs = jobs
+        self.stats = stats
+
+    def upload(self, rng):
+        path = rng.choice(self.resume_files)
+        parsed = call(self.stats, 'parse', f"{self.urls['resume_parser']}/parse",
+                      {'file_path': path, 'file_type': 'docx'}, timeout=30)
+        if parsed is None:
+            return None
+        analysis = call(self.stats, 'analyze', f"{self.urls['resume_analyzer']}/analyze", parsed, timeout=10)
+        return parsed if analysis is not None else None
+
+    def match(self, rng, parsed=None):
+        if parsed is None:
+            parsed = {'resume_text': ' '.join(rng.choice(self.jobs)['required_skills'] * 20),
+                      'skills': rng.choice(self.jobs)['required_skills']}
+        if call(self.stats, 'match_health', f"{self.urls['job_matcher']}/health", timeout=1) is None:
+            return False
+        ok = True
+        for job in self.jobs:
+            result = call(self.stats, 'match', f"{self.urls['job_matcher']}/match", {
+                'resume_text': parsed.get('resume_text', ''),
+                'job_description': job['description'],
+                'resume_skills': parsed.get('skills', []),
+                'required_skills': job['required_skills']
+            }, timeout=5)
+            ok = ok and result is not None
+        return ok
+
+    def run_scenario(self, scenario, seed, scheduled_at=None):
+        rng = random.Random(seed)
+        # Measured from the scheduled arrival, so time spent waiting for a free
+        # thread counts as latency instead of being omitted
+        started = scheduled_at if scheduled_at is not None else time.perf_counter()
+        if scenario == 'upload':
+            ok = self.upload(rng) is not None
+        elif scenario == 'match':
+            ok = self.match(rng)
+        else:
+            parsed = self.upload(rng)
+            ok = parsed is not None and self.match(rng, parsed)
+        self.stats.record(f'scenario:{scenario}', time.perf_counter() - started, ok)
+        self.stats.finish(ok)
+
+
+def write_resume_files(directory, count, seed):
+    """Synthetic DOCX resumes the parser can read from local disk"""
+    resumes, _ = generate_corpus(count, 0, seed)
+    paths = []
+    for resume in resumes:
+        doc = Document()
+        for line in resume['resume_text'].split('\n'):
+            doc.add_paragraph(line)
+        path = os.path.join(directory, f"resume_{resume['id']}.docx")
+        doc.save(path)
+        paths.append(path)
+    return paths
+
+
+def parse_mix(text):
+    """'upload=1,match=2' -> ([scenarios], [weights])"""
+    pairs = [item.split('=') for item in text.split(',') if item]
+    return [name for name, _ in pairs], [float(weight) for _, weight in pairs]
+
+
+def run_step(orchestrator, rate, duration, mix, concurrency, seed):
+    """Offer Poisson arrivals at `rate` per second for `duration` seconds"""
+    rng = random.Random(seed)
+    scenarios, weights = mix
+    started = time.perf_counter()
+    offered = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        next_arrival = started
+        while next_arrival - started < duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            scenario = rng.choices(scenarios, weights)[0]
+            pool.submit(orchestrator.run_scenario, scenario, rng.randrange(10 ** 9), next_arrival)
+            offered += 1
+            next_arrival += rng.expovariate(rate)
+    return offered, time.perf_counter() - started
+
+
+def report(rate, offered, elapsed, stats, slo_ms):
+    """Print throughput, per-stage percentiles and error rates for one step"""
+    throughput = stats.completed / elapsed
+    print(f"\n📈 offered {rate:.2f}/s ({offered} scenarios), completed {stats.completed}, "
+          f"failed {stats.failed}, throughput {throughput:.2f}/s over {elapsed:.1f}s")
+    print(f"   {'stage':<20}{'n':>7}{'err %':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    worst_p99 = 0.0
+    for stage in sorted(stats.latencies):
+        values = np.array(stats.latencies[stage])
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        if stage.startswith('scenario:'):
+            worst_p99 = max(worst_p99, p99)
+        error_rate = stats.errors[stage] / len(values) * 100
+        print(f"   {stage:<20}{len(values):>7}{error_rate:>8.1f}{p50:>10.1f}{p90:>10.1f}{p99:>10.1f}{values.max():>10.1f}")
+
+    total = stats.completed + stats.failed
+    error_rate = stats.failed / total if total else 0.0
+    saturated = throughput < 0.9 * rate or error_rate > 0.01 or worst_p99 > slo_ms
+    return {'rate': rate, 'throughput': throughput, 'error_rate': error_rate,
+            'scenario_p99_ms': worst_p99, 'saturated': saturated}
+
+
+@contextlib.contextmanager
+def spawned_services(workers, state_dir):
+    """Start the three services on localhost with prefork_server.py, keeping their state under state_dir"""
+    processes = []
+    root = os.path.dirname(os.path.abspath(__file__))
+    # Throwaway databases, and no synthetic analyses in the score distributions
+    env = {
+        **os.environ,
+        'PARSE_QUEUE_DB': os.path.join(state_dir, 'parse_queue.sqlite'),
+        'ANALYTICS_DB': os.path.join(state_dir, 'analytics.sqlite'),
+        'MATCHER_STATE_DIR': os.path.join(state_dir, 'matcher_state'),
+        'RECORD_ANALYSES': '0'
+    }
+    for module, port in SERVICES:
+        processes.append(subprocess.Popen(
+            [sys.executable, os.path.join(root, 'prefork_server.py'), module,
+             '--port', str(port), '--workers', str(workers), '--max-requests', '0'],
+            cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        ))
+    try:
+        for module, port in SERVICES:
+            deadline = time.time() + 120
+            while time.time() < deadline:
+                try:
+                    urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1)
+                    break
+                except (urllib.error.URLError, ConnectionError):
+                    time.sleep(0.5)
+            else:
+                raise RuntimeError(f'{module} did not come up on port {port}')
+        yield
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test parse -> analyze -> match on localhost')
+    parser.add_argument('--rates', default='1,2,4', help='comma separated arrival rates (scenarios/s)')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds per rate step')
+    parser.add_argument('--mix', default='upload=1,match=2,full=1')
+    parser.add_argument('--jobs', type=int, default=20, help='job catalog size for /match')
+    parser.add_argument('--resumes', type=int, default=50, help='distinct resume files')
+    parser.add_argument('--concurrency', type=int, default=64, help='max in-flight scenarios')
+    parser.add_argument('--slo-ms', type=float, default=10000.0, help='scenario p99 considered saturated')
+    parser.add_argument('--spawn', action='store_true', help='start the services locally first')
+    parser.add_argument('--workers', type=int, default=2, help='workers per spawned service')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    base_urls = {module: f'http://127.0.0.1:{port}' for module, port in SERVICES}
+    _, jobs = generate_corpus(0, args.jobs, args.seed)
+    mix = parse_mix(args.mix)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        resume_files = write_resume_files(tmp, args.resumes, args.seed)
+        services = spawned_services(args.workers, tmp) if args.spawn else contextlib.nullcontext()
+        with services:
+            summary = []
+            for step, rate in enumerate(float(r) for r in args.rates.split(',')):
+                stats = StageStats()
+                orchestrator = Orchestrator(base_urls, resume_files, jobs, stats)
+                offered, elapsed = run_step(orchestrator, rate, args.duration, mix,
+                                            args.concurrency, args.seed + step)
+                summary.append(report(rate, offered, elapsed, stats, args.slo_ms))
+
+    print(f"\n{'offered/s':>10}{'achieved/s':>12}{'errors %':>10}{'p99 ms':>10}  saturated")
+    for row in summary:
+        print(f"{row['rate']:>10.2f}{row['throughput']:>12.2f}{row['error_rate'] * 100:>10.1f}"
+              f"{row['scenario_p99_ms']:>10.0f}  {'yes' if row['saturated'] else 'no'}")
+    saturated = [row['rate'] for row in summary if row['saturated']]
+    if saturated:
+        print(f"⚠️  saturation at {min(saturated):.2f} scenarios/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Dense LSA (truncated SVD over TF-IDF) vectors for job matching.
+
+Resumes and jobs are projected into a small dense space fitted on our own
+corpus, so related wording ("ML engineer" / "machine learning") lands close
+together. Job vectors live in one contiguous matrix (float32, or float16/int8
+via VectorStore) and a resume is scored against every job with a single
+matrix-vector product. CPU only, no downloaded models.
+"""
+import hashlib
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from index_snapshot import pack_strings, restore_vectorizer, unpack_strings, vectorizer_arrays
+from vector_store import VectorStore
+
+
+class LsaIndex:
+    """TF-IDF + truncated SVD model with a job vector store"""
+
+    def __init__(self, n_components=100, random_state=42, storage='float32'):
+        self.n_components = n_components
+        self.random_state = random_state
+        self.vectorizer = None
+        self.svd = None
+        self.job_ids = []
+        self.job_store = VectorStore(storage, n_components)
+        self.model_id = None
+
+    @property
+    def is_fitted(self):
+        return self.svd is not None
+
+    def fit(self, documents):
+        """Fit the TF-IDF vocabulary and SVD projection on a corpus of resumes and jobs"""
+        documents = [doc for doc in documents if doc and doc.strip()]
+        if len(documents) < 2:
+            raise ValueError('LSA needs at least 2 non-empty documents to fit')
+
+        self.vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+        tfidf = self.vectorizer.fit_transform(documents)
+
+        # SVD rank is bounded by the corpus size and vocabulary
+        n_components = max(1, min(self.n_components, tfidf.shape[0] - 1, tfidf.shape[1] - 1))
+        self.svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+        self.svd.fit(tfidf)
+        self.model_id = self._model_id()
+
+        self.job_ids = []
+        self.job_store = VectorStore(self.job_store.storage, n_components)
+        return self
+
+    def _model_id(self):
+        """Short fingerprint of the projection, to tell whether stored vectors are comparable"""
+        return hashlib.sha256(np.ascontiguousarray(self.svd.components_).tobytes()).hexdigest()[:16]
+
+    def transform(self, documents):
+        """Project documents into the LSA space as L2-normalized float32 rows"""
+        if not self.is_fitted:
+            raise ValueError('LSA model is not fitted')
+
+        vectors = self.svd.transform(self.vectorizer.transform(documents)).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(vectors / norms)
+
+    def set_jobs(self, job_ids, descriptions):
+        """Replace the job vector store"""
+        self.job_ids = list(job_ids)
+        self.job_store.set(self.transform(descriptions) if descriptions else
+                           np.zeros((0, self.svd.n_components), dtype=np.float32))
+
+    def similarity(self, text_a, text_b):
+        """Cosine similarity of two texts in LSA space, clipped to [0, 1]"""
+        vectors = self.transform([text_a, text_b])
+        return float(max(0.0, np.dot(vectors[0], vectors[1])))
+
+    def score_jobs(self, resume_text):
+        """Cosine similarity of a resume against every stored job (one BLAS mat-vec)"""
+        resume_vector = self.transform([resume_text])[0]
+        return np.clip(self.job_store.scores(resume_vector), 0.0, 1.0)
+
+    def snapshot_arrays(self):
+        """Fitted model and job vectors as named arrays for index_snapshot"""
+        job_ids, job_id_offsets = pack_strings(self.job_ids)
+        return {
+            **vectorizer_arrays('lsa.tfidf', self.vectorizer),
+            'lsa.components': self.svd.components_,
+            'lsa.job_ids': job_ids,
+            'lsa.job_id_offsets': job_id_offsets,
+            'lsa.job_codes': self.job_store.codes,
+            'lsa.job_scales': self.job_store.scales
+        }
+
+    def restore(self, arrays):
+        """Adopt a snapshot's arrays (memory mapped) instead of refitting"""
+        components = arrays['lsa.components']
+        self.vectorizer = restore_vectorizer(
+            arrays, 'lsa.tfidf', TfidfVectorizer(stop_words='english', sublinear_tf=True)
+        )
+        self.svd = TruncatedSVD(n_components=components.shape[0], random_state=self.random_state)
+        self.svd.components_ = components
+        self.svd.n_features_in_ = components.shape[1]
+        self.model_id = self._model_id()
+        self.job_ids = unpack_strings(arrays['lsa.job_ids'], arrays['lsa.job_id_offsets'])
+        self.job_store = VectorStore(self.job_store.storage, components.shape[0])
+        self.job_store.codes = arrays['lsa.job_codes']
+        self.job_store.scales = arrays['lsa.job_scales']
+        return self
+
+    def memory_report(self):
+        """Bytes used by the job vector store and the fitted projection"""
+        return {
+            'jobs': len(self.job_ids),
+            'dimensions': int(self.job_store.dimensions),
+            'storage': self.job_store.storage,
+            'job_vectors_bytes': self.job_store.nbytes,
+            'projection_bytes': int(self.svd.components_.nbytes) if self.is_fitted else 0,
+            'vocabulary_size': len(self.vectorizer.vocabulary_) if self.is_fitted else 0
+        }
@@ -0,0 +1,225 @@
+"""Near-duplicate resume detection with MinHash signatures and an LSH banding index.
+
+Resumes are reduced to sets of word shingles; MinHash estimates the Jaccard
+similarity of two sets from fixed-size signatures, and banding the signatures
+into buckets lets a lookup touch only likely matches instead of the whole
+corpus.
+
+SharedDuplicateIndex keeps the same bands in a SQLite file, together with a
+JSON payload per document, so every pre-fork worker process sees one index.
+"""
+import json
+import os
+import re
+import sqlite3
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+TOKEN_PATTERN = re.compile(r'[a-z0-9@.+#]+')
+
+
+def shingles(text, size=3):
+    """Set of hashed word n-grams of normalized text"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < size:
+        tokens = tokens + [''] * (size - len(tokens))
+    return {
+        zlib.crc32(' '.join(tokens[i:i + size]).encode('utf-8'))
+        for i in range(len(tokens) - size + 1)
+    }
+
+
+class MinHashLSH:
+    """MinHash signatures with an LSH banding index over document ids"""
+
+    def __init__(self, num_perm=128, bands=16, threshold=0.8, shingle_size=3, seed=1):
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self.perm_a = rng.randint(1, MAX_HASH, size=num_perm, dtype=np.uint64)
+        self.perm_b = rng.randint(0, MAX_HASH, size=num_perm, dtype=np.uint64)
+
+        self.buckets = [defaultdict(set) for _ in range(bands)]
+        self.signatures = {}
+
+    def signature(self, text):
+        """MinHash signature (uint32 per permutation) of a document"""
+        hashes = np.fromiter(shingles(text, self.shingle_size), dtype=np.uint64)
+        # (a * x + b) mod p for every permutation and shingle, then min per permutation
+        permuted = (np.outer(hashes, self.perm_a) + self.perm_b) % MERSENNE_PRIME
+        return (permuted & MAX_HASH).min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [signature[b * self.rows:(b + 1) * self.rows].tobytes() for b in range(self.bands)]
+
+    def add(self, doc_id, text=None, signature=None):
+        """Index a document; replaces any earlier entry with the same id"""
+        if signature is None:
+            signature = self.signature(text)
+        self.remove(doc_id)
+        self.signatures[doc_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self.buckets[band][key].add(doc_id)
+        return signature
+
+    def remove(self, doc_id):
+        """Drop a document from the index"""
+        signature = self.signatures.pop(doc_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self.buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del self.buckets[band][key]
+
+    def query(self, text=None, signature=None, exclude=None):
+        """Indexed documents whose estimated Jaccard similarity passes the threshold, best first"""
+        if signature is None:
+            signature = self.signature(text)
+
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+        candidates.discard(exclude)
+
+        matches = []
+        for doc_id in candidates:
+            similarity = float(np.mean(self.signatures[doc_id] == signature))
+            if similarity >= self.threshold:
+                matches.append((doc_id, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def __len__(self):
+        return len(self.signatures)
+
+
+SHARED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS duplicate_documents (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_id TEXT UNIQUE NOT NULL,
+    signature BLOB NOT NULL,
+    payload TEXT
+);
+CREATE TABLE IF NOT EXISTS duplicate_buckets (bucket BLOB NOT NULL, doc_id TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS duplicate_buckets_bucket ON duplicate_buckets (bucket);
+CREATE INDEX IF NOT EXISTS duplicate_buckets_doc ON duplicate_buckets (doc_id);
+"""
+
+
+class SharedDuplicateIndex:
+    """MinHash/LSH index in a SQLite file shared by processes, keeping the newest `capacity` documents"""
+
+    def __init__(self, path, capacity=10000, **minhash_options):
+        self.path = path
+        self.capacity = capacity
+        # Only used for signatures and band keys; documents live in the database
+        self.minhash = MinHashLSH(**minhash_options)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = sqlite3.connect(path, timeout=30)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SHARED_SCHEMA)
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self, write=True):
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    def _buckets(self, signature):
+        return [bytes([band]) + key for band, key in enumerate(self.minhash._band_keys(signature))]
+
+    def signature(self, text):
+        """MinHash signature (uint32 per permutation) of a document"""
+        return self.minhash.signature(text)
+
+    def add(self, doc_id, payload=None, text=None, signature=None):
+        """Index a document with a JSON-serializable payload; evicts the oldest beyond capacity"""
+        if signature is None:
+            signature = self.signature(text)
+        buckets = self._buckets(signature)
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM duplicate_buckets WHERE doc_id = ?', (doc_id,))
+            connection.execute(
+                'INSERT OR REPLACE INTO duplicate_documents (doc_id, signature, payload) VALUES (?, ?, ?)',
+                (doc_id, signature.astype(np.uint32).tobytes(), json.dumps(payload))
+            )
+            connection.executemany('INSERT INTO duplicate_buckets (bucket, doc_id) VALUES (?, ?)',
+                                   [(bucket, doc_id) for bucket in buckets])
+            oldest_kept = connection.execute(
+                'SELECT seq FROM duplicate_documents ORDER BY seq DESC LIMIT 1 OFFSET ?', (self.capacity - 1,)
+            ).fetchone()
+            if oldest_kept is not None:
+                connection.execute(
+                    'DELETE FROM duplicate_buckets WHERE doc_id IN '
+                    '(SELECT doc_id FROM duplicate_documents WHERE seq < ?)', oldest_kept
+                )
+                connection.execute('DELETE FROM duplicate_documents WHERE seq < ?', oldest_kept)
+        return signature
+
+    def query(self, text=None, signature=None, exclude=None):
+        """[(doc_id, similarity, payload)] of documents passing the threshold, best first"""
+        if signature is None:
+            signature = self.signature(text)
+        buckets = self._buckets(signature)
+        with self._transaction(write=False) as connection:
+            rows = connection.execute(
+                'SELECT doc_id, signature, payload FROM duplicate_documents WHERE doc_id IN '
+                f'(SELECT doc_id FROM duplicate_buckets WHERE bucket IN ({", ".join("?" * len(buckets))}))',
+                buckets
+            ).fetchall()
+
+        matches = []
+        for doc_id, stored, payload in rows:
+            if doc_id == exclude:
+                continue
+            similarity = float(np.mean(np.frombuffer(stored, dtype=np.uint32) == signature))
+            if similarity >= self.minhash.threshold:
+                matches.append((doc_id, similarity, json.loads(payload)))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def __len__(self):
+        with self._transaction(write=False) as connection:
+            return connection.execute('SELECT COUNT(*) FROM duplicate_documents').fetchone()[0]
+
+
+def collapse_duplicates(ranked_items, index, id_key='id'):
+    """Keep only the best-ranked item of each near-duplicate group in an already sorted ranking"""
+    kept = []
+    seen = set()
+    for item in ranked_items:
+        doc_id = item[id_key]
+        if doc_id in seen:
+            continue
+        kept.append(item)
+        seen.add(doc_id)
+        signature = index.signatures.get(doc_id)
+        if signature is not None:
+            seen.update(dup_id for dup_id, _ in index.query(signature=signature, exclude=doc_id))
+    return kept
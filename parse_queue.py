@@ -0,0 +1,294 @@
+"""Bounded background queue for resume parsing with status polling.
+
+Jobs go into a priority queue (lower number runs first, FIFO within a
+priority) and a fixed pool of worker threads runs them. Callers get a job id
+immediately and poll for progress and the result, so slow documents no
+longer hold an HTTP connection open for the whole parse.
+
+Job state lives in a SQLite database rather than in process memory, so under
+prefork_server.py any worker process can accept a submit, run the job or
+answer a poll for it. Payloads and results must be JSON serializable. A job
+left 'running' by a process that died is queued again (up to MAX_ATTEMPTS
+runs), so all processes must be on one host.
+
+Worker threads start on the first call in each process, so the queue is safe
+to import in a pre-fork parent. drain() stops a process from claiming new
+jobs and waits for its running ones, before a worker is recycled.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+MAX_ATTEMPTS = 2
+POLL_INTERVAL = 0.2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT UNIQUE NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    fraction REAL NOT NULL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT,
+    owner INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_order ON jobs (status, priority, seq);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+STATUS_FIELDS = ('job_id', 'status', 'priority', 'stage', 'fraction', 'submitted_at',
+                 'started_at', 'finished_at', 'error', 'seq')
+
+
+class QueueFull(Exception):
+    """Raised when the queue already holds max_pending jobs"""
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class ParseQueue:
+    """Priority queue of parse jobs in a shared SQLite file, served by a bounded worker pool per process"""
+
+    def __init__(self, handler, path, workers=2, max_pending=100, retention=1000, window=1000):
+        self.handler = handler
+        self.path = path
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.window = window
+
+        self.lock = threading.Lock()
+        self.threads = []
+        self.pid = None
+        self.wakeup = threading.Event()
+        self.draining = threading.Event()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=30)
+        try:
+            # WAL lets pollers read while a worker writes progress
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self, write=True):
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _count(connection, name, amount=1):
+        connection.execute(
+            'INSERT INTO counters (name, value) VALUES (?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value', (name, amount)
+        )
+
+    def _ensure_workers(self):
+        with self.lock:
+            # Threads do not survive a fork: a forked worker starts its own pool
+            if self.pid == os.getpid() or self.draining.is_set():
+                return
+            self.pid = os.getpid()
+            self.threads = []
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'parse-worker-{i}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, payload, priority=5):
+        """Queue a parse and return its job id right away"""
+        self._ensure_workers()
+        job_id = uuid.uuid4().hex
+        with self._transaction() as connection:
+            pending = connection.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if pending >= self.max_pending:
+                self._count(connection, 'rejected')
+                rejected = True
+            else:
+                rejected = False
+                connection.execute(
+                    'INSERT INTO jobs (job_id, priority, status, payload, stage, fraction, submitted_at) '
+                    "VALUES (?, ?, 'queued', ?, 'queued', 0.0, ?)",
+                    (job_id, priority, json.dumps(payload), time.time())
+                )
+        if rejected:
+            raise QueueFull(f'Parse queue is full ({self.max_pending} pending)')
+        self.wakeup.set()
+        return job_id
+
+    def _requeue_orphans(self, connection):
+        """Queue again (or fail) jobs whose worker process exited while running them"""
+        running = connection.execute("SELECT seq, owner, attempts FROM jobs WHERE status = 'running'").fetchall()
+        for row in running:
+            if _alive(row['owner']):
+                continue
+            if row['attempts'] < MAX_ATTEMPTS:
+                connection.execute(
+                    "UPDATE jobs SET status = 'queued', stage = 'queued', fraction = 0.0, "
+                    'started_at = NULL, owner = NULL WHERE seq = ?', (row['seq'],)
+                )
+            else:
+                error = f"Parse worker exited while running the job ({row['attempts']} attempts)"
+                connection.execute(
+                    "UPDATE jobs SET status = 'failed', stage = 'failed', fraction = 1.0, finished_at = ?, "
+                    'result = ?, error = ? WHERE seq = ?',
+                    (time.time(), json.dumps({'error': error}), error, row['seq'])
+                )
+                self._count(connection, 'failed')
+
+    def _claim(self):
+        """Mark the next queued job as running in this process: (seq, payload) or None"""
+        with self._transaction() as connection:
+            self._requeue_orphans(connection)
+            row = connection.execute(
+                "SELECT seq, payload FROM jobs WHERE status = 'queued' ORDER BY priority, seq LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = 'running', stage = 'running', started_at = ?, owner = ?, "
+                'attempts = attempts + 1 WHERE seq = ?', (time.time(), os.getpid(), row['seq'])
+            )
+            return row['seq'], json.loads(row['payload'])
+
+    def _work(self):
+        while not self.draining.is_set():
+            claimed = self._claim()
+            if claimed is None:
+                # Jobs submitted by other processes are picked up on the next poll
+                self.wakeup.wait(POLL_INTERVAL)
+                self.wakeup.clear()
+                continue
+            seq, payload = claimed
+
+            def progress(stage, fraction, seq=seq):
+                with self._transaction() as connection:
+                    connection.execute('UPDATE jobs SET stage = ?, fraction = ? WHERE seq = ?',
+                                       (stage, round(fraction, 2), seq))
+
+            try:
+                result = self.handler(payload, progress)
+                failed = 'error' in result
+            except Exception as e:
+                result, failed = {'error': str(e)}, True
+
+            status = 'failed' if failed else 'done'
+            with self._transaction() as connection:
+                connection.execute(
+                    'UPDATE jobs SET status = ?, stage = ?, fraction = 1.0, finished_at = ?, result = ?, error = ? '
+                    'WHERE seq = ?',
+                    (status, status, time.time(), json.dumps(result), result.get('error') if failed else None, seq)
+                )
+                self._count(connection, 'failed' if failed else 'completed')
+                # Drop the oldest finished jobs beyond the retention limit
+                connection.execute(
+                    'DELETE FROM jobs WHERE seq IN (SELECT seq FROM jobs WHERE finished_at IS NOT NULL '
+                    'ORDER BY finished_at DESC LIMIT -1 OFFSET ?)', (self.retention,)
+                )
+
+    def drain(self, timeout=None):
+        """Stop claiming jobs in this process and wait for the running ones; True if all finished"""
+        self.draining.set()
+        self.wakeup.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self.threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self.threads)
+
+    def status(self, job_id):
+        """Job status without the result payload, or None if unknown"""
+        self._ensure_workers()
+        with self._transaction(write=False) as connection:
+            job = connection.execute(
+                f"SELECT {', '.join(STATUS_FIELDS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            info = dict(job)
+            if job['status'] == 'queued':
+                # Jobs that run before this one: lower priority number, or same priority and earlier
+                info['queue_position'] = connection.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND "
+                    '(priority < ? OR (priority = ? AND seq <= ?))',
+                    (job['priority'], job['priority'], job['seq'])
+                ).fetchone()[0]
+        now = time.time()
+        started = info['started_at']
+        finished = info['finished_at']
+        info['progress'] = {'stage': info.pop('stage'), 'fraction': info.pop('fraction')}
+        del info['seq']
+        info['wait_ms'] = round(((started or now) - info['submitted_at']) * 1000, 2)
+        info['service_ms'] = round(((finished or now) - started) * 1000, 2) if started else None
+        return info
+
+    def result(self, job_id):
+        """(status, result) for a job; result is None until it finishes"""
+        self._ensure_workers()
+        with self._transaction(write=False) as connection:
+            job = connection.execute('SELECT status, result FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        if job is None:
+            return None, None
+        return job['status'], json.loads(job['result']) if job['result'] is not None else None
+
+    def stats(self):
+        """Queue depth, utilization and wait/service time percentiles in ms, across all processes"""
+        def percentiles(values):
+            if not values:
+                return {'p50': None, 'p95': None, 'p99': None}
+            p50, p95, p99 = np.percentile(np.array(values) * 1000, [50, 95, 99])
+            return {'p50': round(p50, 2), 'p95': round(p95, 2), 'p99': round(p99, 2)}
+
+        with self._transaction(write=False) as connection:
+            states = dict(connection.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+            counters = dict(connection.execute('SELECT name, value FROM counters').fetchall())
+            timings = connection.execute(
+                'SELECT started_at - submitted_at, finished_at - started_at FROM jobs '
+                'WHERE finished_at IS NOT NULL AND started_at IS NOT NULL ORDER BY finished_at DESC LIMIT ?',
+                (self.window,)
+            ).fetchall()
+        return {
+            'depth': states.get('queued', 0),
+            'max_pending': self.max_pending,
+            'running': states.get('running', 0),
+            'workers': self.workers,
+            'completed': counters.get('completed', 0),
+            'failed': counters.get('failed', 0),
+            'rejected': counters.get('rejected', 0),
+            'wait_time_ms': percentiles([row[0] for row in timings]),
+            'service_time_ms': percentiles([row[1] for row in timings])
+        }
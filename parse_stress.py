@@ -0,0 +1,142 @@
+"""Fuzz/stress harness for resume_parser: measures tail parse latency on hostile inputs.
+
+Usage:
+    python parse_stress.py --iterations 2000 --seed 7
+"""
+import argparse
+import contextlib
+import io
+import random
+import string
+import time
+
+import numpy as np
+
+import resume_parser
+
+SECTION_HEADERS = ['EXPERIENCE', 'PROJECTS', 'EDUCATION', 'SKILLS', 'LANGUAGES', 'CONTACT']
+FILLER_WORDS = ['Developed', 'the', 'system', 'using', 'Python', 'with', 'React', 'and',
+                'MongoDB', 'University', 'College', 'CGPA', '2021 - 2023', 'English', 'Hindi']
+
+
+def random_words(rng, count):
+    """Random resume-ish words"""
+    return ' '.join(rng.choice(FILLER_WORDS) for _ in range(count))
+
+
+def gen_regular(rng):
+    """Plausible resume of normal size"""
+    lines = ['John Smith', 'john.smith@gmail.com', '+91 98765 43210', 'Delhi, India']
+    for header in SECTION_HEADERS:
+        lines.append(header)
+        for _ in range(rng.randint(3, 12)):
+            lines.append(random_words(rng, rng.randint(3, 15)))
+    return '\n'.join(lines)
+
+
+def gen_huge_line(rng):
+    """One enormous line with no newlines"""
+    return random_words(rng, rng.randint(50000, 150000))
+
+
+def gen_many_lines(rng):
+    """Hundreds of thousands of short lines inside an experience section"""
+    lines = ['EXPERIENCE', 'Jan 2020']
+    lines += [random_words(rng, 2) for _ in range(rng.randint(50000, 200000))]
+    return '\n'.join(lines)
+
+
+def gen_many_at_signs(rng):
+    """Lots of '@' characters and whitespace but no valid email"""
+    chunk = ' @ ' + ' '.join(rng.choice(string.ascii_letters) for _ in range(20))
+    return 'Candidate\n' + chunk * rng.randint(20000, 60000)
+
+
+def gen_long_descriptions(rng):
+    """Projects section whose description keeps growing"""
+    lines = ['PROJECTS', 'Resume Analyzer | Python, Flask']
+    lines += ['built ' + random_words(rng, 30).lower() for _ in range(rng.randint(20000, 60000))]
+    return '\n'.join(lines)
+
+
+def gen_random_bytes(rng):
+    """Random printable noise"""
+    alphabet = string.printable
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(1000, 200000)))
+
+
+GENERATORS = [
+    ('regular', gen_regular, 0.80),
+    ('huge_line', gen_huge_line, 0.04),
+    ('many_lines', gen_many_lines, 0.04),
+    ('many_at_signs', gen_many_at_signs, 0.04),
+    ('long_descriptions', gen_long_descriptions, 0.04),
+    ('random_bytes', gen_random_bytes, 0.04)
+]
+
+
+def run(iterations, seed, limits=None):
+    """Parse generated documents and collect per-document latency"""
+    rng = random.Random(seed)
+    names = [name for name, _, _ in GENERATORS]
+    weights = [weight for _, _, weight in GENERATORS]
+    generators = {name: gen for name, gen, _ in GENERATORS}
+
+    timings = {name: [] for name in names}
+    partial = {name: 0 for name in names}
+    errors = 0
+
+    for _ in range(iterations):
+        kind = rng.choices(names, weights)[0]
+        text = generators[kind](rng)
+
+        started = time.perf_counter()
+        try:
+            # Extractors print progress; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = resume_parser.parse_text(text, limits)
+            if result.get('partial'):
+                partial[kind] += 1
+        except Exception:
+            errors += 1
+        timings[kind].append((time.perf_counter() - started) * 1000)
+
+    return timings, partial, errors
+
+
+def report(timings, partial, errors):
+    """Print latency percentiles overall and per input kind"""
+    all_times = np.array([t for values in timings.values() for t in values])
+
+    print(f"{'kind':<20}{'n':>7}{'partial':>9}{'p50 ms':>10}{'p99 ms':>10}{'p99.9 ms':>11}{'max ms':>10}")
+    rows = list(timings.items()) + [('ALL', all_times.tolist())]
+    for kind, values in rows:
+        if not values:
+            continue
+        values = np.array(values)
+        p50, p99, p999 = np.percentile(values, [50, 99, 99.9])
+        n_partial = sum(partial.values()) if kind == 'ALL' else partial[kind]
+        print(f"{kind:<20}{len(values):>7}{n_partial:>9}{p50:>10.2f}{p99:>10.2f}{p999:>11.2f}{values.max():>10.2f}")
+
+    print(f"errors: {errors}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stress resume_parser.parse_text with hostile inputs')
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--max-chars', type=int, default=None)
+    parser.add_argument('--max-lines', type=int, default=None)
+    parser.add_argument('--max-seconds', type=float, default=None)
+    args = parser.parse_args()
+
+    limits = {
+        key: value for key, value in {
+            'max_chars': args.max_chars,
+            'max_lines': args.max_lines,
+            'max_seconds': args.max_seconds
+        }.items() if value is not None
+    }
+
+    print(f"🔥 Stressing parser with {args.iterations} documents, limits: {limits or resume_parser.PARSE_LIMITS}")
+    report(*run(args.iterations, args.seed, limits))
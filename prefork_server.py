@@ -0,0 +1,149 @@
+"""Pre-fork server for the Python services with copy-on-write shared models.
+
+The parent imports the service (spaCy model, scikit-learn, vocabularies),
+runs its optional warmup() hook to build indexes, freezes the GC so those
+objects are never touched again, then forks workers that share the pages
+copy-on-write. Workers accept on one shared socket and are recycled after
+--max-requests. Per-worker unique (private) RSS is logged periodically.
+
+State created inside a worker after the fork stays local to that worker;
+build shared indexes in warmup() instead, and keep state that any worker
+must see in shared files (the parse job queue, job_matcher's
+MATCHER_STATE_DIR). A service's optional drain() hook runs before a worker
+is recycled so work it started in the background can finish.
+
+Usage:
+    python prefork_server.py job_matcher --port 5002 --workers 4 --max-requests 1000
+"""
+import argparse
+import gc
+import importlib
+import os
+import signal
+import socket
+import sys
+import time
+
+from werkzeug.serving import BaseWSGIServer
+
+SMAPS_FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty')
+
+workers = {}
+
+
+def memory_usage(pid):
+    """RSS, PSS and unique (private) memory of a process in KiB, from /proc smaps_rollup"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as smaps:
+            values = {}
+            for line in smaps:
+                parts = line.split()
+                field = parts[0].rstrip(':')
+                if field in SMAPS_FIELDS:
+                    values[field] = int(parts[1])
+    except OSError:
+        return None
+    values['Uss'] = values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    return values
+
+
+def serve_worker(app, sock, host, port, max_requests, drain=None):
+    """Worker loop: handle requests on the inherited socket, drain and exit after max_requests"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = BaseWSGIServer(host, port, app, fd=sock.fileno())
+    served = 0
+    while max_requests <= 0 or served < max_requests:
+        server.handle_request()
+        served += 1
+    # No more accept() calls here: new requests go to the other workers while this one drains
+    if drain:
+        drain()
+    os._exit(0)
+
+
+def spawn_worker(service, sock, args):
+    """Fork one worker and remember when it started"""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            serve_worker(service.app, sock, args.host, args.port, args.max_requests,
+                         getattr(service, 'drain', None))
+        finally:
+            os._exit(1)
+    workers[pid] = time.time()
+    return pid
+
+
+def report_memory():
+    """Log RSS/PSS/USS of the parent and every worker"""
+    parent = memory_usage(os.getpid())
+    if parent is None:
+        print("⚠️  /proc smaps_rollup not available, memory reporting disabled")
+        return
+    print(f"📊 parent {os.getpid()}: rss {parent['Rss'] / 1024:.1f} MiB, uss {parent['Uss'] / 1024:.1f} MiB")
+    for pid in sorted(workers):
+        usage = memory_usage(pid)
+        if usage:
+            print(f"   worker {pid}: rss {usage['Rss'] / 1024:.1f} MiB, "
+                  f"pss {usage['Pss'] / 1024:.1f} MiB, uss {usage['Uss'] / 1024:.1f} MiB")
+
+
+def shutdown(signum, frame):
+    """Stop every worker and exit"""
+    for pid in list(workers):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    sys.exit(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a Flask service with pre-forked workers')
+    parser.add_argument('service', help='module name: resume_parser, resume_analyzer or job_matcher')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, required=True)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--max-requests', type=int, default=1000, help='recycle a worker after N requests (0 = never)')
+    parser.add_argument('--stats-interval', type=float, default=30.0)
+    args = parser.parse_args()
+
+    print(f"🚀 Loading {args.service} in the parent process")
+    service = importlib.import_module(args.service)
+    if hasattr(service, 'warmup'):
+        service.warmup()
+
+    # Move everything loaded so far out of GC tracking so workers don't dirty shared pages
+    gc.collect()
+    gc.freeze()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(128)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for _ in range(args.workers):
+        spawn_worker(service, sock, args)
+    print(f"📍 {args.service} on http://{args.host}:{args.port} with {args.workers} workers "
+          f"(recycled every {args.max_requests} requests)")
+
+    next_report = time.time() + args.stats_interval
+    while True:
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid and pid in workers:
+            uptime = time.time() - workers.pop(pid)
+            print(f"♻️  worker {pid} exited after {uptime:.0f}s (status {status}), respawning")
+            spawn_worker(service, sock, args)
+            continue
+        if time.time() >= next_report:
+            report_memory()
+            next_report = time.time() + args.stats_interval
+        time.sleep(0.2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""Vectorized experience and education matching for whole candidate pools.
+
+Resumes are reduced once to numeric features:
+    experience_years  summed durations of experience entries ("2019 - 2021",
+                      "Jan 2020 - Present", "18 months"); an entry without a
+                      parseable duration counts as EXPERIENCE_ENTRY_YEARS,
+                      like the entry count used by the JS fallback
+    degree_level      highest education level code (DEGREE_LEVELS)
+    education_count   number of education entries
+and a job to (required_years, required_level). Scoring a pool is then a few
+NumPy comparisons instead of a regex and substring loop per resume/job pair.
+
+The scores follow calculateExperienceMatch / calculateEducationMatch in
+controllers/matchController.js: experience is 100 when the requirement is
+met, proportional below it and 0 without experience; education is 100 when
+the highest degree reaches a listed qualification, 50 otherwise. Degrees are
+compared by level, so "M.Tech" satisfies "B.Tech or equivalent"; a
+qualification with no recognizable level ("Computer Science degree") falls
+back to the JS substring test against each entry's degree and institution.
+"""
+import re
+import time
+
+import numpy as np
+from scipy import sparse
+
+from index_snapshot import pack_strings, unpack_strings
+from skill_normalizer import FUZZY_SKILLS, skill_normalizer
+
+EXPERIENCE_ENTRY_YEARS = 1.0
+MAX_EXPERIENCE_YEARS = 50.0
+
+# Weights of the JS basic match: skills, experience, education
+SKILLS_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.2
+EDUCATION_WEIGHT = 0.2
+
+# Highest level first: a degree takes the first level whose pattern it matches
+DEGREE_LEVELS = [
+    (6, re.compile(r'\b(ph\.?\s?d|doctorate|doctor of)\b')),
+    (5, re.compile(r'\b(master\w*|m\.?\s?tech|m\.\s?e|mca|m\.?\s?sc|mba|m\.?\s?s|m\.?\s?com|m\.a|post\s?graduat\w*)\b')),
+    (4, re.compile(r'\b(bachelor\w*|b\.?\s?tech|b\.\s?e|bca|b\.?\s?sc|bba|b\.?\s?com|b\.a|b\.?\s?s|undergraduate|graduat\w*)\b')),
+    (3, re.compile(r'\b(diploma|polytechnic)\b')),
+    (2, re.compile(r'\b(intermediate|higher secondary|senior secondary|12th|xii|hsc|class 12|puc)\b')),
+    (1, re.compile(r'\b(matriculation|secondary school|10th|ssc|class 10|high school)\b'))
+]
+
+MONTHS = {month: i for i, month in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'])}
+DATE_RANGE = re.compile(
+    r'(?:([a-z]{3})[a-z]*\.?\s+)?((?:19|20)\d{2})\s*(?:-|–|—|to)\s*'
+    r'(?:(?:([a-z]{3})[a-z]*\.?\s+)?((?:19|20)\d{2})|present|current|now|till date|date)'
+)
+DURATION = re.compile(r'(\d+(?:\.\d+)?)\s*\+?\s*(years?|yrs?|months?|mos?)\b')
+NUMBER = re.compile(r'(\d+(?:\.\d+)?)')
+
+
+def degree_level(text):
+    """Education level code of a degree or qualification name, 0 if unrecognized"""
+    text = (text or '').lower()
+    for level, pattern in DEGREE_LEVELS:
+        if pattern.search(text):
+            return level
+    return 0
+
+
+def _month_position(year, month):
+    return int(year) + (MONTHS.get(month, 0) / 12 if month else 0)
+
+
+def duration_years(text):
+    """Years covered by an experience duration string, None if it has no dates"""
+    text = (text or '').lower()
+    match = DATE_RANGE.search(text)
+    if match:
+        start_month, start_year, end_month, end_year = match.groups()
+        if end_year:
+            end = _month_position(end_year, end_month)
+        else:
+            now = time.localtime()
+            end = now.tm_year + (now.tm_mon - 1) / 12
+        return round(max(0.0, end - _month_position(start_year, start_month)), 2)
+    match = DURATION.search(text)
+    if match:
+        value = float(match.group(1))
+        return value / 12 if match.group(2).startswith('mo') else value
+    return None
+
+
+def experience_years(experience):
+    """Total years of a resume's experience entries"""
+    total = 0.0
+    for entry in experience or []:
+        if isinstance(entry, dict):
+            years = duration_years(entry.get('duration'))
+            if years is None:
+                years = duration_years(entry.get('description'))
+        else:
+            years = duration_years(str(entry))
+        total += EXPERIENCE_ENTRY_YEARS if years is None else years
+    return min(total, MAX_EXPERIENCE_YEARS)
+
+
+def education_level(education):
+    """Highest degree level across education entries (degree, else institution)"""
+    best = 0
+    for entry in education or []:
+        if isinstance(entry, dict):
+            level = degree_level(entry.get('degree')) or degree_level(entry.get('institution'))
+        else:
+            level = degree_level(str(entry))
+        best = max(best, level)
+    return best
+
+
+def education_entries(education):
+    """Lowercased (degree, institution) pairs of a resume's education entries"""
+    entries = []
+    for entry in education or []:
+        if isinstance(entry, dict):
+            entries.append(((entry.get('degree') or '').lower(), (entry.get('institution') or '').lower()))
+        else:
+            entries.append((str(entry).lower(), ''))
+    return entries
+
+
+def required_years(experience_required):
+    """Years demanded by a job's experience requirement ("Fresher" -> 0, "3-5 years" -> 3)"""
+    text = (experience_required or '').lower()
+    if not text or 'fresher' in text:
+        return 0.0
+    # The first number is the minimum, as in the JS fallback; "6 months" is half a year
+    match = NUMBER.search(text)
+    if not match:
+        return 0.0
+    unit = DURATION.search(text)
+    months = unit is not None and unit.group(2).startswith('mo')
+    return float(match.group(1)) / 12 if months else float(match.group(1))
+
+
+def required_level(qualifications):
+    """(has_qualifications, lowest recognized level, lowercased qualifications with no recognized level)"""
+    if isinstance(qualifications, str):
+        qualifications = [q.strip() for q in qualifications.split(',')]
+    qualifications = [q for q in qualifications or [] if q]
+    levels = [level for level in (degree_level(q) for q in qualifications) if level]
+    unrecognized = [q.lower() for q in qualifications if not degree_level(q)]
+    return bool(qualifications), min(levels) if levels else 0, unrecognized
+
+
+def experience_scores(years, needed):
+    """calculateExperienceMatch over an array of resume experience years"""
+    years = np.asarray(years, dtype=np.float32)
+    if needed <= 0:
+        return np.full(len(years), 100.0, dtype=np.float32)
+    return np.where(years >= needed, 100.0, np.where(years > 0, years / needed * 100.0, 0.0)).astype(np.float32)
+
+
+def education_scores(levels, counts, has_qualifications, level_needed, substring_met=None):
+    """calculateEducationMatch over arrays of degree levels and education entry counts
+
+    level_needed is 0 when no qualification has a recognized level; then only
+    substring_met (per resume, from the JS substring test) can meet it.
+    """
+    levels = np.asarray(levels)
+    if not has_qualifications:
+        return np.full(len(levels), 100.0, dtype=np.float32)
+    meets = (levels >= level_needed) if level_needed else np.zeros(len(levels), dtype=bool)
+    if substring_met is not None:
+        meets = meets | substring_met
+    meets &= np.asarray(counts) > 0
+    return np.where(meets, 100.0, 50.0).astype(np.float32)
+
+
+def _skills(skills):
+    skills = skills or []
+    if FUZZY_SKILLS:
+        skills = skill_normalizer.normalize_all(skills)
+    return set(skill.strip().lower() for skill in skills)
+
+
+class RequirementPool:
+    """Precomputed skill, experience and education features for a pool of resumes"""
+
+    def __init__(self, resumes):
+        self.ids = [str(resume.get('id', i)) for i, resume in enumerate(resumes)]
+        self.skill_sets = [_skills(resume.get('skills')) for resume in resumes]
+        self.years = np.array([experience_years(r.get('experience')) for r in resumes], dtype=np.float32)
+        self.levels = np.array([education_level(r.get('education')) for r in resumes], dtype=np.int8)
+        self.education_counts = np.array([len(r.get('education') or []) for r in resumes], dtype=np.int16)
+
+        # Education entries for the substring fallback: distinct degree and institution
+        # strings, and per entry its resume row and indices into them
+        entries = [(row, degree, institution) for row, resume in enumerate(resumes)
+                   for degree, institution in education_entries(resume.get('education'))]
+        self.degree_names, self.entry_degrees = self._distinct([degree for _, degree, _ in entries])
+        self.institution_names, self.entry_institutions = self._distinct([inst for _, _, inst in entries])
+        self.entry_rows = np.array([row for row, _, _ in entries], dtype=np.int32)
+
+        # Resume x skill indicator matrix: a job's skill overlap is one sparse mat-vec
+        self.skill_columns = {}
+        rows, columns = [], []
+        for row, skills in enumerate(self.skill_sets):
+            for skill in skills:
+                rows.append(row)
+                columns.append(self.skill_columns.setdefault(skill, len(self.skill_columns)))
+        self.skill_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(len(resumes), max(1, len(self.skill_columns)))
+        )
+
+    @staticmethod
+    def _distinct(values):
+        names = {}
+        codes = np.array([names.setdefault(value, len(names)) for value in values], dtype=np.int32)
+        return list(names), codes
+
+    def __len__(self):
+        return len(self.ids)
+
+    def substring_met(self, qualifications):
+        """Per resume, whether an education entry passes calculateEducationMatch's substring test
+        (q in degree, degree in q, or q in institution)"""
+        met = np.zeros(len(self), dtype=bool)
+        if not qualifications or not len(self.entry_rows):
+            return met
+        # Tested once per distinct degree and institution, then spread over entries
+        degrees = np.array([any(q in degree or (degree and degree in q) for q in qualifications)
+                            for degree in self.degree_names], dtype=bool)
+        institutions = np.array([any(q in institution for q in qualifications)
+                                 for institution in self.institution_names], dtype=bool)
+        hits = degrees[self.entry_degrees] | institutions[self.entry_institutions]
+        met[self.entry_rows[hits]] = True
+        return met
+
+    def snapshot_arrays(self):
+        """Pool features as named arrays for index_snapshot"""
+        ids, id_offsets = pack_strings(self.ids)
+        names = sorted(self.skill_columns, key=self.skill_columns.get)
+        skill_names, skill_name_offsets = pack_strings(names)
+        degree_names, degree_name_offsets = pack_strings(self.degree_names)
+        institution_names, institution_name_offsets = pack_strings(self.institution_names)
+        return {
+            'pool.ids': ids,
+            'pool.id_offsets': id_offsets,
+            'pool.years': self.years,
+            'pool.levels': self.levels,
+            'pool.education_counts': self.education_counts,
+            'pool.degree_names': degree_names,
+            'pool.degree_name_offsets': degree_name_offsets,
+            'pool.institution_names': institution_names,
+            'pool.institution_name_offsets': institution_name_offsets,
+            'pool.entry_rows': self.entry_rows,
+            'pool.entry_degrees': self.entry_degrees,
+            'pool.entry_institutions': self.entry_institutions,
+            'pool.skill_names': skill_names,
+            'pool.skill_name_offsets': skill_name_offsets,
+            'pool.skill_data': self.skill_matrix.data,
+            'pool.skill_indices': self.skill_matrix.indices,
+            'pool.skill_indptr': self.skill_matrix.indptr
+        }
+
+    def restore(self, arrays):
+        """Adopt a snapshot's arrays (memory mapped) instead of re-extracting features"""
+        a = arrays
+        self.ids = unpack_strings(a['pool.ids'], a['pool.id_offsets'])
+        self.years = a['pool.years']
+        self.levels = a['pool.levels']
+        self.education_counts = a['pool.education_counts']
+        self.degree_names = unpack_strings(a['pool.degree_names'], a['pool.degree_name_offsets'])
+        self.institution_names = unpack_strings(a['pool.institution_names'], a['pool.institution_name_offsets'])
+        self.entry_rows = a['pool.entry_rows']
+        self.entry_degrees = a['pool.entry_degrees']
+        self.entry_institutions = a['pool.entry_institutions']
+        names = unpack_strings(a['pool.skill_names'], a['pool.skill_name_offsets'])
+        self.skill_columns = {skill: column for column, skill in enumerate(names)}
+        self.skill_matrix = sparse.csr_matrix(
+            (a['pool.skill_data'], a['pool.skill_indices'], a['pool.skill_indptr']),
+            shape=(len(self.ids), max(1, len(names)))
+        )
+        indptr, indices = a['pool.skill_indptr'], a['pool.skill_indices']
+        self.skill_sets = [set(names[i] for i in indices[indptr[row]:indptr[row + 1]]) for row in range(len(self.ids))]
+        return self
+
+    def score(self, job):
+        """Per-resume skills, experience, education and combined (JS-weighted) scores for one job"""
+        required = _skills(job.get('required_skills'))
+        job_vector = np.zeros(self.skill_matrix.shape[1], dtype=np.float32)
+        for skill in required:
+            if skill in self.skill_columns:
+                job_vector[self.skill_columns[skill]] = 1.0
+        matched = self.skill_matrix @ job_vector
+        skills = matched / len(required) * 100.0 if required else np.zeros(len(self), dtype=np.float32)
+
+        experience = experience_scores(self.years, required_years(job.get('experience_required')))
+        has_qualifications, level_needed, unrecognized = required_level(job.get('qualifications'))
+        education = education_scores(self.levels, self.education_counts, has_qualifications, level_needed,
+                                     self.substring_met(unrecognized) if unrecognized else None)
+
+        return {
+            'required': required,
+            'skills_match': skills,
+            'experience_match': experience,
+            'education_match': education,
+            'match_score': skills * SKILLS_WEIGHT + experience * EXPERIENCE_WEIGHT + education * EDUCATION_WEIGHT
+        }
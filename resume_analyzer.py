@@ -1,5 +1,9 @@
 from flask import Flask, request, jsonify
-import re
+import os
+import tempfile
+from rule_engine import compile_rules
+from deadline import Deadline, DeadlineExceeded
+from score_distribution import AnalysisStore, CohortDistributions
 
 app = Flask(__name__)
 
@@ -26,6 +30,56 @@ INDUSTRY_KEYWORDS = {
             'REST API', 'Database', 'Web Security', 'Performance Optimization']
 }
 
+# Text rules evaluated together in one tokenized pass over the resume
+TEXT_RULES = [
+    {'id': 'strong_verbs', 'type': 'phrases', 'patterns': STRONG_ACTION_VERBS},
+    {'id': 'weak_verbs', 'type': 'phrases', 'patterns': WEAK_ACTION_VERBS},
+    {'id': 'metrics', 'type': 'digit_runs'}
+]
+
+# Keyword suggestions: a category applies when any trigger skill is present
+KEYWORD_RULES = [
+    {'category': 'Software Development', 'triggers': ['javascript', 'python', 'java', 'node', 'react'],
+     'keywords': INDUSTRY_KEYWORDS['software']},
+    {'category': 'Data Science', 'triggers': ['python', 'sql', 'data', 'machine learning'],
+     'keywords': INDUSTRY_KEYWORDS['data']},
+    {'category': 'Web Development', 'triggers': ['html', 'css', 'react', 'javascript'],
+     'keywords': INDUSTRY_KEYWORDS['web']}
+]
+
+text_rules = compile_rules(TEXT_RULES)
+keyword_rules = [
+    {
+        'category': rule['category'],
+        'triggers': frozenset(rule['triggers']),
+        'keywords': [(keyword, keyword.lower()) for keyword in rule['keywords']]
+    }
+    for rule in KEYWORD_RULES
+]
+
+# Corpus-wide score distributions, so a score can be reported as "top X% of candidates"
+SECTION_MAX_SCORES = {
+    'Contact Information': 15,
+    'Skills': 25,
+    'Education': 20,
+    'Experience & Projects': 25,
+    'Additional Info': 15
+}
+SCORE_METRICS = {
+    'overall_score': 100,
+    'ats_score': 100,
+    **{f'section:{name}': max_score for name, max_score in SECTION_MAX_SCORES.items()}
+}
+# Latest scores per resume, shared by pre-fork workers and kept across restarts
+ANALYTICS_DB = os.environ.get('ANALYTICS_DB', os.path.join(tempfile.gettempdir(), 'resume_analytics.sqlite'))
+# Recording is opt-in and needs a database of its own, so test and load traffic
+# does not end up in the percentiles through the shared temp file
+RECORD_ANALYSES = os.environ.get('RECORD_ANALYSES', '0') == '1'
+if RECORD_ANALYSES and 'ANALYTICS_DB' not in os.environ:
+    print("⚠️  RECORD_ANALYSES=1 needs an explicit ANALYTICS_DB; not recording analyses")
+    RECORD_ANALYSES = False
+score_distributions = CohortDistributions(SCORE_METRICS, store=AnalysisStore(ANALYTICS_DB))
+
 def analyze_resume_quality(parsed_data):
     """Analyze resume and provide quality score with suggestions"""
     
@@ -277,8 +331,11 @@ def analyze_ats_optimization(parsed_data, resume_text):
             'priority': 'Medium'
         })
     
+    # Verb and metric rules in a single pass over the text
+    rule_results = text_rules.evaluate(resume_text)
+    
     # 5. Quantifiable Achievements (15 points)
-    numbers_in_text = len(re.findall(r'\d+%?', resume_text))
+    numbers_in_text = rule_results['metrics']
     if numbers_in_text >= 5:
         ats_score += 15
     elif numbers_in_text >= 3:
@@ -299,9 +356,8 @@ def analyze_ats_optimization(parsed_data, resume_text):
         })
     
     # 6. Action Verbs Analysis (15 points)
-    text_lower = resume_text.lower()
-    strong_verbs_found = [verb for verb in STRONG_ACTION_VERBS if verb.lower() in text_lower]
-    weak_verbs_found = [verb for verb in WEAK_ACTION_VERBS if verb.lower() in text_lower]
+    strong_verbs_found = rule_results['strong_verbs']['found']
+    weak_verbs_found = rule_results['weak_verbs']['found']
     
     if len(strong_verbs_found) >= 5:
         ats_score += 15
@@ -376,56 +432,73 @@ def analyze_ats_optimization(parsed_data, resume_text):
         'keyword_suggestions': keyword_suggestions,
         'action_verb_analysis': action_verb_analysis,
         'strong_verbs_found': len(strong_verbs_found),
-        'recommended_verbs': [v for v in STRONG_ACTION_VERBS if v.lower() not in text_lower][:10]
+        'recommended_verbs': rule_results['strong_verbs']['missing'][:10]
     }
 
 def suggest_keywords(current_skills):
     """Suggest additional keywords based on current skills"""
     suggestions = []
-    skills_lower = [s.lower() for s in current_skills]
-    
-    # Software development keywords
-    if any(skill in skills_lower for skill in ['javascript', 'python', 'java', 'node', 'react']):
-        missing_keywords = [kw for kw in INDUSTRY_KEYWORDS['software'] if kw.lower() not in skills_lower]
-        if missing_keywords:
-            suggestions.append({
-                'category': 'Software Development',
-                'keywords': missing_keywords[:8]
-            })
-    
-    # Data science keywords
-    if any(skill in skills_lower for skill in ['python', 'sql', 'data', 'machine learning']):
-        missing_keywords = [kw for kw in INDUSTRY_KEYWORDS['data'] if kw.lower() not in skills_lower]
-        if missing_keywords:
-            suggestions.append({
-                'category': 'Data Science',
-                'keywords': missing_keywords[:8]
-            })
+    skills_lower = set(s.lower() for s in current_skills)
     
-    # Web development keywords
-    if any(skill in skills_lower for skill in ['html', 'css', 'react', 'javascript']):
-        missing_keywords = [kw for kw in INDUSTRY_KEYWORDS['web'] if kw.lower() not in skills_lower]
-        if missing_keywords:
-            suggestions.append({
-                'category': 'Web Development',
-                'keywords': missing_keywords[:8]
-            })
+    for rule in keyword_rules:
+        if rule['triggers'] & skills_lower:
+            missing_keywords = [kw for kw, kw_lower in rule['keywords'] if kw_lower not in skills_lower]
+            if missing_keywords:
+                suggestions.append({
+                    'category': rule['category'],
+                    'keywords': missing_keywords[:8]
+                })
     
     return suggestions
 
+def score_record(analysis):
+    """Flat metric -> score mapping of an /analyze result"""
+    ats_analysis = analysis.get('ats_optimization') or {}
+    scores = {
+        'overall_score': analysis.get('overall_score'),
+        'ats_score': ats_analysis.get('ats_score')
+    }
+    for name, section in (analysis.get('section_scores') or {}).items():
+        scores[f'section:{name}'] = section.get('score')
+    return scores
+
+def corpus_standing(scores, cohort=None):
+    """Percentile ranks of an analysis within its cohort (or the whole corpus)"""
+    name, ranks = score_distributions.percentiles(scores, cohort)
+    overall = ranks.get('overall_score')
+    return {
+        'cohort': name,
+        'cohort_size': score_distributions.size(name),
+        'overall_percentile': overall,
+        'top_percent': round(100 - overall, 2) if overall is not None else None,
+        'ats_percentile': ranks.get('ats_score'),
+        'section_percentiles': {
+            metric.split(':', 1)[1]: rank for metric, rank in ranks.items() if metric.startswith('section:')
+        }
+    }
+
 @app.route('/analyze', methods=['POST'])
 def analyze_endpoint():
     """API endpoint to analyze resume quality and ATS optimization"""
     try:
         print("📊 Analysis request received")
+        deadline = Deadline.from_headers(request.headers)
         data = request.json
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
         # Basic quality analysis
+        deadline.check('quality analysis')
         quality_analysis = analyze_resume_quality(data)
         
+        # Out of budget: return the quality analysis without the ATS stage
+        if deadline.expired():
+            print("⏱️  Deadline reached, skipping ATS analysis")
+            result = {**quality_analysis, 'ats_optimization': None, 'partial': True}
+            result['corpus_standing'] = record_analysis(result, data)
+            return jsonify(result), 200
+        
         # ATS optimization analysis
         resume_text = data.get('resume_text', '')
         ats_analysis = analyze_ats_optimization(data, resume_text)
@@ -433,15 +506,75 @@ def analyze_endpoint():
         # Combine results
         result = {
             **quality_analysis,
-            'ats_optimization': ats_analysis
+            'ats_optimization': ats_analysis,
+            'partial': False
         }
+        result['corpus_standing'] = record_analysis(result, data)
         
         print(f"✅ Analysis complete: Quality {quality_analysis['overall_score']}, ATS {ats_analysis['ats_score']}")
         return jsonify(result), 200
+    except DeadlineExceeded as e:
+        print(f"⏱️  {e}")
+        return jsonify({'error': str(e), 'timeout': True}), 504
     except Exception as e:
         print(f"❌ Analysis error: {e}")
         return jsonify({'error': str(e)}), 500
 
+def record_analysis(result, data):
+    """Add an analysis to the corpus distributions and rank it against them"""
+    scores = score_record(result)
+    cohort = data.get('cohort')
+    resume_id = data.get('resume_id')
+    # Without a resume id a re-analysis could not replace the earlier scores, so
+    # anonymous analyses are ranked but never recorded
+    if RECORD_ANALYSES and resume_id is not None:
+        score_distributions.record(scores, cohort, str(resume_id))
+    return corpus_standing(scores, cohort)
+
+@app.route('/analytics/cohorts', methods=['GET'])
+def list_cohorts():
+    """Known cohorts and how many analyses each holds"""
+    return jsonify({'cohorts': score_distributions.cohort_sizes()}), 200
+
+@app.route('/analytics/cohorts/<cohort>', methods=['GET'])
+def cohort_analytics(cohort):
+    """Score distribution summaries of a cohort; ?overall_score=72 etc. also returns percentile ranks"""
+    try:
+        summary = score_distributions.summary(cohort)
+        if summary is None:
+            return jsonify({'error': f'Unknown cohort: {cohort}'}), 404
+        
+        scores = {
+            metric: float(request.args[metric]) for metric in SCORE_METRICS if metric in request.args
+        }
+        _, ranks = score_distributions.percentiles(scores, cohort)
+        
+        return jsonify({
+            'cohort': cohort,
+            'size': score_distributions.size(cohort),
+            'distributions': summary,
+            'percentiles': ranks
+        }), 200
+    except ValueError as e:
+        return jsonify({'error': f'Invalid score: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/analytics/rebuild', methods=['POST'])
+def rebuild_analytics():
+    """Recompute all distributions from stored analyses in one bulk pass (resume_id keeps replacement working)"""
+    try:
+        analyses = (request.json or {}).get('analyses', [])
+        count = score_distributions.rebuild([
+            (analysis.get('cohort'), score_record(analysis),
+             str(analysis['resume_id']) if analysis.get('resume_id') is not None else None)
+            for analysis in analyses
+        ])
+        return jsonify({'status': 'rebuilt', 'analyses': count,
+                        'cohorts': score_distributions.cohort_sizes()}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
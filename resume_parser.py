@@ -4,9 +4,62 @@ from docx import Document
 import re
 from flask import Flask, request, jsonify
 import os
+import tempfile
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from deadline import NO_DEADLINE, Deadline, DeadlineExceeded
+from near_duplicates import SharedDuplicateIndex
+from parse_queue import ParseQueue, QueueFull
+from skill_normalizer import FUZZY_SKILLS, SKILL_VOCABULARY, skill_normalizer
 
 app = Flask(__name__)
 
+# Per-document parse limits (override with environment variables)
+PARSE_LIMITS = {
+    'max_chars': int(os.environ.get('PARSE_MAX_CHARS', 100000)),
+    'max_lines': int(os.environ.get('PARSE_MAX_LINES', 4000)),
+    'max_pages': int(os.environ.get('PARSE_MAX_PAGES', 30)),
+    'max_seconds': float(os.environ.get('PARSE_MAX_SECONDS', 10.0))
+}
+
+# DOCX extraction: 'stream' reads the XML parts directly, 'object' uses python-docx
+DOCX_EXTRACTION_MODE = os.environ.get('DOCX_EXTRACTION_MODE', 'stream')
+
+# Near-duplicate detection on ingestion (re-uploads, shared templates)
+DEDUP_ENABLED = os.environ.get('DEDUP_ENABLED', '1') == '1'
+DEDUP_THRESHOLD = float(os.environ.get('DEDUP_THRESHOLD', 0.8))
+DEDUP_REUSE_THRESHOLD = float(os.environ.get('DEDUP_REUSE_THRESHOLD', 0.95))
+DEDUP_CACHE_SIZE = int(os.environ.get('DEDUP_CACHE_SIZE', 10000))
+
+# Parse jobs and the near-duplicate index share one SQLite file, so every pre-fork
+# worker process sees the same queue and the same earlier uploads
+PARSE_QUEUE_DB = os.environ.get('PARSE_QUEUE_DB', os.path.join(tempfile.gettempdir(), 'resume_parse_queue.sqlite'))
+
+duplicate_index = SharedDuplicateIndex(PARSE_QUEUE_DB, capacity=DEDUP_CACHE_SIZE, threshold=DEDUP_THRESHOLD)
+
+# Typo-tolerant skill matching inside the SKILLS section ("Pyhton", "Node JS", "Postgres")
+# is switched by FUZZY_SKILLS in skill_normalizer
+SKILL_SEPARATORS = re.compile(r'[,|/;:•·\t()]')
+SKILL_BULLETS = re.compile(r'^[-*–•·▪►✓>\s]+')
+
+# Headings that start another section, in any case ("Experience", "PROJECTS", "Education:").
+# "Languages" is left out: skill lists often use it as a sub-heading
+SECTION_HEADINGS = {
+    'summary', 'profile', 'professional summary', 'objective', 'career objective', 'about me',
+    'experience', 'work experience', 'professional experience', 'employment', 'employment history',
+    'work history', 'internship', 'internships', 'projects', 'academic projects', 'personal projects',
+    'education', 'academic background', 'academic details', 'qualifications', 'certifications',
+    'certificates', 'courses', 'coursework', 'training', 'achievements', 'awards', 'honors',
+    'publications', 'activities', 'extracurricular activities', 'volunteering', 'volunteer experience',
+    'positions of responsibility', 'hobbies', 'interests', 'hobbies and interests', 'strengths',
+    'references', 'declaration', 'contact', 'personal details', 'personal information'
+}
+
+# Characters kept on each side of an '@' when looking for a broken-up email
+EMAIL_WINDOW = 64
+EMAIL_MAX_CANDIDATES = 20
+
 # Load spaCy model with error handling
 try:
     nlp = spacy.load('en_core_web_sm')
@@ -15,8 +68,8 @@ except Exception as e:
     print(f"⚠️  Warning: Could not load spaCy model: {e}")
     nlp = None
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF file"""
+def extract_text_from_pdf(pdf_path, max_pages=None, max_chars=None, limits_hit=None, deadline=NO_DEADLINE):
+    """Extract text from PDF file, stopping early once page, character or time limits are reached"""
     text = ""
     try:
         print(f"📄 Opening PDF: {pdf_path}")
@@ -24,9 +77,27 @@ def extract_text_from_pdf(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
         doc = fitz.open(pdf_path)
-        for page in doc:
-            text += page.get_text()
+        pages = []
+        total_chars = 0
+        for page_number, page in enumerate(doc):
+            if max_pages is not None and page_number >= max_pages:
+                if limits_hit is not None:
+                    limits_hit.append('max_pages')
+                break
+            if deadline.expired():
+                if limits_hit is not None:
+                    limits_hit.append('deadline')
+                break
+            page_text = page.get_text()
+            pages.append(page_text)
+            total_chars += len(page_text)
+            if max_chars is not None and total_chars >= max_chars:
+                # Remaining pages would be truncated away anyway
+                if limits_hit is not None and page_number + 1 < doc.page_count:
+                    limits_hit.append('max_chars')
+                break
         doc.close()
+        text = ''.join(pages)
         print(f"✅ Extracted {len(text)} characters from PDF")
     except Exception as e:
         print(f"❌ Error extracting PDF: {e}")
@@ -50,6 +121,84 @@ def extract_text_from_docx(docx_path):
         raise
     return text
 
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+DOCX_BREAK_TAGS = (WORD_NS + 'br', WORD_NS + 'cr')
+
+def _docx_part_names(docx_zip):
+    """Headers, main document and footers in reading order"""
+    names = docx_zip.namelist()
+    headers = sorted(n for n in names if re.fullmatch(r'word/header\d*\.xml', n))
+    footers = sorted(n for n in names if re.fullmatch(r'word/footer\d*\.xml', n))
+    return headers + ['word/document.xml'] + footers
+
+def _stream_docx_paragraphs(xml_file):
+    """Yield paragraph text from a WordprocessingML part using an incremental parser"""
+    # Nested paragraphs (text boxes) get their own entry on the stack
+    stack = []
+    fallback_depth = 0
+    
+    for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+        tag = elem.tag
+        
+        # mc:Fallback repeats text box content for old readers; skip it
+        if tag == MC_FALLBACK:
+            fallback_depth += 1 if event == 'start' else -1
+            continue
+        if fallback_depth:
+            if event == 'end':
+                elem.clear()
+            continue
+        
+        if event == 'start':
+            if tag == WORD_NS + 'p':
+                stack.append([])
+            continue
+        
+        if tag == WORD_NS + 't' and stack:
+            stack[-1].append(elem.text or '')
+        elif tag == WORD_NS + 'tab' and stack:
+            stack[-1].append('\t')
+        elif tag in DOCX_BREAK_TAGS and stack:
+            stack[-1].append('\n')
+        elif tag == WORD_NS + 'p':
+            yield ''.join(stack.pop())
+            elem.clear()
+        elif tag == WORD_NS + 'tbl':
+            elem.clear()
+
+def extract_text_from_docx_stream(docx_path, max_chars=None, limits_hit=None, deadline=NO_DEADLINE):
+    """Extract text from DOCX by streaming the XML parts (body, tables, headers, footers)"""
+    print(f"📄 Streaming DOCX: {docx_path}")
+    if not os.path.exists(docx_path):
+        raise FileNotFoundError(f"DOCX file not found: {docx_path}")
+    
+    lines = []
+    total_chars = 0
+    with zipfile.ZipFile(docx_path) as docx_zip:
+        names = set(docx_zip.namelist())
+        for part_name in _docx_part_names(docx_zip):
+            if part_name not in names:
+                continue
+            if deadline.expired():
+                if limits_hit is not None:
+                    limits_hit.append('deadline')
+                break
+            with docx_zip.open(part_name) as xml_file:
+                for paragraph in _stream_docx_paragraphs(xml_file):
+                    lines.append(paragraph + '\n')
+                    total_chars += len(paragraph) + 1
+                    if max_chars is not None and total_chars >= max_chars:
+                        if limits_hit is not None:
+                            limits_hit.append('max_chars')
+                        text = ''.join(lines)
+                        print(f"✅ Extracted {len(text)} characters from DOCX (truncated)")
+                        return text
+    
+    text = ''.join(lines)
+    print(f"✅ Extracted {len(text)} characters from DOCX")
+    return text
+
 def extract_email(text):
     """Extract email from concatenated text - improved version"""
     if not text:
@@ -63,23 +212,21 @@ def extract_email(text):
     if match:
         return match.group(0)
     
-    # Method 2: Remove all whitespace and try again
-    text_no_space = ''.join(text.split())
-    match = re.search(email_pattern, text_no_space, re.IGNORECASE)
-    if match:
-        return match.group(0)
-    
-    # Method 3: Manual extraction around @ symbol
-    if '@' in text:
-        at_index = text.find('@')
-        # Get 30 chars before and after
-        start = max(0, at_index - 30)
-        end = min(len(text), at_index + 40)
-        chunk = text[start:end].replace('\n', '').replace(' ', '')
+    # Method 2: Remove whitespace around each @ symbol and try again
+    # (bounded windows instead of a whitespace-stripped copy of the whole text)
+    at_index = text.find('@')
+    candidates = 0
+    while at_index != -1 and candidates < EMAIL_MAX_CANDIDATES:
+        start = max(0, at_index - EMAIL_WINDOW)
+        end = min(len(text), at_index + EMAIL_WINDOW)
+        chunk = ''.join(text[start:end].split())
         
         match = re.search(email_pattern, chunk, re.IGNORECASE)
         if match:
             return match.group(0)
+        
+        candidates += 1
+        at_index = text.find('@', at_index + 1)
     
     return None
 
@@ -114,28 +261,58 @@ def extract_github(text):
     github_links = re.findall(github_pattern, text)
     return github_links[0] if github_links else None
 
+def is_section_heading(line):
+    """Whether a line is a known section heading, whatever its case"""
+    key = ' '.join(re.sub(r'[^a-z&]+', ' ', line.lower()).replace('&', 'and').split())
+    return key in SECTION_HEADINGS
+
+def ends_skill_section(line):
+    """A known section heading in any case, or an all-caps line that is neither a bullet nor a skill"""
+    if is_section_heading(line):
+        return True
+    return (line.isupper() and len(line) > 3 and not SKILL_BULLETS.match(line)
+            and skill_normalizer.lookup(line) is None)
+
+def extract_skill_section_items(text):
+    """Comma/pipe/bullet separated items listed under a SKILLS heading"""
+    items = []
+    in_skills_section = False
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if 'skill' in stripped.lower() and len(stripped) < 30:
+            in_skills_section = True
+            continue
+        if in_skills_section and ends_skill_section(stripped):
+            in_skills_section = False
+        if in_skills_section and stripped:
+            for item in SKILL_SEPARATORS.split(stripped):
+                item = SKILL_BULLETS.sub('', item).strip()
+                if item:
+                    items.append(item)
+    return items
+
+def extract_fuzzy_skills(text):
+    """Skills written with typos or other spellings, from whole SKILLS section items only
+
+    Words inside an item are never matched one by one: prose that ends up in
+    the section ("Worked with Jason on ...") would turn names and verbs into
+    skills (Jason -> JSON, Expressed -> Express).
+    """
+    return [skill for skill in map(skill_normalizer.lookup, extract_skill_section_items(text)) if skill]
+
 def extract_skills(text):
     """Extract skills from resume using keyword matching"""
-    skills_keywords = [
-        'Python', 'Java', 'JavaScript', 'Node.js', 'React', 'Angular', 'Vue',
-        'MongoDB', 'MySQL', 'PostgreSQL', 'SQL', 'NoSQL', 'JDBC',
-        'Machine Learning', 'AI', 'Data Science', 'Deep Learning',
-        'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes',
-        'HTML', 'CSS', 'TypeScript', 'C++', 'C#', 'PHP',
-        'Git', 'REST API', 'RESTful API', 'GraphQL', 'Express', 'Django', 'Flask',
-        'TensorFlow', 'PyTorch', 'NLP', 'Computer Vision', 'Bootstrap',
-        'jQuery', 'Next.js', 'Spring Boot', 'FastAPI', 'Pandas', 'NumPy',
-        'Postman', 'Github', 'HTML5', 'CSS3', 'AJAX', 'JSON',
-        'Data Structures', 'Algorithms', 'OOP', 'CRUD'
-    ]
-    
     found_skills = []
     text_lower = text.lower()
     
-    for skill in skills_keywords:
+    for skill in SKILL_VOCABULARY:
         if skill.lower() in text_lower:
             found_skills.append(skill)
     
+    # Misspelled or differently written skills in the skills section
+    if FUZZY_SKILLS:
+        found_skills.extend(extract_fuzzy_skills(text))
+    
     return sorted(list(set(found_skills)))
 
 def extract_languages(text):
@@ -260,23 +437,23 @@ def extract_experience(text):
                     'title': '',
                     'company': '',
                     'duration': line.strip(),
-                    'description': ''
+                    'description': []
                 }
             elif current_exp:
-                # Add to description
+                # Add to description (joined once at the end instead of repeated string +=)
                 if not current_exp['title']:
                     current_exp['title'] = line.strip()
                 elif not current_exp['company'] and i > 0:
                     current_exp['company'] = line.strip()
                 else:
-                    if current_exp['description']:
-                        current_exp['description'] += ' ' + line.strip()
-                    else:
-                        current_exp['description'] = line.strip()
+                    current_exp['description'].append(line.strip())
     
     if current_exp:
         experience.append(current_exp)
     
+    for exp in experience:
+        exp['description'] = ' '.join(exp['description'])
+    
     return experience
 
 def extract_projects(text):
@@ -329,7 +506,7 @@ def extract_projects(text):
                 current_project = {
                     'name': parts[0].strip(),
                     'technologies': tech_part,
-                    'description': ''
+                    'description': []
                 }
                 print(f"📌 New project found: {current_project['name']}")
             
@@ -341,7 +518,7 @@ def extract_projects(text):
                     current_project = {
                         'name': line_stripped,
                         'technologies': '',
-                        'description': ''
+                        'description': []
                     }
                     print(f"📌 New project found: {current_project['name']}")
                 else:
@@ -371,30 +548,27 @@ def extract_projects(text):
                     current_project = {
                         'name': line_stripped,
                         'technologies': '',
-                        'description': ''
+                        'description': []
                     }
                     print(f"📌 New project found: {current_project['name']}")
                 else:
                     # This is a description line
                     if current_project:
-                        if current_project['description']:
-                            current_project['description'] += ' ' + line_stripped
-                        else:
-                            current_project['description'] = line_stripped
+                        current_project['description'].append(line_stripped)
             
             # Pattern 4: Description line (add to current project)
             else:
                 if current_project:
-                    if current_project['description']:
-                        current_project['description'] += ' ' + line_stripped
-                    else:
-                        current_project['description'] = line_stripped
+                    current_project['description'].append(line_stripped)
     
     # Don't forget the last project
     if current_project and (current_project['name'] or current_project['description']):
         projects.append(current_project)
         print(f"✅ Added final project: {current_project['name']}")
     
+    for project in projects:
+        project['description'] = ' '.join(project['description'])
+    
     print(f"📊 Total projects extracted: {len(projects)}")
     return projects
 
@@ -423,36 +597,179 @@ def extract_name(text):
     
     return "Unknown Candidate"
 
-def parse_resume(file_path, file_type):
+def apply_text_limits(text, limits, limits_hit):
+    """Truncate extracted text to the character and line limits"""
+    max_chars = limits.get('max_chars')
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars]
+        limits_hit.append('max_chars')
+    
+    max_lines = limits.get('max_lines')
+    # A trailing newline ends the last line rather than starting another one
+    if max_lines is not None and text.rstrip('\n').count('\n') >= max_lines:
+        text = '\n'.join(text.split('\n', max_lines)[:max_lines])
+        limits_hit.append('max_lines')
+    
+    return text
+
+# Field extractors in the order they run, with the value used when a field is skipped
+FIELD_EXTRACTORS = [
+    ('name', extract_name, 'Unknown Candidate'),
+    ('email', extract_email, None),
+    ('phone', extract_phone, None),
+    ('location', extract_location, None),
+    ('github', extract_github, None),
+    ('skills', extract_skills, []),
+    ('languages', extract_languages, []),
+    ('education', extract_education, []),
+    ('experience', extract_experience, []),
+    ('projects', extract_projects, [])
+]
+
+# Cheap per-candidate fields, re-extracted even when a near-duplicate's parse is reused
+CONTACT_FIELDS = ('name', 'email', 'phone', 'location', 'github')
+
+def extract_contact_fields(text):
+    """Run only the contact extractors over the text"""
+    return {
+        field: extractor(text) for field, extractor, _ in FIELD_EXTRACTORS if field in CONTACT_FIELDS
+    }
+
+def parse_text(text, limits=None, started_at=None, limits_hit=None, progress=None, deadline=NO_DEADLINE):
+    """Run every field extractor over already extracted text within the parse limits and request deadline"""
+    limits = {**PARSE_LIMITS, **(limits or {})}
+    started_at = started_at if started_at is not None else time.monotonic()
+    limits_hit = list(limits_hit or [])
+    
+    text = apply_text_limits(text, limits, limits_hit)
+    time_limit = deadline.earliest(started_at + limits['max_seconds'])
+    
+    parsed_data = {}
+    skipped_fields = []
+    for step, (field, extractor, default) in enumerate(FIELD_EXTRACTORS):
+        if progress:
+            progress(f'extract_{field}', 0.2 + 0.8 * step / len(FIELD_EXTRACTORS))
+        # Out of time: keep what we have and fill the rest with empty values
+        if time_limit.expired():
+            skipped_fields.append(field)
+            parsed_data[field] = list(default) if isinstance(default, list) else default
+            continue
+        parsed_data[field] = extractor(text)
+    
+    if skipped_fields:
+        # The caller's deadline or our own time limit, whichever ran out
+        limits_hit.append('deadline' if deadline.expired() else 'max_seconds')
+    
+    parsed_data['resume_text'] = text[:5000]
+    parsed_data['partial'] = len(limits_hit) > 0
+    parsed_data['limits_hit'] = sorted(set(limits_hit))
+    parsed_data['skipped_fields'] = skipped_fields
+    parsed_data['parse_time_ms'] = round((time.monotonic() - started_at) * 1000, 2)
+    
+    return parsed_data
+
+def find_duplicate(document_id, text):
+    """Indexed near-duplicates of a document, best first: ([(document_id, similarity, cached parse)], signature)"""
+    signature = duplicate_index.signature(text)
+    return duplicate_index.query(signature=signature, exclude=document_id), signature
+
+def remember_parse(document_id, signature, parsed_data):
+    """Index a parsed document for later duplicate lookups (newest DEDUP_CACHE_SIZE kept)"""
+    duplicate_index.add(document_id, parsed_data, signature=signature)
+
+def parse_resume(file_path, file_type, limits=None, document_id=None, progress=None, deadline=NO_DEADLINE):
     """Main function to parse resume with all details"""
     print(f"🔍 Parsing resume: {file_path} (type: {file_type})")
+    if deadline.expired():
+        # The caller has already given up (e.g. the job waited too long in the queue)
+        print("⏱️  Request deadline passed before parsing started")
+        return {'error': str(DeadlineExceeded('extract_text')), 'timeout': True}
+    if progress:
+        progress('extract_text', 0.0)
+    
+    limits = {**PARSE_LIMITS, **(limits or {})}
+    started_at = time.monotonic()
+    limits_hit = []
+    # Extraction stops at the caller's deadline or at our own time limit, whichever comes first
+    extract_deadline = deadline.earliest(started_at + limits['max_seconds'])
     
     try:
         # Extract text based on file type
         if file_type == 'pdf':
-            text = extract_text_from_pdf(file_path)
+            text = extract_text_from_pdf(
+                file_path,
+                max_pages=limits['max_pages'],
+                max_chars=limits['max_chars'],
+                limits_hit=limits_hit,
+                deadline=extract_deadline
+            )
         elif file_type in ['docx', 'doc']:
-            text = extract_text_from_docx(file_path)
+            if DOCX_EXTRACTION_MODE == 'stream' and zipfile.is_zipfile(file_path):
+                text = extract_text_from_docx_stream(
+                    file_path,
+                    max_chars=limits['max_chars'],
+                    limits_hit=limits_hit,
+                    deadline=extract_deadline
+                )
+            else:
+                text = extract_text_from_docx(file_path)
         else:
             return {'error': f'Unsupported file type: {file_type}'}
         
+        if 'deadline' in limits_hit and not deadline.expired():
+            # Our own time limit stopped extraction, not the caller's deadline
+            limits_hit = ['max_seconds' if hit == 'deadline' else hit for hit in limits_hit]
+        if (not text or len(text.strip()) < 10) and extract_deadline.expired():
+            return {'error': str(DeadlineExceeded('extract_fields')), 'timeout': True}
         if not text or len(text.strip()) < 10:
             return {'error': 'Could not extract text from file or file is empty'}
         
-        # Extract all information
-        parsed_data = {
-            'name': extract_name(text),
-            'email': extract_email(text),
-            'phone': extract_phone(text),
-            'location': extract_location(text),
-            'github': extract_github(text),
-            'skills': extract_skills(text),
-            'languages': extract_languages(text),
-            'education': extract_education(text),
-            'experience': extract_experience(text),
-            'projects': extract_projects(text),
-            'resume_text': text[:5000]
-        }
+        # Near-duplicates of an earlier upload reuse its parse instead of re-running extractors
+        matches, signature = [], None
+        if DEDUP_ENABLED:
+            document_id = document_id or file_path
+            matches, signature = find_duplicate(document_id, text[:limits['max_chars']])
+        duplicate_id, similarity = matches[0][:2] if matches else (None, 0.0)
+        
+        # Contact details differ between candidates sharing a template, so they always
+        # come from the new text; only a near-duplicate with the same email lends its
+        # expensive fields (skills, education, experience, projects)
+        contact, cached = None, None
+        contact_limits_hit = []
+        for match_id, match_similarity, match_parse in matches:
+            if match_similarity < DEDUP_REUSE_THRESHOLD:
+                break
+            if match_parse is None:
+                continue
+            if contact is None:
+                contact = extract_contact_fields(apply_text_limits(text, limits, contact_limits_hit))
+            if (contact['email'] or '').lower() == (match_parse.get('email') or '').lower():
+                duplicate_id, similarity, cached = match_id, match_similarity, match_parse
+                break
+            print(f"👥 Near-duplicate {match_id} ({match_similarity:.2f}) has another email, not reusing it")
+        
+        if cached is not None:
+            print(f"♻️  Near-duplicate of {duplicate_id} ({similarity:.2f}), reusing its parse")
+            # The reused parse was complete; this document's own truncation still counts
+            reused_limits_hit = sorted(set(limits_hit + contact_limits_hit))
+            parsed_data = {
+                **cached,
+                **contact,
+                'resume_text': apply_text_limits(text, limits, [])[:5000],
+                'partial': len(reused_limits_hit) > 0,
+                'limits_hit': reused_limits_hit,
+                'reused_parse': True,
+                'parse_time_ms': round((time.monotonic() - started_at) * 1000, 2)
+            }
+        else:
+            # Extract all information
+            parsed_data = parse_text(text, limits, started_at, limits_hit, progress, deadline)
+            parsed_data['reused_parse'] = False
+            if DEDUP_ENABLED and not parsed_data['partial']:
+                remember_parse(document_id, signature, parsed_data)
+        
+        parsed_data['duplicate_of'] = duplicate_id
+        parsed_data['duplicate_similarity'] = round(similarity, 3)
         
         print(f"✅ Parsing complete:")
         print(f"   Name: {parsed_data['name']}")
@@ -463,12 +780,50 @@ def parse_resume(file_path, file_type):
         print(f"   Education: {len(parsed_data['education'])} entries")
         print(f"   Experience: {len(parsed_data['experience'])} entries")
         print(f"   Projects: {len(parsed_data['projects'])} found")
+        if parsed_data['partial']:
+            print(f"⚠️  Partial result, limits hit: {', '.join(parsed_data['limits_hit'])}")
         
         return parsed_data
     except Exception as e:
         print(f"❌ Parsing error: {e}")
         return {'error': str(e)}
 
+def request_limits(data):
+    """Optional per-request overrides of the parse limits (can only tighten PARSE_LIMITS)"""
+    limits = data.get('limits')
+    if not isinstance(limits, dict):
+        return {}
+    return {
+        key: type(PARSE_LIMITS[key])(min(value, PARSE_LIMITS[key])) for key, value in limits.items()
+        if key in PARSE_LIMITS and isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+    }
+
+def run_queued_parse(payload, progress):
+    """Parse job handler for the background queue"""
+    return parse_resume(
+        payload['file_path'],
+        payload['file_type'],
+        payload['limits'],
+        payload['document_id'],
+        progress,
+        Deadline.from_epoch_ms(payload.get('deadline_ms'))
+    )
+
+# Asynchronous parsing: submit returns a job id, workers drain a priority queue kept in
+# a SQLite file that every pre-fork worker process shares
+parse_queue = ParseQueue(
+    run_queued_parse,
+    PARSE_QUEUE_DB,
+    workers=int(os.environ.get('PARSE_QUEUE_WORKERS', 2)),
+    max_pending=int(os.environ.get('PARSE_QUEUE_MAX_PENDING', 100)),
+    retention=int(os.environ.get('PARSE_QUEUE_RETENTION', 1000))
+)
+
+def drain():
+    """Finish this process's running parse jobs before prefork_server recycles it"""
+    if not parse_queue.drain(timeout=PARSE_LIMITS['max_seconds'] * 3):
+        print("⚠️  Parse jobs still running at worker exit; they will be queued again")
+
 @app.route('/parse', methods=['POST'])
 def parse_resume_endpoint():
     """API endpoint to parse resume"""
@@ -485,8 +840,16 @@ def parse_resume_endpoint():
         if not file_path or not file_type:
             return jsonify({'error': 'file_path and file_type are required'}), 400
         
-        result = parse_resume(file_path, file_type)
+        result = parse_resume(
+            file_path,
+            file_type,
+            request_limits(data),
+            data.get('document_id'),
+            deadline=Deadline.from_headers(request.headers)
+        )
         
+        if result.get('timeout'):
+            return jsonify(result), 504
         if 'error' in result:
             return jsonify(result), 500
         
@@ -495,12 +858,79 @@ def parse_resume_endpoint():
         print(f"❌ Endpoint error: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/parse/jobs', methods=['POST'])
+def submit_parse_job():
+    """Queue a resume for background parsing and return a job id immediately"""
+    try:
+        data = request.json
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        file_path = data.get('file_path')
+        file_type = data.get('file_type')
+        
+        if not file_path or not file_type:
+            return jsonify({'error': 'file_path and file_type are required'}), 400
+        
+        priority = data.get('priority', 5)
+        if isinstance(priority, bool) or not isinstance(priority, (int, str)):
+            return jsonify({'error': 'priority must be an integer'}), 400
+        try:
+            priority = int(priority)
+        except ValueError:
+            return jsonify({'error': 'priority must be an integer'}), 400
+        
+        job_id = parse_queue.submit({
+            'file_path': file_path,
+            'file_type': file_type,
+            'limits': request_limits(data),
+            'document_id': data.get('document_id'),
+            'deadline_ms': Deadline.from_headers(request.headers).epoch_ms()
+        }, priority=priority)
+        
+        print(f"📥 Parse job queued: {job_id}")
+        return jsonify(parse_queue.status(job_id)), 202
+    except QueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        print(f"❌ Endpoint error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/parse/jobs/<job_id>', methods=['GET'])
+def parse_job_status(job_id):
+    """Status and progress of a queued parse"""
+    status = parse_queue.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown parse job'}), 404
+    return jsonify(status), 200
+
+@app.route('/parse/jobs/<job_id>/result', methods=['GET'])
+def parse_job_result(job_id):
+    """Parsed data once the job has finished (202 while it is still pending)"""
+    status, result = parse_queue.result(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown parse job'}), 404
+    if status in ('queued', 'running'):
+        return jsonify({'job_id': job_id, 'status': status}), 202
+    if status == 'failed':
+        return jsonify(result), 504 if result.get('timeout') else 500
+    return jsonify(result), 200
+
+@app.route('/parse/queue/stats', methods=['GET'])
+def parse_queue_stats():
+    """Queue depth, wait time and service time for sizing the worker pool"""
+    return jsonify(parse_queue.stats()), 200
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     return jsonify({
         'status': 'running',
-        'spacy_loaded': nlp is not None
+        'spacy_loaded': nlp is not None,
+        'parse_limits': PARSE_LIMITS,
+        'docx_extraction_mode': DOCX_EXTRACTION_MODE,
+        'dedup_indexed': len(duplicate_index)
     }), 200
 
 if __name__ == '__main__':
@@ -0,0 +1,109 @@
+"""Compiled single-pass text rules for resume_analyzer.
+
+Rules are plain data. compile_rules() turns every phrase into lookups
+against one tokenized pass over the text, so adding verbs or keywords does
+not add another scan:
+
+    {'id': 'strong_verbs', 'type': 'phrases', 'patterns': [...]}
+        -> {'found': [...], 'missing': [...]} in pattern order, using the same
+           case-insensitive substring test as `pattern.lower() in text.lower()`
+    {'id': 'metrics', 'type': 'digit_runs'}
+        -> number of digit runs, same as len(re.findall(r'\\d+%?', text))
+
+A pattern made only of word characters can only occur inside one \\w+ run,
+so it is found by probing the substrings of each distinct token against a
+dict of patterns; the probe results per token are cached across calls.
+Patterns with spaces or punctuation are prefiltered on their word pieces and
+confirmed with a plain substring check.
+"""
+import re
+from collections import Counter
+
+WORD = re.compile(r'\w+')
+DIGIT_RUN = re.compile(r'\d+')
+TOKEN_CACHE_SIZE = 100000
+
+
+class CompiledRules:
+    """Rule set compiled into substring probes over the distinct tokens of a text"""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.owners = {}
+        self.phrases = []
+        self.probes = set()
+        self.counts_digits = any(rule['type'] == 'digit_runs' for rule in rules)
+
+        for rule in rules:
+            if rule['type'] == 'phrases':
+                for index, pattern in enumerate(rule['patterns']):
+                    lowered = pattern.lower()
+                    if WORD.fullmatch(lowered):
+                        self.owners.setdefault(lowered, []).append((rule['id'], index))
+                        self.probes.add(lowered)
+                    else:
+                        pieces = WORD.findall(lowered)
+                        self.phrases.append((rule['id'], index, lowered, pieces))
+                        self.probes.update(pieces)
+            elif rule['type'] != 'digit_runs':
+                raise ValueError(f"Unknown rule type: {rule['type']}")
+
+        self.lengths = sorted(set(len(probe) for probe in self.probes))
+        self.token_cache = {}
+
+    def _scan_token(self, token):
+        # Probes found inside the token and its number of digit runs
+        cached = self.token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        found = []
+        token_length = len(token)
+        for length in self.lengths:
+            if length > token_length:
+                break
+            for start in range(token_length - length + 1):
+                piece = token[start:start + length]
+                if piece in self.probes:
+                    found.append(piece)
+        digit_runs = len(DIGIT_RUN.findall(token)) if self.counts_digits else 0
+
+        if len(self.token_cache) >= TOKEN_CACHE_SIZE:
+            self.token_cache.clear()
+        self.token_cache[token] = cached = (tuple(found), digit_runs)
+        return cached
+
+    def evaluate(self, text):
+        """Evaluate every rule against the text in one tokenized pass"""
+        text_lower = text.lower()
+        present = set()
+        digit_runs = 0
+        for token, occurrences in Counter(WORD.findall(text_lower)).items():
+            found, token_digit_runs = self._scan_token(token)
+            present.update(found)
+            digit_runs += occurrences * token_digit_runs
+
+        matched = {rule['id']: set() for rule in self.rules if rule['type'] == 'phrases'}
+        for probe in present:
+            for rule_id, index in self.owners.get(probe, ()):
+                matched[rule_id].add(index)
+        for rule_id, index, lowered, pieces in self.phrases:
+            if all(piece in present for piece in pieces) and lowered in text_lower:
+                matched[rule_id].add(index)
+
+        results = {}
+        for rule in self.rules:
+            if rule['type'] == 'digit_runs':
+                results[rule['id']] = digit_runs
+            else:
+                hits = matched[rule['id']]
+                results[rule['id']] = {
+                    'found': [p for i, p in enumerate(rule['patterns']) if i in hits],
+                    'missing': [p for i, p in enumerate(rule['patterns']) if i not in hits]
+                }
+        return results
+
+
+def compile_rules(rules):
+    """Compile a list of rule dicts"""
+    return CompiledRules(rules)
@@ -0,0 +1,348 @@
+"""Incrementally updated score distributions for corpus percentile ranks.
+
+Analyzer scores are bounded (0..max) and coarse, so each distribution is a
+histogram over fixed-width bins (SCORE_RESOLUTION) kept in a Fenwick tree:
+adding or removing a score, the rank of a score and any quantile each cost
+O(log bins), independent of how many resumes have been seen. Histograms of
+the same metric merge by adding counts, and a whole corpus is rebuilt in one
+vectorized np.bincount pass.
+
+Percentile rank uses the mid-rank convention: the share of the cohort
+scoring below x plus half the share scoring exactly x.
+
+With an AnalysisStore, the latest scores per resume live in a SQLite file
+shared by every analyzer process (pre-fork workers, restarts). Each process
+keeps its histograms in memory and, before answering, applies the rows
+added since its last sync; a bulk rebuild bumps the store generation so
+every process reloads.
+"""
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+SCORE_RESOLUTION = 0.1
+SUMMARY_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class ScoreHistogram:
+    """Counts of scores in [0, max_score] with Fenwick-tree prefix sums"""
+
+    def __init__(self, max_score, resolution=SCORE_RESOLUTION):
+        self.max_score = max_score
+        self.resolution = resolution
+        self.bins = int(round(max_score / resolution)) + 1
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.tree = np.zeros(self.bins + 1, dtype=np.int64)
+        self.total = 0
+        self.sum = 0.0
+
+    def _bin(self, score):
+        return int(round(min(max(score, 0), self.max_score) / self.resolution))
+
+    def _prefix(self, bin_index):
+        """Number of scores in bins [0, bin_index)"""
+        count = 0
+        i = bin_index
+        while i > 0:
+            count += self.tree[i]
+            i -= i & -i
+        return int(count)
+
+    def add(self, score, count=1):
+        """Record (or with a negative count, forget) a score"""
+        b = self._bin(score)
+        self.counts[b] += count
+        self.total += count
+        self.sum += score * count
+        i = b + 1
+        while i <= self.bins:
+            self.tree[i] += count
+            i += i & -i
+
+    def remove(self, score):
+        self.add(score, -1)
+
+    def bin_indices(self, scores):
+        """Vectorized _bin for an array of scores"""
+        scores = np.clip(np.asarray(scores, dtype=np.float64), 0, self.max_score)
+        return np.rint(scores / self.resolution).astype(np.int64)
+
+    def load(self, counts, score_sum):
+        """Replace the contents with precomputed bin counts (bulk rebuild)"""
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.total = int(self.counts.sum())
+        self.sum = float(score_sum)
+        self._rebuild_tree()
+        return self
+
+    def merge(self, other):
+        """Add another histogram of the same metric into this one"""
+        if other.bins != self.bins:
+            raise ValueError('Cannot merge histograms with different bins')
+        self.counts += other.counts
+        self.total += other.total
+        self.sum += other.sum
+        self._rebuild_tree()
+        return self
+
+    def _rebuild_tree(self):
+        # Fenwick node i covers bins (i - lowbit(i), i]: a difference of two prefix sums
+        prefix = np.concatenate([[0], np.cumsum(self.counts)])
+        index = np.arange(1, self.bins + 1)
+        self.tree = np.zeros(self.bins + 1, dtype=np.int64)
+        self.tree[1:] = prefix[index] - prefix[index - (index & -index)]
+
+    def percentile_rank(self, score):
+        """Mid-rank percentile (0-100) of a score among the recorded ones, None if empty"""
+        if self.total <= 0:
+            return None
+        b = self._bin(score)
+        below = self._prefix(b)
+        return round(100.0 * (below + 0.5 * self.counts[b]) / self.total, 2)
+
+    def quantile(self, q):
+        """Smallest score with at least a q share of the distribution at or below it"""
+        if self.total <= 0:
+            return None
+        target = max(1, int(np.ceil(q * self.total)))
+        # Fenwick descent: largest position whose prefix count is below target
+        position = 0
+        remaining = target
+        step = 1 << (self.bins.bit_length())
+        while step:
+            nxt = position + step
+            if nxt <= self.bins and self.tree[nxt] < remaining:
+                position = nxt
+                remaining -= self.tree[nxt]
+            step >>= 1
+        return round(position * self.resolution, 2)
+
+    def summary(self):
+        """Count, mean, min/max and the SUMMARY_QUANTILES"""
+        if self.total <= 0:
+            return {'count': 0}
+        nonzero = np.flatnonzero(self.counts)
+        return {
+            'count': self.total,
+            'mean': round(self.sum / self.total, 2),
+            'min': round(nonzero[0] * self.resolution, 2),
+            'max': round(nonzero[-1] * self.resolution, 2),
+            'quantiles': {f'p{int(q * 100)}': self.quantile(q) for q in SUMMARY_QUANTILES}
+        }
+
+
+class AnalysisStore:
+    """Latest scores per resume id (anonymous analyses kept as they come) in a shared SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._transaction() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS analyses (seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'resume_id TEXT UNIQUE, cohort TEXT, scores TEXT NOT NULL)'
+            )
+            connection.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+            connection.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0)")
+
+    @contextmanager
+    def _transaction(self, write=True):
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('BEGIN IMMEDIATE' if write else 'BEGIN')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    def record(self, cohort, scores, resume_id=None):
+        """Store an analysis; a repeated resume id replaces the earlier row (and gets a new seq)"""
+        with self._transaction() as connection:
+            connection.execute('INSERT OR REPLACE INTO analyses (resume_id, cohort, scores) VALUES (?, ?, ?)',
+                               (resume_id, cohort, json.dumps(scores)))
+
+    def replace_all(self, records):
+        """Swap in a new set of (cohort, scores, resume_id) records and bump the generation"""
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM analyses')
+            connection.executemany('INSERT OR REPLACE INTO analyses (resume_id, cohort, scores) VALUES (?, ?, ?)',
+                                   [(resume_id, cohort, json.dumps(scores)) for cohort, scores, resume_id in records])
+            connection.execute("UPDATE meta SET value = value + 1 WHERE name = 'generation'")
+
+    def changes(self, generation, after_seq):
+        """(generation, rows) with rows newer than after_seq, or every row if the generation moved on"""
+        with self._transaction(write=False) as connection:
+            current = connection.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()[0]
+            if current != generation:
+                after_seq = 0
+            rows = connection.execute(
+                'SELECT seq, resume_id, cohort, scores FROM analyses WHERE seq > ? ORDER BY seq', (after_seq,)
+            ).fetchall()
+        return current, [(seq, resume_id, cohort, json.loads(scores)) for seq, resume_id, cohort, scores in rows]
+
+
+def _records(records):
+    """(cohort, scores, resume_id) triples from pairs or triples, keeping the last record per resume id"""
+    latest = {}
+    anonymous = []
+    for record in records:
+        cohort, scores = record[0], record[1]
+        resume_id = record[2] if len(record) > 2 else None
+        if resume_id is None:
+            anonymous.append((cohort, scores, None))
+        else:
+            latest.pop(resume_id, None)
+            latest[resume_id] = (cohort, scores, resume_id)
+    return anonymous + list(latest.values())
+
+
+class CohortDistributions:
+    """Score histograms per cohort and metric, with replace-on-reanalysis by resume id"""
+
+    def __init__(self, metrics, all_cohort='all', store=None):
+        self.metrics = dict(metrics)
+        self.all_cohort = all_cohort
+        self.cohorts = {}
+        self.recorded = {}
+        self.lock = threading.Lock()
+        self.store = store
+        self.generation = None
+        self.cursor = 0
+
+    def _histograms(self, cohort):
+        if cohort not in self.cohorts:
+            self.cohorts[cohort] = {
+                metric: ScoreHistogram(max_score) for metric, max_score in self.metrics.items()
+            }
+        return self.cohorts[cohort]
+
+    def _apply(self, cohort, scores, count):
+        for name in {self.all_cohort, cohort}:
+            histograms = self._histograms(name)
+            for metric, score in scores.items():
+                if metric in histograms and score is not None:
+                    histograms[metric].add(score, count)
+
+    def _record(self, scores, cohort, resume_id):
+        cohort = cohort or self.all_cohort
+        if resume_id is not None:
+            previous = self.recorded.pop(resume_id, None)
+            if previous is not None:
+                self._apply(previous[0], previous[1], -1)
+            self.recorded[resume_id] = (cohort, scores)
+        self._apply(cohort, scores, 1)
+
+    def _sync(self):
+        """Apply analyses other processes stored since the last sync (caller holds the lock)"""
+        if self.store is None:
+            return
+        generation, rows = self.store.changes(self.generation, self.cursor)
+        if generation != self.generation:
+            self.generation = generation
+            self.cursor = 0
+            self._load([(cohort, scores, resume_id) for _, resume_id, cohort, scores in rows])
+        else:
+            for _, resume_id, cohort, scores in rows:
+                self._record(scores, cohort, resume_id)
+        if rows:
+            self.cursor = rows[-1][0]
+
+    def record(self, scores, cohort=None, resume_id=None):
+        """Add one analysis; a repeated resume_id replaces that resume's previous scores"""
+        with self.lock:
+            if self.store is not None:
+                # Applied locally by the sync, like rows written by other processes
+                self.store.record(cohort, scores, resume_id)
+                self._sync()
+            else:
+                self._record(scores, cohort, resume_id)
+
+    def percentiles(self, scores, cohort=None):
+        """Percentile rank of each score within a cohort (falls back to the whole corpus)"""
+        with self.lock:
+            self._sync()
+            name = cohort if cohort in self.cohorts else self.all_cohort
+            histograms = self.cohorts.get(name, {})
+            return name, {
+                metric: histograms[metric].percentile_rank(score)
+                for metric, score in scores.items() if metric in histograms and score is not None
+            }
+
+    def size(self, cohort):
+        with self.lock:
+            self._sync()
+            histograms = self.cohorts.get(cohort)
+            return next(iter(histograms.values())).total if histograms else 0
+
+    def summary(self, cohort):
+        """Distribution summary of every metric in a cohort, None if the cohort is unknown"""
+        with self.lock:
+            self._sync()
+            histograms = self.cohorts.get(cohort)
+            if histograms is None:
+                return None
+            return {metric: histogram.summary() for metric, histogram in histograms.items()}
+
+    def cohort_sizes(self):
+        with self.lock:
+            self._sync()
+            return {
+                name: next(iter(histograms.values())).total
+                for name, histograms in self.cohorts.items()
+            }
+
+    def rebuild(self, records):
+        """Recompute every distribution from (cohort, scores[, resume_id]) records in one vectorized pass per metric
+
+        The last record of a resume id wins, and later analyses of that id replace it.
+        """
+        records = _records(records)
+        with self.lock:
+            if self.store is not None:
+                self.store.replace_all(records)
+                self._sync()
+            else:
+                self._load(records)
+        return len(records)
+
+    def _load(self, records):
+        """Replace every histogram with the given (cohort, scores, resume_id) records (caller holds the lock)"""
+        names, cohort_index = np.unique(
+            np.array([str(cohort or self.all_cohort) for cohort, _, _ in records] + [self.all_cohort]),
+            return_inverse=True
+        )
+        cohort_index = cohort_index[:-1]
+        all_index = int(np.flatnonzero(names == self.all_cohort)[0])
+
+        self.cohorts = {}
+        self.recorded = {
+            resume_id: (cohort or self.all_cohort, scores)
+            for cohort, scores, resume_id in records if resume_id is not None
+        }
+        for metric in self.metrics:
+            template = self._histograms(self.all_cohort)[metric]
+            values = np.array([np.nan if scores.get(metric) is None else scores[metric]
+                               for _, scores, _ in records], dtype=np.float64)
+            present = ~np.isnan(values)
+            bins = template.bin_indices(values[present])
+            rows = cohort_index[present]
+            # One bincount over (cohort, bin) pairs gives every cohort's histogram at once
+            counts = np.bincount(rows * template.bins + bins,
+                                 minlength=len(names) * template.bins).reshape(len(names), template.bins)
+            sums = np.bincount(rows, weights=values[present], minlength=len(names))
+            for i, name in enumerate(names.tolist()):
+                if i == all_index:
+                    continue
+                self._histograms(name)[metric].load(counts[i], sums[i])
+            # Records without a cohort already sit in the 'all' row; add everyone else's
+            template.load(counts.sum(axis=0), sums.sum())
@@ -0,0 +1,188 @@
+"""Typo-tolerant mapping of noisy skill tokens to canonical skill names.
+
+Built on a symmetric-delete (SymSpell) dictionary: every canonical key and
+alias is stored together with all strings reachable by deleting up to
+MAX_DISTANCE characters. A lookup generates the deletes of the query,
+collects the keys they point to, and verifies them with an optimal string
+alignment distance. This costs a few dozen dict lookups per token however
+large the vocabulary is, instead of comparing against every skill.
+
+Keys are compacted before lookup (lowercase, only letters, digits, '+' and
+'#'), so "Node JS", "node-js" and "NodeJS" all become "nodejs".
+
+Real technologies that sit within a typo of a vocabulary skill (NestJS and
+Next.js, MSSQL and MySQL, Flash and Flask) are indexed as DISTINCT_SKILLS: a
+token that is, or is nearest to, one of them is left unmapped instead of
+being merged into the neighbouring skill.
+"""
+import hashlib
+import json
+import os
+import re
+
+SKILL_VOCABULARY = [
+    'Python', 'Java', 'JavaScript', 'Node.js', 'React', 'Angular', 'Vue',
+    'MongoDB', 'MySQL', 'PostgreSQL', 'SQL', 'NoSQL', 'JDBC',
+    'Machine Learning', 'AI', 'Data Science', 'Deep Learning',
+    'AWS', 'Azure', 'Google Cloud', 'Docker', 'Kubernetes',
+    'HTML', 'CSS', 'TypeScript', 'C++', 'C#', 'PHP',
+    'Git', 'REST API', 'RESTful API', 'GraphQL', 'Express', 'Django', 'Flask',
+    'TensorFlow', 'PyTorch', 'NLP', 'Computer Vision', 'Bootstrap',
+    'jQuery', 'Next.js', 'Spring Boot', 'FastAPI', 'Pandas', 'NumPy',
+    'Postman', 'Github', 'HTML5', 'CSS3', 'AJAX', 'JSON',
+    'Data Structures', 'Algorithms', 'OOP', 'CRUD'
+]
+
+# Common alternative spellings that are not small typos
+SKILL_ALIASES = {
+    'postgres': 'PostgreSQL',
+    'psql': 'PostgreSQL',
+    'mongo': 'MongoDB',
+    'js': 'JavaScript',
+    'ecmascript': 'JavaScript',
+    'ts': 'TypeScript',
+    'node': 'Node.js',
+    'reactjs': 'React',
+    'vuejs': 'Vue',
+    'angularjs': 'Angular',
+    'nextjs': 'Next.js',
+    'expressjs': 'Express',
+    'k8s': 'Kubernetes',
+    'ml': 'Machine Learning',
+    'dl': 'Deep Learning',
+    'gcp': 'Google Cloud',
+    'amazonwebservices': 'AWS',
+    'restapis': 'REST API',
+    'springboot': 'Spring Boot'
+}
+
+# Distinct technologies one or two edits away from a vocabulary skill or alias
+DISTINCT_SKILLS = [
+    'NestJS', 'Nuxt.js', 'Nuxt', 'Preact', 'Reactor', 'ReactOS', 'MSSQL', 'PL/SQL', 'T-SQL',
+    'PostGIS', 'Flash', 'HTMX', 'HTML4', 'CSS4', 'BSON', 'JSONP', 'JAX', 'Podman', 'Cypress'
+]
+
+# Typo-tolerant matching on or off for every service (FUZZY_SKILLS=0 disables it)
+FUZZY_SKILLS = os.environ.get('FUZZY_SKILLS', '1') == '1'
+
+MAX_DISTANCE = 2
+COMPACT_PATTERN = re.compile(r'[^a-z0-9+#]')
+LOOKUP_CACHE_SIZE = 50000
+
+
+def compact(token):
+    """Lookup key: lowercase with separators and punctuation removed"""
+    return COMPACT_PATTERN.sub('', token.lower())
+
+
+def allowed_distance(length):
+    """Edit budget by key length; short skills (AI, Git, SQL) must match exactly"""
+    if length <= 3:
+        return 0
+    if length <= 6:
+        return 1
+    return MAX_DISTANCE
+
+
+def deletes(key, distance):
+    """All strings reachable from key by deleting up to `distance` characters"""
+    results = {key}
+    frontier = {key}
+    for _ in range(distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        results |= frontier
+    return results
+
+
+def osa_distance(a, b, limit):
+    """Optimal string alignment distance, or limit + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SkillNormalizer:
+    """Symmetric-delete index over the canonical skill vocabulary"""
+
+    def __init__(self, vocabulary=SKILL_VOCABULARY, aliases=SKILL_ALIASES, distinct=DISTINCT_SKILLS):
+        self.canonical = {}
+        for skill in vocabulary:
+            self.canonical[compact(skill)] = skill
+        for alias, skill in aliases.items():
+            self.canonical.setdefault(compact(alias), skill)
+        # Indexed like skills so near misses land on them, but never returned
+        self.protected = {compact(skill) for skill in distinct} - set(self.canonical)
+
+        self.delete_index = {}
+        for key in list(self.canonical) + sorted(self.protected):
+            for variant in deletes(key, allowed_distance(len(key))):
+                self.delete_index.setdefault(variant, set()).add(key)
+        self.cache = {}
+
+    def fingerprint(self):
+        """Hash of the canonical keys, aliases and distinct skills (changes when the mapping rules do)"""
+        rules = json.dumps([sorted(self.canonical.items()), sorted(self.protected)])
+        return hashlib.sha256(rules.encode('utf-8')).hexdigest()[:16]
+
+    def lookup(self, token):
+        """Canonical skill for a noisy token, or None when nothing is close enough"""
+        key = compact(token)
+        if not key:
+            return None
+        if key in self.cache:
+            return self.cache[key]
+
+        result = self.canonical.get(key)
+        if result is None:
+            # One extra character of budget so a dropped letter ("Jva") still matches
+            budget = allowed_distance(len(key) + 1)
+            best = None
+            checked = set()
+            for variant in deletes(key, budget):
+                for candidate in self.delete_index.get(variant, ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    limit = min(budget, allowed_distance(len(candidate)))
+                    distance = osa_distance(key, candidate, limit)
+                    if distance <= limit:
+                        # On a tie a distinct skill wins, so the token stays unmapped
+                        rank = (distance, abs(len(candidate) - len(key)), candidate not in self.protected, candidate)
+                        if best is None or rank < best:
+                            best = rank
+            result = self.canonical.get(best[3]) if best else None
+
+        if len(self.cache) >= LOOKUP_CACHE_SIZE:
+            self.cache.clear()
+        self.cache[key] = result
+        return result
+
+    def normalize(self, skill):
+        """Canonical name if known, otherwise the stripped original"""
+        return self.lookup(skill) or skill.strip()
+
+    def normalize_all(self, skills):
+        """Canonical names for a list of skills, order kept and duplicates dropped"""
+        seen = set()
+        normalized = []
+        for skill in skills:
+            name = self.normalize(skill)
+            if name.lower() not in seen:
+                seen.add(name.lower())
+                normalized.append(name)
+        return normalized
+
+
+skill_normalizer = SkillNormalizer()
@@ -0,0 +1,80 @@
+"""Synthetic resumes and jobs for benchmarks and load tests (no real candidate data)."""
+import random
+
+SKILLS = [
+    'Python', 'Java', 'JavaScript', 'Node.js', 'React', 'Angular', 'Vue',
+    'MongoDB', 'MySQL', 'PostgreSQL', 'SQL', 'NoSQL', 'Machine Learning',
+    'Data Science', 'Deep Learning', 'AWS', 'Azure', 'Docker', 'Kubernetes',
+    'HTML', 'CSS', 'TypeScript', 'C++', 'PHP', 'Git', 'REST API', 'GraphQL',
+    'Express', 'Django', 'Flask', 'TensorFlow', 'PyTorch', 'NLP', 'Pandas', 'NumPy'
+]
+
+ROLES = [
+    ('Machine Learning Engineer', ['machine learning', 'model training', 'feature engineering', 'deep learning']),
+    ('ML Engineer', ['ml pipelines', 'model deployment', 'neural networks', 'training data']),
+    ('Data Scientist', ['statistics', 'data analysis', 'visualization', 'experiments']),
+    ('Backend Developer', ['apis', 'databases', 'microservices', 'scalability']),
+    ('Frontend Developer', ['user interfaces', 'responsive design', 'components', 'accessibility']),
+    ('Full Stack Developer', ['web applications', 'apis', 'user interfaces', 'deployment']),
+    ('DevOps Engineer', ['ci/cd', 'containers', 'infrastructure', 'monitoring'])
+]
+
+VERBS = ['Developed', 'Built', 'Designed', 'Implemented', 'Optimized', 'Led', 'Worked on', 'Helped with']
+DEGREES = ['B.Tech in Computer Science', 'MCA', 'BCA', 'M.Tech in Data Science', 'B.Sc Mathematics', 'PhD in Machine Learning']
+
+
+def generate_job(rng, job_id=None):
+    """One job posting dict in the shape the matcher expects"""
+    title, topics = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, rng.randint(3, 8))
+    sentences = [f"We are hiring a {title}."]
+    for topic in rng.sample(topics, len(topics)):
+        sentences.append(f"You will work on {topic} using {', '.join(rng.sample(skills, min(2, len(skills))))}.")
+    return {
+        'id': str(job_id if job_id is not None else rng.randrange(10 ** 9)),
+        'title': title,
+        'description': ' '.join(sentences),
+        'required_skills': skills,
+        'experience_required': rng.choice(['Fresher', '1+ years', '2 years', '3-5 years', '5+ years']),
+        'qualifications': rng.sample(['B.Tech', 'MCA', 'BCA', 'M.Tech', 'Bachelor', 'Master'], 2)
+    }
+
+
+def generate_resume(rng, resume_id=None, lines=25):
+    """One parsed-resume dict (parser output shape) with matching resume_text"""
+    title, topics = rng.choice(ROLES)
+    skills = sorted(rng.sample(SKILLS, rng.randint(3, 15)))
+    name = f"{rng.choice(['Aarav', 'Priya', 'Rahul', 'Sneha', 'Vikram', 'Ananya'])} {rng.choice(['Sharma', 'Gupta', 'Singh', 'Patel', 'Kumar'])}"
+
+    experience = []
+    body = [name, f"{name.split()[0].lower()}{rng.randrange(1000)}@gmail.com", title, 'EXPERIENCE']
+    for _ in range(rng.randint(0, 3)):
+        start = rng.randint(2012, 2022)
+        duration = f"{start} - {start + rng.randint(1, 3)}"
+        experience.append({'title': title, 'company': 'Acme Corp', 'duration': duration, 'description': ''})
+        body.append(duration)
+    for _ in range(lines):
+        topic = rng.choice(topics)
+        body.append(f"{rng.choice(VERBS)} {topic} with {rng.choice(skills)} improving results by {rng.randint(5, 60)}%")
+    body += ['SKILLS', ', '.join(skills), 'EDUCATION']
+    degree = rng.choice(DEGREES)
+    body.append(degree)
+
+    return {
+        'id': str(resume_id if resume_id is not None else rng.randrange(10 ** 9)),
+        'name': name,
+        'email': body[1],
+        'skills': skills,
+        'experience': experience,
+        'education': [{'institution': 'State University', 'degree': degree, 'duration': '2016 - 2020', 'score': 'CGPA 8.1'}],
+        'projects': [],
+        'resume_text': '\n'.join(body)
+    }
+
+
+def generate_corpus(n_resumes, n_jobs, seed=7):
+    """Reproducible lists of resumes and jobs"""
+    rng = random.Random(seed)
+    resumes = [generate_resume(rng, i) for i in range(n_resumes)]
+    jobs = [generate_job(rng, i) for i in range(n_jobs)]
+    return resumes, jobs
@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# resume_parser opens its SQLite file at import time; keep it away from the shared temp file
+os.environ.setdefault('PARSE_QUEUE_DB', os.path.join(tempfile.mkdtemp(prefix='resume_parser_tests-'), 'parse.sqlite'))
+
+
+@pytest.fixture(scope='session')
+def resume_parser():
+    import resume_parser
+    return resume_parser
+
+
+@pytest.fixture
+def write_docx(tmp_path):
+    """Write paragraphs to a DOCX file and return its path"""
+    from docx import Document
+
+    def write(lines, name='resume.docx'):
+        document = Document()
+        for line in lines:
+            document.add_paragraph(line)
+        path = str(tmp_path / name)
+        document.save(path)
+        return path
+    return write
@@ -0,0 +1,58 @@
+from near_duplicates import SharedDuplicateIndex
+
+BODY = [f'Built data pipeline {i} with Python, Spark and Airflow for reporting' for i in range(30)]
+
+
+def resume_lines(email, name='Jane Doe'):
+    return [name, email, 'SKILLS', 'Python, Spark, Airflow, Docker', 'EXPERIENCE'] + BODY
+
+
+def test_near_duplicate_reuses_parse(resume_parser, write_docx):
+    first = resume_parser.parse_resume(write_docx(resume_lines('jane@example.com'), 'a.docx'), 'docx',
+                                       document_id='dedup-first')
+    second = resume_parser.parse_resume(write_docx(resume_lines('jane@example.com'), 'b.docx'), 'docx',
+                                        document_id='dedup-second')
+    assert not first['reused_parse']
+    assert second['reused_parse']
+    assert second['duplicate_of'] == 'dedup-first'
+    assert second['skills'] == first['skills']
+    assert not second['partial'] and second['limits_hit'] == []
+
+
+def test_reused_parse_keeps_this_requests_limits(resume_parser, write_docx):
+    resume_parser.parse_resume(write_docx(resume_lines('lim@example.com'), 'a.docx'), 'docx',
+                               document_id='limits-first')
+    reused = resume_parser.parse_resume(write_docx(resume_lines('lim@example.com'), 'b.docx'), 'docx',
+                                        {'max_lines': 5}, document_id='limits-second')
+    assert reused['reused_parse']
+    assert reused['partial']
+    assert reused['limits_hit'] == ['max_lines']
+
+
+def test_another_email_is_not_reused(resume_parser, write_docx):
+    resume_parser.parse_resume(write_docx(resume_lines('one@example.com', 'Ann Lee'), 'a.docx'), 'docx',
+                               document_id='email-first')
+    other = resume_parser.parse_resume(write_docx(resume_lines('two@example.com', 'Bob Roy'), 'b.docx'), 'docx',
+                                       document_id='email-second')
+    assert not other['reused_parse']
+    assert other['email'] == 'two@example.com'
+
+
+def test_shared_index_is_visible_to_other_instances(tmp_path):
+    path = str(tmp_path / 'dedup.sqlite')
+    writer, reader = SharedDuplicateIndex(path), SharedDuplicateIndex(path)
+    text = ' '.join(BODY)
+    writer.add('doc-1', {'skills': ['Python']}, text=text)
+    assert reader.query(text=text) == [('doc-1', 1.0, {'skills': ['Python']})]
+    assert reader.query(text=text, exclude='doc-1') == []
+
+
+def test_shared_index_keeps_newest_documents(tmp_path):
+    index = SharedDuplicateIndex(str(tmp_path / 'dedup.sqlite'), capacity=3)
+    texts = [f'resume {i} ' + ' '.join(BODY[i:i + 5]) for i in range(5)]
+    for i, text in enumerate(texts):
+        index.add(f'doc-{i}', {'i': i}, text=text)
+    assert len(index) == 3
+    assert index.query(text=texts[0]) == []
+    assert [match[0] for match in index.query(text=texts[4])] == ['doc-4']
+
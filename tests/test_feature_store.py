@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+import feature_store
+from feature_store import FeatureStore
+
+DIMENSIONS = 8
+SKILLS = ['python', 'docker', 'sql', 'react', 'java', 'aws']
+
+
+def record(i, rng, **extra):
+    vector = rng.normal(size=DIMENSIONS)
+    return {'resume_id': f'r{i}', 'skills': list(rng.choice(SKILLS, 3, replace=False)),
+            'vector': vector / np.linalg.norm(vector), 'word_count': i, **extra}
+
+
+def ranking(store, job_vector):
+    """Every live row's score; rows with equal scores may come back in any order"""
+    matches = store.rank(job_vector, ['python', 'sql'], top_k=100)['matches']
+    return sorted((-match['match_score'], match['resume_id']) for match in matches)
+
+
+@pytest.fixture
+def small_segments(monkeypatch):
+    monkeypatch.setattr(feature_store, 'SEGMENT_ROWS', 16)
+    monkeypatch.setattr(feature_store, 'CHUNK_ROWS', 8)
+    monkeypatch.setattr(feature_store, 'MERGE_FACTOR', 3)
+
+
+@pytest.fixture
+def churned_store(tmp_path, small_segments):
+    """Store with 60 resumes, 10 of them rewritten and 10 deleted one row at a time"""
+    rng = np.random.default_rng(3)
+    store = FeatureStore(str(tmp_path / 'store'), DIMENSIONS, 'model-1')
+    store.append([record(i, rng) for i in range(60)])
+    for i in range(10):
+        store.append([record(i, rng, word_count=1000 + i)])
+    store.delete([f'r{i}' for i in range(50, 60)])
+    return store
+
+
+def test_compaction_keeps_ranking_and_drops_dead_rows(churned_store):
+    job_vector = np.ones(DIMENSIONS) / np.sqrt(DIMENSIONS)
+    before = ranking(churned_store, job_vector)
+    assert churned_store.stats()['dead_rows'] > 0
+
+    result = churned_store.compact()
+
+    assert result['live_rows'] == 50
+    stats = churned_store.stats()
+    assert stats['rows'] == stats['live_rows'] == 50
+    assert stats['dead_rows'] == 0
+    assert ranking(churned_store, job_vector) == before
+
+
+def test_newest_row_wins_and_tombstones_hide_rows(churned_store):
+    churned_store.compact()
+    matches = churned_store.rank(np.ones(DIMENSIONS) / np.sqrt(DIMENSIONS), [], top_k=100)['matches']
+    by_id = {match['resume_id']: match for match in matches}
+    assert len(by_id) == 50
+    assert not any(f'r{i}' in by_id for i in range(50, 60))
+    assert [by_id[f'r{i}']['word_count'] for i in range(10)] == [1000 + i for i in range(10)]
+
+
+def test_size_tiered_merges_bound_segment_count(churned_store):
+    # 10 single-row appends and a tombstone batch would be 14+ segments without merges
+    assert churned_store.stats()['segments'] < 10
+
+
+def test_other_process_sees_compaction(churned_store, tmp_path):
+    job_vector = np.ones(DIMENSIONS) / np.sqrt(DIMENSIONS)
+    other = FeatureStore(str(tmp_path / 'store'), DIMENSIONS, 'model-1')
+    before = ranking(other, job_vector)
+    churned_store.compact()
+    assert ranking(other, job_vector) == before
+    assert other.stats()['dead_rows'] == 0
+
+
+def test_int8_scores_match_float_scores(tmp_path):
+    rng = np.random.default_rng(5)
+    records = [record(i, rng) for i in range(40)]
+    store = FeatureStore(str(tmp_path / 'store'), DIMENSIONS, 'model-1')
+    store.append(records)
+    job_vector = records[0]['vector']
+    matches = store.rank(job_vector, [], top_k=40)['matches']
+    expected = {r['resume_id']: float(np.clip(r['vector'] @ job_vector, 0, 1)) * 100 for r in records}
+    for match in matches:
+        assert match['text_similarity'] == pytest.approx(expected[match['resume_id']], abs=1.0)
+
+
+def test_negative_top_k_is_rejected(churned_store):
+    with pytest.raises(ValueError):
+        churned_store.rank(np.zeros(DIMENSIONS), ['python'], top_k=-1)
@@ -0,0 +1,80 @@
+import copy
+
+import numpy as np
+import pytest
+
+from incremental_match import IncrementalMatcher
+from synthetic_corpus import generate_corpus
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    return generate_corpus(200, 5, seed=11)
+
+
+@pytest.fixture
+def matcher(corpus):
+    resumes, jobs = corpus
+    return IncrementalMatcher().build(resumes, jobs)
+
+
+def rescored(matcher, job):
+    """Scores of a job computed from scratch on a copy of the matcher"""
+    fresh = copy.deepcopy(matcher)
+    fresh.set_job(job)
+    return fresh.jobs[str(job['id'])]['scores']
+
+
+EDITS = [
+    lambda job: {**job, 'required_skills': job['required_skills'] + ['Kubernetes']},
+    lambda job: {**job, 'required_skills': job['required_skills'][1:]},
+    lambda job: {**job, 'description': job['description'] + ' Experience with Kubernetes and Terraform'},
+    lambda job: {**job, 'description': job['description'].split('.')[0],
+                 'required_skills': ['Python', 'SQL']},
+]
+
+
+@pytest.mark.parametrize('edit', EDITS)
+def test_update_matches_full_rescore(matcher, corpus, edit):
+    _, jobs = corpus
+    job = edit(jobs[0])
+    before = matcher.jobs[str(job['id'])]['scores'].copy()
+
+    delta = matcher.update_job(job)
+
+    after = matcher.jobs[str(job['id'])]['scores']
+    np.testing.assert_allclose(after, rescored(matcher, job), atol=0.011)
+    changed_rows = np.flatnonzero(after != before)
+    assert len(changed_rows)
+    assert delta['changed_count'] == len(changed_rows)
+    by_id = {change['resume_id']: change for change in delta['changed']}
+    assert set(by_id) == {matcher.resume_ids[row] for row in changed_rows}
+    for row in changed_rows:
+        change = by_id[matcher.resume_ids[row]]
+        assert change['old_score'] == pytest.approx(before[row])
+        assert change['match_score'] == pytest.approx(after[row])
+
+
+def test_unchanged_job_has_empty_delta(matcher, corpus):
+    _, jobs = corpus
+    assert matcher.update_job(jobs[1])['changed'] == []
+
+
+def test_new_job_delta_lists_nonzero_scores(matcher):
+    job = {'id': 'new-job', 'description': 'Python developer building Django APIs',
+           'required_skills': ['Python', 'Django']}
+    delta = matcher.update_job(job)
+    assert delta['changed_count'] == int(np.count_nonzero(matcher.jobs['new-job']['scores']))
+
+
+def test_job_arrays_round_trip(matcher, corpus):
+    _, jobs = corpus
+    job = EDITS[0](jobs[2])
+    matcher.update_job(job)
+    arrays = matcher.job_arrays(str(job['id']))
+
+    other = copy.deepcopy(matcher)
+    del other.jobs[str(job['id'])]
+    assert other.restore_job(arrays) == str(job['id'])
+    np.testing.assert_array_equal(other.jobs[str(job['id'])]['scores'], matcher.jobs[str(job['id'])]['scores'])
+    assert other.update_job(EDITS[2](job))['changed'] == matcher.update_job(EDITS[2](job))['changed']
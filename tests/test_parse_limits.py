@@ -0,0 +1,92 @@
+import time
+
+import fitz
+
+from deadline import Deadline
+
+RESUME_LINES = [
+    'Jane Doe',
+    'jane.doe@example.com',
+    'SKILLS',
+    'Python, Docker, PostgreSQL',
+    'EXPERIENCE',
+    'Software Engineer at Acme 2019 - 2023'
+]
+
+
+def expired():
+    return Deadline(time.monotonic() - 1)
+
+
+def test_exactly_max_lines_with_trailing_newline_is_not_truncated(resume_parser):
+    limits_hit = []
+    assert resume_parser.apply_text_limits('a\nb\nc\n', {'max_lines': 3}, limits_hit) == 'a\nb\nc\n'
+    assert limits_hit == []
+
+
+def test_one_line_over_max_lines_is_truncated(resume_parser):
+    limits_hit = []
+    assert resume_parser.apply_text_limits('a\nb\nc\nd\n', {'max_lines': 3}, limits_hit) == 'a\nb\nc'
+    assert limits_hit == ['max_lines']
+
+
+def test_max_chars_truncates(resume_parser):
+    limits_hit = []
+    assert resume_parser.apply_text_limits('abcdef', {'max_chars': 4}, limits_hit) == 'abcd'
+    assert limits_hit == ['max_chars']
+
+
+def test_expired_deadline_skips_every_field(resume_parser):
+    parsed = resume_parser.parse_text('\n'.join(RESUME_LINES), deadline=expired())
+    assert parsed['partial']
+    assert parsed['limits_hit'] == ['deadline']
+    assert parsed['skipped_fields'] == [field for field, _, _ in resume_parser.FIELD_EXTRACTORS]
+    assert parsed['skills'] == []
+
+
+def test_own_time_limit_is_reported_as_max_seconds(resume_parser):
+    parsed = resume_parser.parse_text('\n'.join(RESUME_LINES), {'max_seconds': 1.0}, started_at=time.monotonic() - 2)
+    assert parsed['limits_hit'] == ['max_seconds']
+
+
+def test_docx_stream_stops_at_deadline(resume_parser, write_docx):
+    limits_hit = []
+    text = resume_parser.extract_text_from_docx_stream(write_docx(RESUME_LINES), limits_hit=limits_hit,
+                                                       deadline=expired())
+    assert text == ''
+    assert limits_hit == ['deadline']
+
+
+def test_docx_stream_stops_at_max_chars(resume_parser, write_docx):
+    limits_hit = []
+    lines = [f'paragraph number {i}' for i in range(200)]
+    text = resume_parser.extract_text_from_docx_stream(write_docx(lines), max_chars=100, limits_hit=limits_hit)
+    assert len(text) < len('\n'.join(lines))
+    assert limits_hit == ['max_chars']
+
+
+def test_pdf_stops_at_max_pages(resume_parser, tmp_path):
+    path = str(tmp_path / 'resume.pdf')
+    document = fitz.open()
+    for page_number in range(3):
+        document.new_page().insert_text((72, 72), f'Page {page_number} Python Docker')
+    document.save(path)
+    document.close()
+
+    limits_hit = []
+    text = resume_parser.extract_text_from_pdf(path, max_pages=1, limits_hit=limits_hit)
+    assert 'Page 0' in text and 'Page 1' not in text
+    assert limits_hit == ['max_pages']
+
+
+def test_parse_resume_after_caller_deadline_times_out(resume_parser, write_docx):
+    result = resume_parser.parse_resume(write_docx(RESUME_LINES), 'docx', document_id='deadline-before',
+                                        deadline=expired())
+    assert result['timeout']
+
+
+def test_extraction_is_bounded_by_max_seconds(resume_parser, write_docx):
+    # Without a caller deadline, extraction itself stops at the service's own time limit
+    path = write_docx([f'Built service {i} with Python and Docker' for i in range(2000)])
+    result = resume_parser.parse_resume(path, 'docx', {'max_seconds': 1e-9}, document_id='max-seconds')
+    assert result['timeout']
@@ -0,0 +1,86 @@
+"""Row-vector storage for match scoring at float32, float16 or int8 precision.
+
+int8 rows are quantized symmetrically with one float32 scale per row
+(scale = max|x| / 127). Scores are an asymmetric quantized dot product: the
+float32 query is multiplied with the stored codes block by block, and each
+row's result is multiplied by its scale, so no full-precision copy of the
+matrix is ever materialized.
+
+The trade is memory for single-query latency. int8 blocks upcast about as
+fast as a float32 matmul reads them, so int8 stays close to float32 speed.
+NumPy has no vectorized float16 -> float32 conversion, and that conversion
+costs many times the matmul itself: a single float16 query is an order of
+magnitude or more slower than float32 (see bench_quantize.py). Batched
+queries amortize the upcast, so float16 suits batch scoring, not the
+per-request /match/jobs path; int8 is the low-memory option there.
+"""
+import numpy as np
+
+STORAGE_TYPES = ('float32', 'float16', 'int8')
+SCORE_BLOCK_ROWS = 8192
+# Single queries upcast smaller blocks that stay in L2 cache
+SCORE_BLOCK_BYTES = 256 * 1024
+
+
+def quantize_int8(vectors):
+    """Symmetric per-row int8 codes and float32 scales (scale = max|x| / 127) of a float matrix"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    return np.ascontiguousarray(np.round(vectors / scales[:, None]).astype(np.int8)), scales.astype(np.float32)
+
+
+class VectorStore:
+    """Contiguous matrix of row vectors at the configured precision"""
+
+    def __init__(self, storage='float32', dimensions=0):
+        if storage not in STORAGE_TYPES:
+            raise ValueError(f"Unknown vector storage '{storage}', expected one of {STORAGE_TYPES}")
+        self.storage = storage
+        self.dimensions = dimensions
+        self.codes = np.zeros((0, dimensions), dtype=np.int8 if storage == 'int8' else storage)
+        self.scales = np.zeros(0, dtype=np.float32)
+
+    def __len__(self):
+        return self.codes.shape[0]
+
+    def set(self, vectors):
+        """Replace the stored rows with a float matrix"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.dimensions = vectors.shape[1]
+        if self.storage == 'int8':
+            self.codes, self.scales = quantize_int8(vectors)
+        else:
+            self.codes = np.ascontiguousarray(vectors.astype(self.storage))
+            self.scales = np.zeros(0, dtype=np.float32)
+
+    def scores(self, query):
+        """Dot product of every stored row with a float32 query vector (or a matrix of queries)
+
+        A 2-D query of shape (m, dimensions) returns an (n_rows, m) matrix and
+        amortizes the float16/int8 upcast of each block over all m queries.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if self.storage == 'float32':
+            return self.codes @ query.T
+
+        out = np.empty((len(self),) + query.shape[:-1], dtype=np.float32)
+        dimensions = self.codes.shape[1]
+        block_rows = SCORE_BLOCK_ROWS if query.ndim == 2 else max(1, SCORE_BLOCK_BYTES // (4 * max(1, dimensions)))
+        buffer = np.empty((min(block_rows, len(self)), dimensions), dtype=np.float32)
+        for start in range(0, len(self), block_rows):
+            block = buffer[:min(block_rows, len(self) - start)]
+            block[...] = self.codes[start:start + block_rows]
+            out[start:start + block_rows] = block @ query.T
+        if self.storage == 'int8':
+            out *= self.scales.reshape((-1,) + (1,) * (out.ndim - 1))
+        return out
+
+    def dequantize(self):
+        """Rows as float32 (for inspection and tests)"""
+        rows = self.codes.astype(np.float32)
+        return rows * self.scales[:, None] if self.storage == 'int8' else rows
+
+    @property
+    def nbytes(self):
+        return int(self.codes.nbytes + self.scales.nbytes)